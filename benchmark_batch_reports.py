@@ -0,0 +1,63 @@
+"""
+Benchmark: reportes por cliente uno a uno vs generación masiva en paralelo
+Uso: python benchmark_batch_reports.py [clientes] [procesos]
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+from utils.exporters import DataExporter
+from utils.reports import BatchReportGenerator, report_filename
+
+def populate(db_manager, clients):
+    client_ids = db_manager.add_clients_bulk((f"Cliente {i}", f"Calle {i} #100") for i in range(clients))
+    # Un año de pagos y lecturas por cliente
+    db_manager.add_payments_bulk(
+        (client_id, 150.0, 'pagado' if month % 4 else 'pendiente', '')
+        for client_id in client_ids for month in range(12)
+    )
+    db_manager.add_consumption_bulk(
+        (client_id, 'exceso' if month % 5 == 0 else 'normal', '')
+        for client_id in client_ids for month in range(12)
+    )
+    return client_ids
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {clients:,} clientes con 12 pagos y 12 lecturas cada uno...")
+        client_ids = populate(db_manager, clients)
+
+        print(f"{'Método':<32}{'Tiempo (s)':>12}{'Reportes/s':>14}")
+
+        directory = os.path.join(tmp, "uno_a_uno")
+        os.makedirs(directory)
+        start = time.perf_counter()
+        for client_id in client_ids:
+            DataExporter.export_client_report(db_manager, client_id,
+                                              os.path.join(directory, report_filename(client_id)))
+        elapsed = time.perf_counter() - start
+        print(f"{'Uno a uno (3 consultas c/u)':<32}{elapsed:>12.2f}{clients / elapsed:>14,.0f}")
+
+        for label, options in (
+            ("Masivo, 1 proceso", {'workers': 1}),
+            (f"Masivo, {workers} procesos", {'workers': workers}),
+            (f"Masivo zip, {workers} procesos", {'workers': workers, 'as_zip': True}),
+        ):
+            output = os.path.join(tmp, label.replace(' ', '_').replace(',', '') + ('.zip' if options.get('as_zip') else ''))
+            result = BatchReportGenerator(db_manager, output, **options).run()
+            print(f"{label:<32}{result['seconds']:>12.2f}{result['reports_per_second']:>14,.0f}")
+
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
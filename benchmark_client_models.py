@@ -0,0 +1,79 @@
+"""
+Benchmark: memoria de los clientes del dashboard por cada 100k clientes
+Uso: python benchmark_client_models.py [clientes]
+
+Compara la dataclass anterior (con __dict__ por instancia y un texto de
+estado por fila), la ClientWithStatus con __slots__ y estados compartidos,
+y la ClientStatusTable por columnas.
+"""
+
+import sys
+import os
+import gc
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+from models.data_models import ClientWithStatus, ClientStatusTable
+
+@dataclass
+class LegacyClientWithStatus:
+    """ClientWithStatus tal como era antes (dataclass sin slots)"""
+    id: int
+    name: str
+    address: str
+    status: str
+    payment_status: str
+    consumption_status: str
+
+def populate(db_manager, count):
+    ids = db_manager.add_clients_bulk(
+        ((f"Cliente {i}", f"Calle {i % 500} #{i}", 'activo' if i % 10 else 'inactivo')
+         for i in range(count)), chunk_size=10000)
+    db_manager.add_payments_bulk(
+        ((client_id, 150.0, 'pagado' if n % 3 else 'pendiente') for n, client_id in enumerate(ids)
+         if n % 4), chunk_size=10000)
+    db_manager.add_consumption_bulk(
+        ((client_id, 'exceso') for n, client_id in enumerate(ids) if n % 7 == 0), chunk_size=10000)
+
+def retained_mb(db_manager, build):
+    """Memoria que queda ocupada por la colección construida desde las filas de la BD"""
+    gc.collect()
+    tracemalloc.start()
+    rows = db_manager.get_clients_with_payment_status()
+    container = build(rows)
+    del rows
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del container
+    return retained / 1024 / 1024
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    def as_objects(model):
+        return lambda rows: [model(r['id'], r['name'], r['address'], r['status'],
+                                   r['payment_status'], r['consumption_status']) for r in rows]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {count:,} clientes...")
+        populate(db_manager, count)
+
+        print(f"{'Colección':<34}{'MB':>8}{'MB/100k':>10}{'B/cliente':>11}")
+        for name, build in (
+            ('dataclass (anterior)', as_objects(LegacyClientWithStatus)),
+            ('ClientWithStatus con __slots__', as_objects(ClientWithStatus)),
+            ('ClientStatusTable', ClientStatusTable.from_rows),
+        ):
+            mb = retained_mb(db_manager, build)
+            print(f"{name:<34}{mb:>8.1f}{mb * 100_000 / count:>10.1f}{mb * 1024 * 1024 / count:>11.0f}")
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: filtro por recorrido completo vs índice de búsqueda en memoria
+Uso: python benchmark_client_search.py [clientes]
+"""
+
+import sys
+import os
+import random
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.data_models import ClientWithStatus
+from utils.search_index import ClientSearchIndex
+
+FIRST_NAMES = ["José", "María", "Ángel", "Lucía", "Raúl", "Ana", "Pedro", "Sofía"]
+LAST_NAMES = ["Peña", "Núñez", "Ruiz", "Gómez", "Ortiz", "López", "Hernández", "Díaz"]
+STREETS = ["Av. Juárez", "Calle Hidalgo", "Privada Álamos", "Callejón del Sol", "Blvd. Morelos"]
+TYPED = ["hernandez", "calle hidalgo 4", "sofia", "12345"]
+
+def make_clients(count):
+    rng = random.Random(1)
+    return [
+        ClientWithStatus(i, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                         f"{rng.choice(STREETS)} #{rng.randint(1, 9999)}", "activo", "pagado", "normal")
+        for i in range(1, count + 1)
+    ]
+
+def scan_filter(clients, term):
+    """Filtro anterior (AppController.filter_clients_by_search)"""
+    term = term.lower().strip()
+    return [c for c in clients if term in c.name.lower() or term in c.address.lower()
+            or term in str(c.id)]
+
+def per_keystroke(search):
+    """Latencia promedio por tecla en ms al escribir cada término"""
+    timings = []
+    for word in TYPED:
+        for end in range(1, len(word) + 1):
+            start = time.perf_counter()
+            search(word[:end])
+            timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings) * 1000, max(timings) * 1000
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    clients = make_clients(count)
+
+    start = time.perf_counter()
+    index = ClientSearchIndex()
+    index.rebuild((c.id, c.name, c.address) for c in clients)
+    build = (time.perf_counter() - start) * 1000
+
+    scan_avg, scan_max = per_keystroke(lambda term: scan_filter(clients, term))
+    index_avg, index_max = per_keystroke(index.search)
+
+    print(f"📊 Búsqueda por tecla con {count:,} clientes (ms)")
+    print(f"{'Método':<22}{'Promedio':>10}{'Máximo':>10}")
+    print(f"{'Recorrido completo':<22}{scan_avg:>10.2f}{scan_max:>10.2f}")
+    print(f"{'Índice':<22}{index_avg:>10.2f}{index_max:>10.2f}")
+    print(f"Construcción del índice: {build:.0f} ms")
+
+if __name__ == "__main__":
+    main()
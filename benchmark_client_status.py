@@ -0,0 +1,81 @@
+"""
+Benchmark: consulta del dashboard con funciones de ventana vs columnas desnormalizadas
+Uso: python benchmark_client_status.py [clientes] [pagos_por_cliente]
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+# Consulta anterior de get_clients_with_payment_status
+WINDOW_QUERY = '''
+    SELECT c.id, c.name, c.address, c.status,
+           COALESCE(p.status, 'sin_pagos') as payment_status,
+           COALESCE(wc.consumption_type, 'normal') as consumption_status
+    FROM clients c
+    LEFT JOIN (
+        SELECT client_id, status,
+               ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY payment_date DESC) as rn
+        FROM payments
+    ) p ON c.id = p.client_id AND p.rn = 1
+    LEFT JOIN (
+        SELECT client_id, consumption_type,
+               ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY consumption_date DESC) as rn
+        FROM water_consumption
+    ) wc ON c.id = wc.client_id AND wc.rn = 1
+    ORDER BY c.name
+'''
+
+def populate(db_manager, clients, payments_per_client):
+    conn = db_manager.get_connection()
+    conn.executemany(
+        'INSERT INTO clients (name, address) VALUES (?, ?)',
+        ((f"Cliente {i:06d}", f"Calle {i} #123") for i in range(clients))
+    )
+    conn.executemany(
+        'INSERT INTO payments (client_id, amount_cents, payment_date, status) VALUES (?, ?, ?, ?)',
+        ((i % clients + 1, 15000, f"20{10 + i // clients:02d}-01-15 10:00:00",
+          'pagado' if i % 5 else 'pendiente')
+         for i in range(clients * payments_per_client))
+    )
+    conn.executemany(
+        'INSERT INTO water_consumption (client_id, consumption_type) VALUES (?, ?)',
+        ((i + 1, 'exceso' if i % 9 == 0 else 'normal') for i in range(clients))
+    )
+    conn.commit()
+    conn.execute('ANALYZE')
+
+def timed(call, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = call()
+    return (time.perf_counter() - start) / repeat * 1000, rows
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    payments_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {clients:,} clientes con {payments_per_client} pagos cada uno...")
+        populate(db_manager, clients, payments_per_client)
+
+        conn = db_manager.get_connection()
+        window_ms, window_rows = timed(lambda: conn.execute(WINDOW_QUERY).fetchall())
+        denorm_ms, denorm_rows = timed(db_manager.get_clients_with_payment_status)
+        db_manager.close()
+
+    assert len(window_rows) == len(denorm_rows)
+    print(f"{'Versión':<30}{'ms':>10}")
+    print(f"{'Funciones de ventana':<30}{window_ms:>10.1f}")
+    print(f"{'Columnas desnormalizadas':<30}{denorm_ms:>10.1f}")
+    print(f"Mejora: {window_ms / denorm_ms:.1f}x")
+
+if __name__ == "__main__":
+    main()
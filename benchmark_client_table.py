@@ -0,0 +1,100 @@
+"""
+Benchmark: QTableWidget con un item por celda vs modelo virtual de clientes
+Uso: python benchmark_client_table.py [clientes]
+
+Se ejecuta sin ventana visible (QT_QPA_PLATFORM=offscreen).
+"""
+
+import sys
+import os
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem
+from models.data_models import ClientWithStatus, ClientStatusTable
+from ui.client_table_model import ClientTableModel
+from utils.search_index import ClientSearchIndex
+
+PAYMENT_STATES = ["pagado", "pendiente", "sin_pagos"]
+SEARCHES = ["c", "cl", "cli", "clie", "client", "cliente 4", "cliente 42", ""]
+
+def make_clients(count):
+    return [
+        ClientWithStatus(i, f"Cliente {i}", f"Calle {i % 500} #{i}", "activo",
+                         PAYMENT_STATES[i % 3], "exceso" if i % 7 == 0 else "normal")
+        for i in range(1, count + 1)
+    ]
+
+def fill_table_widget(table, clients):
+    """Comportamiento anterior de MainWindow.update_clients_table"""
+    table.setRowCount(len(clients))
+    for row, client in enumerate(clients):
+        id_item = QTableWidgetItem(str(client.id))
+        id_item.setTextAlignment(Qt.AlignCenter)
+        table.setItem(row, 0, id_item)
+        table.setItem(row, 1, QTableWidgetItem(client.name))
+        table.setItem(row, 2, QTableWidgetItem(client.address))
+        status_item = QTableWidgetItem(client.status.title())
+        status_item.setTextAlignment(Qt.AlignCenter)
+        table.setItem(row, 3, status_item)
+        payment_item = QTableWidgetItem(f"{client.get_status_icon()} {client.get_status_text()}")
+        payment_item.setTextAlignment(Qt.AlignCenter)
+        table.setItem(row, 4, payment_item)
+
+def filter_list(clients, term):
+    """Filtro anterior (AppController.filter_clients_by_search)"""
+    term = term.lower().strip()
+    if not term:
+        return clients
+    return [c for c in clients if term in c.name.lower() or term in c.address.lower()
+            or term in str(c.id)]
+
+def timed(app, call):
+    start = time.perf_counter()
+    call()
+    app.processEvents()  # Incluye el repintado de la vista
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    app = QApplication.instance() or QApplication(sys.argv)
+    clients = make_clients(count)
+
+    widget = QTableWidget()
+    widget.setColumnCount(5)
+    widget.resize(1000, 700)
+    widget.show()
+    widget_load = timed(app, lambda: fill_table_widget(widget, clients))
+    widget_filter = sum(timed(app, lambda t=term: fill_table_widget(widget, filter_list(clients, t)))
+                        for term in SEARCHES) / len(SEARCHES)
+    widget_sort = timed(app, lambda: widget.sortItems(1, Qt.DescendingOrder))
+    widget.close()
+
+    # Como en la aplicación: el controlador entrega una ClientStatusTable y
+    # construye el índice de búsqueda en un hilo de trabajo
+    table = ClientStatusTable(clients)
+    index = ClientSearchIndex()
+    index.rebuild(zip(table.ids, table.names, table.addresses))
+    model = ClientTableModel(None, index)
+    view = QTableView()
+    view.setModel(model)
+    view.resize(1000, 700)
+    view.show()
+    model_load = timed(app, lambda: model.set_clients(table))
+    model_filter = sum(timed(app, lambda t=term: model.set_filter(t, "Todos"))
+                       for term in SEARCHES) / len(SEARCHES)
+    model_sort = timed(app, lambda: model.sort(1, Qt.DescendingOrder))
+    view.close()
+
+    print(f"📊 Tabla de clientes con {count:,} filas (ms)")
+    print(f"{'Operación':<28}{'QTableWidget':>14}{'Modelo':>10}")
+    print(f"{'Carga':<28}{widget_load:>14.1f}{model_load:>10.1f}")
+    print(f"{'Filtro por tecla (promedio)':<28}{widget_filter:>14.1f}{model_filter:>10.1f}")
+    print(f"{'Ordenar por nombre':<28}{widget_sort:>14.1f}{model_sort:>10.1f}")
+
+if __name__ == "__main__":
+    main()
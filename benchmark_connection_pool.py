@@ -0,0 +1,57 @@
+"""
+Benchmark: latencia por llamada con conexión nueva vs pool de conexiones
+Uso: python benchmark_connection_pool.py [iteraciones]
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+class UnpooledDatabaseManager(DatabaseManager):
+    """Comportamiento anterior: una conexión nueva por cada llamada"""
+
+    def get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+def measure(db_manager, client_ids, iterations):
+    """Mide la latencia promedio de get_client y verify_pin en microsegundos"""
+    results = {}
+    for name, call in (
+        ('get_client', lambda i: db_manager.get_client(client_ids[i % len(client_ids)])),
+        ('verify_pin', lambda i: db_manager.verify_pin("1234")),
+    ):
+        start = time.perf_counter()
+        for i in range(iterations):
+            call(i)
+        results[name] = (time.perf_counter() - start) / iterations * 1e6
+    return results
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        pooled = DatabaseManager(db_path)
+        client_ids = [pooled.add_client(f"Cliente {i}", f"Calle {i} #123") for i in range(1000)]
+
+        unpooled = UnpooledDatabaseManager(db_path)
+        before = measure(unpooled, client_ids, iterations)
+        after = measure(pooled, client_ids, iterations)
+        pooled.close()
+
+    print(f"📊 Latencia por llamada ({iterations} iteraciones)")
+    print(f"{'Método':<15}{'Sin pool (µs)':>16}{'Con pool (µs)':>16}{'Mejora':>10}")
+    for name in before:
+        print(f"{name:<15}{before[name]:>16.1f}{after[name]:>16.1f}{before[name] / after[name]:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: consultas por rango de fechas sobre una tabla de pagos grande
+Uso: python benchmark_date_queries.py [pagos]
+"""
+
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+def populate(db_manager, total_payments, clients=10000):
+    """Genera pagos repartidos uniformemente en los últimos 10 años"""
+    conn = db_manager.get_connection()
+    conn.executemany(
+        'INSERT INTO clients (name, address) VALUES (?, ?)',
+        ((f"Cliente {i}", f"Calle {i} #123") for i in range(clients))
+    )
+    start = datetime.utcnow() - timedelta(days=3650)
+    step = 3650 * 86400 / total_payments
+    conn.executemany(
+        'INSERT INTO payments (client_id, amount_cents, payment_date, status) VALUES (?, ?, ?, ?)',
+        ((i % clients + 1, 15000,
+          (start + timedelta(seconds=i * step)).strftime('%Y-%m-%d %H:%M:%S'),
+          'pagado' if i % 7 else 'pendiente')
+         for i in range(total_payments))
+    )
+    conn.commit()
+    conn.execute('ANALYZE')
+
+def timed(call, repeat=20):
+    """Latencia promedio de una llamada en milisegundos"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+def main():
+    total_payments = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {total_payments:,} pagos...")
+        populate(db_manager, total_payments)
+
+        today = datetime.utcnow()
+        conn = db_manager.get_connection()
+        legacy_ms, _ = timed(lambda: conn.execute(
+            'SELECT p.*, c.name, c.address FROM payments p JOIN clients c ON p.client_id = c.id '
+            'WHERE DATE(p.payment_date) = ? ORDER BY p.payment_date DESC',
+            (today.strftime('%Y-%m-%d'),)).fetchall(), repeat=3)
+
+        print(f"{'Consulta':<28}{'ms':>10}{'filas':>10}")
+        print(f"{'DATE() (anterior)':<28}{legacy_ms:>10.3f}")
+        for name, call in (
+            ('get_payments_by_date', lambda: db_manager.get_payments_by_date(today.strftime('%Y-%m-%d'))),
+            ('get_payments_by_week', lambda: db_manager.get_payments_by_week(today.date())),
+            ('get_payments_by_month', lambda: db_manager.get_payments_by_month(today.year, today.month)),
+            ('get_payment_calendar', lambda: db_manager.get_payment_calendar(today.year, today.month)),
+            ('get_statistics', lambda: [db_manager.get_statistics()]),
+        ):
+            ms, rows = timed(call)
+            print(f"{name:<28}{ms:>10.3f}{len(rows):>10}")
+
+        # Pagos por mes de toda la tabla: texto de la fecha frente a la columna year_month
+        for name, sql in (
+            ('mes con substr (texto)', 'SELECT substr(payment_date, 1, 7), COUNT(*) FROM payments GROUP BY 1'),
+            ('mes con year_month', 'SELECT year_month, COUNT(*) FROM payments GROUP BY year_month'),
+        ):
+            ms, rows = timed(lambda: conn.execute(sql).fetchall(), repeat=1)
+            print(f"{name:<28}{ms:>10.3f}{len(rows):>10}")
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
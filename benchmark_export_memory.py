@@ -0,0 +1,92 @@
+"""
+Benchmark: memoria de la exportación CSV en streaming vs lista materializada
+Uso: python benchmark_export_memory.py [filas] [--compare]
+
+--compare también mide el método anterior (fetchall + export_to_csv); con
+millones de filas puede requerir varios GB de memoria.
+"""
+
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+from utils.exporters import DataExporter
+
+def current_rss_mb() -> float:
+    """Memoria residente actual del proceso (Linux); 0 si no está disponible"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        return 0.0
+
+class SampledCursor:
+    """Envuelve un cursor y registra la memoria residente en cada bloque"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.description = cursor.description
+        self.samples = []
+
+    def fetchmany(self, size):
+        self.samples.append(current_rss_mb())
+        return self.cursor.fetchmany(size)
+
+def populate(db_manager, rows):
+    client_ids = db_manager.add_clients_bulk((f"Cliente {i}", f"Calle {i} #100") for i in range(1000))
+    db_manager.add_payments_bulk(
+        ((client_ids[i % 1000], 150.0, 'pagado', 'pago mensual') for i in range(rows)),
+        chunk_size=10000
+    )
+
+def streaming_export(db_manager, filename):
+    cursor = SampledCursor(db_manager.get_export_cursor('payments'))
+    tracemalloc.start()
+    start = time.perf_counter()
+    exported = DataExporter.export_cursor_to_csv(cursor, filename)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return exported, elapsed, peak, cursor.samples
+
+def materialized_export(db_manager, filename):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with db_manager.get_connection() as conn:
+        data = [dict(row) for row in conn.execute('SELECT * FROM payments ORDER BY id')]
+    DataExporter.export_to_csv(data, filename)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return len(data), elapsed, peak
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    rows = int(args[0]) if args else 5_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {rows:,} pagos...")
+        populate(db_manager, rows)
+
+        exported, elapsed, peak, samples = streaming_export(db_manager, os.path.join(tmp, "pagos.csv"))
+        print(f"📤 Streaming: {exported:,} filas en {elapsed:.1f} s, pico Python {peak:.1f} MB")
+        if samples and samples[0]:
+            quarter = max(1, len(samples) // 4)
+            print("   RSS (MB) al 0/25/50/75/100 %: " +
+                  " / ".join(f"{samples[min(i * quarter, len(samples) - 1)]:.0f}" for i in range(5)))
+
+        if '--compare' in sys.argv:
+            exported, elapsed, peak = materialized_export(db_manager, os.path.join(tmp, "pagos_lista.csv"))
+            print(f"📋 Lista materializada: {exported:,} filas en {elapsed:.1f} s, pico Python {peak:.1f} MB")
+
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: búsqueda de clientes con FTS5 trigram frente a LIKE '%x%'
+Uso: python benchmark_fts_search.py [clientes]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+FIRST_NAMES = ["José", "María", "Ana", "Luis", "Pedro", "Sofía", "Jesús", "Lucía", "Raúl", "Inés"]
+LAST_NAMES = ["Pérez", "López", "Gómez", "Núñez", "Peña", "Ramírez", "Hernández", "Díaz", "Ortiz", "Ruiz"]
+STREETS = ["Juárez", "Hidalgo", "Morelos", "Álamo", "Reforma", "Zaragoza", "Allende", "Guerrero"]
+
+# Términos típicos: nombre parcial, apellido sin acento, calle, número e ID
+TERMS = ["Peña", "pena", "ramirez", "sofia di", "morelos 14", "juarez", "123456", "ruiz allende", "xq"]
+
+def populate(db_manager, total_clients):
+    rng = random.Random(42)
+    db_manager.add_clients_bulk(
+        (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}",
+         f"Calle {rng.choice(STREETS)} {rng.randint(1, 2000)}")
+        for _ in range(total_clients)
+    )
+    db_manager.get_connection().execute('ANALYZE')
+
+def like_search(conn, term):
+    """Consulta anterior de search_clients"""
+    pattern = f"%{term}%"
+    return conn.execute('''
+        SELECT * FROM clients
+        WHERE name LIKE ? OR address LIKE ? OR CAST(id AS TEXT) LIKE ?
+        ORDER BY name
+    ''', (pattern, pattern, pattern)).fetchall()
+
+def timed(call, repeat=5):
+    """Latencia promedio de una llamada en milisegundos"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+def main():
+    total_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {total_clients:,} clientes...")
+        start = time.perf_counter()
+        populate(db_manager, total_clients)
+        print(f"   Inserción (con índice FTS): {time.perf_counter() - start:.1f} s")
+
+        conn = db_manager.get_connection()
+        print(f"{'Término':<16}{'LIKE ms':>10}{'filas':>9}{'FTS ms':>10}{'FTS 50':>10}{'filas':>9}")
+        for term in TERMS:
+            like_ms, like_rows = timed(lambda: like_search(conn, term), repeat=2)
+            fts_ms, fts_rows = timed(lambda: db_manager.search_clients(term))
+            page_ms, _ = timed(lambda: db_manager.search_clients(term, limit=50))
+            print(f"{term:<16}{like_ms:>10.1f}{len(like_rows):>9}{fts_ms:>10.1f}{page_ms:>10.1f}{len(fts_rows):>9}")
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
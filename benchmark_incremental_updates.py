@@ -0,0 +1,67 @@
+"""
+Benchmark: actualizar una fila del dashboard frente a recargar la tabla completa
+Uso: python benchmark_incremental_updates.py [clientes]
+
+Mide lo que cuesta reflejar un pago nuevo en la tabla de clientes y en las
+estadísticas: la recarga completa (consulta + set_clients + estadísticas)
+contra leer solo la fila del cliente y los contadores del resumen (lo que
+hacen los hilos de trabajo tras cada escritura).
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+from ui.client_table_model import ClientTableModel
+
+def timed(call, repeat=10):
+    """Latencia promedio de una llamada en milisegundos"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    total_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {total_clients:,} clientes...")
+        client_ids = db_manager.add_clients_bulk(
+            (f"Cliente {i}", f"Calle {i} #123") for i in range(total_clients))
+        controller = AppController(db_manager)
+        model = ClientTableModel(search_index=controller.search_index)
+        model.set_clients(controller.get_clients_with_status())
+        model.sort(1)
+        controller.get_statistics()
+        client_id = client_ids[total_clients // 2]
+
+        def full_reload():
+            controller.clear_cache()
+            model.set_clients(controller.get_clients_with_status())
+            controller.get_statistics()
+
+        def row_update():
+            controller.query_cache.invalidate(('client', client_id))  # Como tras la señal
+            controller._read_statistics()
+            model.update_client(controller.get_client_with_status(client_id))
+
+        full = timed(full_reload, repeat=3)
+        controller.add_payment(client_id, "150.00", 'pendiente')
+        single = timed(row_update)
+        print(f"{'Recarga completa':<28}{full:>10.3f} ms")
+        print(f"{'Fila + contadores':<28}{single:>10.3f} ms")
+        controller.thread_pool.waitForDone()
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
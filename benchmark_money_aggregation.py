@@ -0,0 +1,81 @@
+"""
+Benchmark: velocidad y exactitud al sumar pagos en float frente a centavos enteros
+Uso: python benchmark_money_aggregation.py [pagos]
+
+Compara la suma anterior (montos REAL sumados en Python, como hacía
+export_client_report, o con SUM de SQLite) contra SUM(amount_cents) en SQL
+(get_payments_total). El error se mide contra la suma exacta en centavos.
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+from decimal import Decimal
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+def populate(db_manager, total):
+    """Inserta pagos en centavos y una copia con el monto en REAL; retorna la suma exacta"""
+    rng = random.Random(42)
+    conn = db_manager.get_connection()
+    conn.executemany('INSERT INTO clients (name, address) VALUES (?, ?)',
+                     ((f"Cliente {i}", f"Calle {i} #100") for i in range(1000)))
+    exact = 0
+    batch = 100_000
+    for start in range(0, total, batch):
+        rows = [(i % 1000 + 1, rng.randint(1, 500_000)) for i in range(start, min(start + batch, total))]
+        exact += sum(cents for _, cents in rows)
+        conn.executemany('INSERT INTO payments (client_id, amount_cents) VALUES (?, ?)', rows)
+    # Misma tabla con el esquema anterior (amount REAL guardado)
+    conn.execute('''
+        CREATE TABLE legacy_payments AS
+        SELECT id, client_id, amount_cents / 100.0 AS amount, payment_date, status, notes, created_at
+        FROM payments
+    ''')
+    conn.commit()
+    return exact
+
+def timed(call):
+    start = time.perf_counter()
+    result = call()
+    return (time.perf_counter() - start) * 1000, result
+
+def error_cents(value, exact_cents):
+    """Diferencia (en centavos) entre un total y la suma exacta"""
+    if isinstance(value, int):
+        return Decimal(value - exact_cents)
+    return Decimal(repr(value)) * 100 - exact_cents
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {total:,} pagos...")
+        exact = populate(db_manager, total)
+        conn = db_manager.get_connection()
+        print(f"   Suma exacta: ${Decimal(exact).scaleb(-2):,}")
+
+        variants = [
+            ('float en Python (anterior)',
+             lambda: sum(row[0] for row in conn.execute('SELECT amount FROM legacy_payments'))),
+            ('SUM(amount) REAL en SQL',
+             lambda: conn.execute('SELECT SUM(amount) FROM legacy_payments').fetchone()[0]),
+            ('centavos en Python',
+             lambda: sum(row[0] for row in conn.execute('SELECT amount_cents FROM payments'))),
+            ('SUM(amount_cents) en SQL',
+             lambda: db_manager.get_payments_total(status=None).cents),
+        ]
+        print(f"{'Suma':<30}{'ms':>10}{'error (centavos)':>20}")
+        for name, call in variants:
+            ms, value = timed(call)
+            print(f"{name:<30}{ms:>10.1f}{error_cents(value, exact):>20.6f}")
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: pagos por mes de 10 años desde payments_monthly_rollup frente a agrupar la tabla de pagos
+Uso: python benchmark_monthly_rollup.py [pagos]
+
+Mide también el costo de escritura de los triggers del resumen mensual y
+el tiempo de dibujar la gráfica de 120 meses (ChartWidget).
+"""
+
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+
+def populate(db_manager, total_payments, clients=10000):
+    """Genera pagos repartidos uniformemente en los últimos 10 años"""
+    client_ids = db_manager.add_clients_bulk((f"Cliente {i}", f"Calle {i} #123") for i in range(clients))
+    start = datetime.utcnow() - timedelta(days=3650)
+    step = 3650 * 86400 / total_payments
+    db_manager.add_payments_bulk(
+        ((client_ids[i % clients], 150 + i % 100, 'pagado' if i % 7 else 'pendiente', '',
+          (start + timedelta(seconds=i * step)).strftime('%Y-%m-%d %H:%M:%S'))
+         for i in range(total_payments)),
+        chunk_size=10000
+    )
+
+def legacy_monthly(conn, first_month):
+    """Agrupación directa sobre la tabla de pagos (sin resumen)"""
+    return conn.execute('''
+        SELECT substr(payment_date, 1, 7) AS month, COUNT(*), SUM(amount_cents)
+        FROM payments
+        WHERE status = 'pagado' AND payment_date >= ?
+        GROUP BY month
+    ''', (f"{first_month}-01",)).fetchall()
+
+def timed(call, repeat=5):
+    """Latencia promedio de una llamada en milisegundos"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = call()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+def main():
+    total_payments = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    app = QApplication.instance() or QApplication(sys.argv)
+    from utils.helpers import ChartWidget
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {total_payments:,} pagos...")
+        start = time.perf_counter()
+        populate(db_manager, total_payments)
+        with_triggers = time.perf_counter() - start
+        print(f"   Inserción con triggers: {with_triggers:.1f} s "
+              f"({total_payments / with_triggers:,.0f} pagos/s)")
+
+        controller = AppController(db_manager)
+        conn = db_manager.get_connection()
+        months = controller.get_monthly_payment_data(120)
+
+        print(f"{'Consulta (120 meses)':<32}{'ms':>10}{'filas':>8}")
+        for name, call, repeat in (
+            ('GROUP BY sobre payments', lambda: legacy_monthly(conn, months[0]['month']), 1),
+            ('get_monthly_payment_totals', lambda: db_manager.get_monthly_payment_totals(
+                months[0]['month'], months[-1]['month']), 20),
+            ('get_monthly_payment_data', lambda: controller.get_monthly_payment_data(120), 20),
+        ):
+            ms, rows = timed(call, repeat)
+            print(f"{name:<32}{ms:>10.3f}{len(rows):>8}")
+
+        chart = ChartWidget()
+        chart.resize(1000, 600)
+        chart.plot_payments_by_month(months)  # Primer dibujo: carga de fuentes
+        ms, _ = timed(lambda: chart.plot_payments_by_month(controller.get_monthly_payment_data(120)))
+        print(f"{'Consulta + gráfica de 120 meses':<32}{ms:>10.3f}")
+
+        start = time.perf_counter()
+        db_manager.rebuild_payments_rollup()
+        print(f"   rebuild-rollup: {time.perf_counter() - start:.2f} s")
+        controller.thread_pool.waitForDone()
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: lecturas del controlador con y sin la caché de consultas
+Uso: python benchmark_query_cache.py [clientes] [pagos_por_cliente]
+
+Mide la latencia de las lecturas repetidas que hace la interfaz
+(estadísticas, clientes con estado, pagos de un cliente) sin caché, con
+caché y justo después de registrar un pago (solo se recarga lo afectado).
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+
+def timed(call, repeat=20):
+    """Latencia promedio de una llamada en milisegundos"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    total_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    payments_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {total_clients:,} clientes con {payments_per_client} pagos cada uno...")
+        client_ids = db_manager.add_clients_bulk(
+            (f"Cliente {i}", f"Calle {i} #123") for i in range(total_clients))
+        db_manager.add_payments_bulk(
+            (client_id, 150, 'pagado' if n % 3 else 'pendiente')
+            for n in range(payments_per_client) for client_id in client_ids)
+        controller = AppController(db_manager)
+        client_id = client_ids[0]
+
+        reads = [
+            ('get_statistics', controller.get_statistics),
+            ('get_clients_with_status', controller.get_clients_with_status),
+            ('get_client_payments', lambda: controller.get_client_payments(client_id)),
+        ]
+        print(f"{'Lectura':<28}{'sin caché ms':>14}{'con caché ms':>14}")
+        for name, call in reads:
+            uncached = timed(lambda: (controller.clear_cache(), call()), repeat=5)
+            call()
+            cached = timed(call)
+            print(f"{name:<28}{uncached:>14.3f}{cached:>14.4f}")
+
+        # Un pago de otro cliente solo descarta lo global y lo de ese cliente
+        for _, call in reads:
+            call()
+        other_id = client_ids[1]
+        controller.add_payment(other_id, "150.00")
+        kept = ('client_payments', client_id) in controller.query_cache
+        print(f"   Tras un pago de otro cliente, los pagos del cliente {client_id} "
+              f"{'siguen en caché' if kept else 'se descartaron'}")
+        print(f"   Recarga tras el pago: {timed(lambda: [call() for _, call in reads], repeat=1):.3f} ms")
+        print(f"   {controller.get_cache_stats()}")
+        controller.thread_pool.waitForDone()
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
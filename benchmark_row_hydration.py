@@ -0,0 +1,73 @@
+"""
+Benchmark: memoria y velocidad al leer pagos como dict, tupla u objeto del modelo
+Uso: python benchmark_row_hydration.py [filas]
+
+Compara la forma anterior ([dict(row) for row in fetchall()] con
+sqlite3.Row) contra iter_payments en cada formato: filas por segundo al
+recorrer en streaming y memoria retenida al guardar todas las filas.
+"""
+
+import sys
+import os
+import gc
+import tempfile
+import time
+import tracemalloc
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+def populate(db_manager, rows):
+    client_ids = db_manager.add_clients_bulk((f"Cliente {i}", f"Calle {i} #100") for i in range(1000))
+    db_manager.add_payments_bulk(
+        ((client_ids[i % 1000], 150.0 + i % 7, 'pagado' if i % 5 else 'pendiente', 'pago mensual',
+          f"20{14 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:00:00") for i in range(rows)),
+        chunk_size=10000
+    )
+
+def legacy_rows(db_manager):
+    cursor = db_manager.get_connection().execute('SELECT * FROM payments ORDER BY payment_date')
+    return [dict(row) for row in cursor.fetchall()]
+
+def throughput(call):
+    """Filas por segundo al recorrer todas las filas sin guardarlas"""
+    start = time.perf_counter()
+    count = sum(1 for _ in call())
+    return count / (time.perf_counter() - start)
+
+def retained_mb(call):
+    """Memoria (MB) que ocupan todas las filas guardadas en una lista, y el pico al leerlas"""
+    gc.collect()
+    tracemalloc.start()
+    rows = list(call())
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return retained / 1024 / 1024, peak / 1024 / 1024
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"⏳ Generando {total:,} pagos...")
+        populate(db_manager, total)
+
+        variants = [
+            ('dict(Row) + fetchall', lambda: legacy_rows(db_manager)),
+            ('iter_payments dict', lambda: db_manager.iter_payments()),
+            ('iter_payments tuple', lambda: db_manager.iter_payments(row_format='tuple')),
+            ('iter_payments model', lambda: db_manager.iter_payments(row_format='model')),
+        ]
+        print(f"{'Formato':<24}{'filas/s':>12}{'retenido MB':>14}{'pico MB':>10}{'B/fila':>9}")
+        for name, call in variants:
+            rate = throughput(call)
+            retained, peak = retained_mb(call)
+            print(f"{name:<24}{rate:>12,.0f}{retained:>14.1f}{peak:>10.1f}"
+                  f"{retained * 1024 * 1024 / total:>9.0f}")
+        db_manager.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: rendimiento de escritura por perfil de PRAGMAs
+Uso: python benchmark_write_profiles.py [operaciones]
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+# Configuración anterior (journal de rollback por defecto) como referencia
+PROFILES = {
+    'legacy': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+    'durable': 'durable',
+    'fast': 'fast',
+}
+
+def measure(profile, operations):
+    """Mide operaciones por segundo de add_payment y add_water_consumption"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"), profile=profile)
+        client_ids = [db_manager.add_client(f"Cliente {i}", f"Calle {i} #123") for i in range(100)]
+
+        results = {}
+        start = time.perf_counter()
+        for i in range(operations):
+            db_manager.add_payment(client_ids[i % len(client_ids)], 150.0, 'pagado')
+        results['add_payment'] = operations / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(operations):
+            db_manager.add_water_consumption(client_ids[i % len(client_ids)], 'normal')
+        results['add_water_consumption'] = operations / (time.perf_counter() - start)
+
+        db_manager.close()
+        return results
+
+def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"📊 Escrituras por segundo ({operations} operaciones por método)")
+    print(f"{'Perfil':<10}{'add_payment':>16}{'add_water_consumption':>24}")
+    for name, profile in PROFILES.items():
+        results = measure(profile, operations)
+        print(f"{name:<10}{results['add_payment']:>16.0f}{results['add_water_consumption']:>24.0f}")
+
+if __name__ == "__main__":
+    main()
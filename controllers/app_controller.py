@@ -3,29 +3,265 @@ Sistema de Gestión de Pago de Agua
 Módulo: Controlador Principal
 """
 
-from PyQt5.QtCore import QObject, pyqtSignal
+import os
+import threading
+from datetime import datetime
+from itertools import count
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtWidgets import QMessageBox
-from database.database_manager import DatabaseManager
-from models.data_models import Client, Payment, WaterConsumption, ClientWithStatus
-from utils.helpers import ValidationUtils
-from typing import List, Optional, Dict, Any
+from database.database_manager import (DatabaseManager, BULK_CHUNK_SIZE, EXPORT_DATE_COLUMNS,
+                                       PAGE_SIZE, PageToken)
+from models.data_models import (Client, Money, Payment, WaterConsumption, ClientWithStatus,
+                                ClientStatusTable, CLIENT_STATUS_FILTERS)
+from utils.change_watcher import CHANGE_POLL_INTERVAL_MS, DatabaseChangeWatcher
+from utils.helpers import ValidationUtils, DataExporter, DateUtils
+from utils.reports import BatchReportGenerator
+from utils.query_cache import QueryCache
+from utils.search_index import ClientSearchIndex
+from typing import List, Optional, Dict, Any, Iterable, Callable, Tuple, Union
+
+# Hilos de trabajo para consultas en segundo plano (cada uno con su conexión del pool)
+ASYNC_QUERY_THREADS = 4
+
+class _QueryRelay(QObject):
+    """Lleva los resultados de los hilos de trabajo al hilo de la interfaz"""
+    completed = pyqtSignal(str, int, object, str)  # clave, solicitud, resultado, error
+
+class _QueryTask(QRunnable):
+    """Consulta ejecutada en un hilo del QThreadPool"""
+    
+    def __init__(self, relay: _QueryRelay, key: str, request_id: int,
+                 is_current: Callable[[str, int], bool], func: Callable, args: tuple):
+        super().__init__()
+        self.relay = relay
+        self.key = key
+        self.request_id = request_id
+        self.is_current = is_current
+        self.func = func
+        self.args = args
+    
+    def run(self):
+        # Una solicitud reemplazada antes de empezar no llega a tocar la base de datos
+        if not self.is_current(self.key, self.request_id):
+            return
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.relay.completed.emit(self.key, self.request_id, None, str(e))
+        else:
+            self.relay.completed.emit(self.key, self.request_id, result, '')
 
 class AppController(QObject):
     """Controlador principal de la aplicación"""
     
     # Señales para comunicación con la UI
-    data_updated = pyqtSignal()
+    data_updated = pyqtSignal()  # cambios masivos: recargar todo
     client_added = pyqtSignal(int)  # client_id
     client_updated = pyqtSignal(int)  # client_id
     client_deleted = pyqtSignal(int)  # client_id
     payment_added = pyqtSignal(int, int)  # payment_id, client_id
+    payment_updated = pyqtSignal(int, int)  # payment_id, client_id
     consumption_added = pyqtSignal(int, int)  # consumption_id, client_id
+    external_change = pyqtSignal()  # otra estación o proceso confirmó cambios
+    
+    # Señales de las consultas en segundo plano
+    query_finished = pyqtSignal(str, object)  # clave, resultado
+    query_failed = pyqtSignal(str, str)  # clave, mensaje de error
+    loading_changed = pyqtSignal(bool)  # hay consultas en curso
     
-    def __init__(self):
+    def __init__(self, db_manager: Optional[DatabaseManager] = None):
         super().__init__()
-        self.db_manager = DatabaseManager()
+        self.db_manager = db_manager or DatabaseManager()
         self._current_clients = []
-        self._statistics = {}
+        self._statistics = {}  # Últimas estadísticas entregadas a la interfaz
+        self._statistics_month = datetime.utcnow().strftime('%Y-%m')
+        
+        # Consultas asíncronas: la última solicitud de cada clave reemplaza a las anteriores
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(ASYNC_QUERY_THREADS)
+        self.thread_pool.setExpiryTimeout(-1)  # Hilos persistentes: reutilizan su conexión
+        self._relay = _QueryRelay(self)
+        self._relay.completed.connect(self._on_query_completed)
+        self._latest_requests: Dict[str, int] = {}
+        self._request_ids = count(1)
+        
+        # Índice de búsqueda: se reconstruye (en segundo plano) con cada carga
+        # de clientes y se actualiza en cada alta, cambio o baja
+        self.search_index = ClientSearchIndex()
+        
+        # Resultados que requieren un paso final en el hilo de la interfaz
+        self._result_handlers: Dict[str, Callable] = {'clients': self._adopt_loaded_clients,
+                                                      'statistics': self._adopt_statistics}
+        
+        # Caché de lecturas: cada señal de cambio descarta solo lo que afecta
+        # ('clients', 'statistics', 'payments' o ('client', id) de un cliente)
+        self.query_cache = QueryCache()
+        # Clientes cuya fila en la lista guardada quedó vieja tras un pago o
+        # consumo; la próxima lectura de la lista (en segundo plano) la corrige
+        self._stale_client_rows = set()
+        self._stale_rows_lock = threading.Lock()
+        self.client_added.connect(self._invalidate_client)
+        self.client_updated.connect(self._invalidate_client)
+        self.client_deleted.connect(self._invalidate_client)
+        self.payment_added.connect(self._invalidate_client_payments)
+        self.payment_updated.connect(self._invalidate_client_payments)
+        self.consumption_added.connect(self._invalidate_client_payments)
+        
+        # Detección de cambios de otras conexiones (se inicia con watch_changes)
+        self.change_watcher: Optional[DatabaseChangeWatcher] = None
+    
+    # Caché de consultas
+    def _cached(self, key: tuple, loader: Callable, *tags) -> Any:
+        """Lee key de la caché o la carga con loader() (los errores no se guardan)"""
+        return self.query_cache.get_or_load(key, loader, tags)
+    
+    def _invalidate_client(self, client_id: int):
+        self.query_cache.invalidate('clients', 'statistics', ('client', client_id))
+    
+    def _invalidate_client_payments(self, record_id: int, client_id: int):
+        # Los pagos y consumos cambian las lecturas del cliente, los contadores y
+        # los reportes por fecha; la lista completa se corrige por fila
+        self.query_cache.invalidate('statistics', 'payments', ('client', client_id))
+        with self._stale_rows_lock:
+            self._stale_client_rows.add(client_id)
+    
+    def _refresh_stale_rows(self, clients: ClientStatusTable) -> ClientStatusTable:
+        """Aplica a la lista guardada las filas de clientes con pagos o consumos nuevos"""
+        with self._stale_rows_lock:
+            stale, self._stale_client_rows = self._stale_client_rows, set()
+        for client_id in stale:
+            client = self.get_client_with_status(client_id)
+            if client is not None:
+                patched = clients.replaced(client)
+                self.query_cache.replace(('clients_with_status',), clients, patched)
+                clients = patched
+        return clients
+    
+    def watch_changes(self, interval_ms: int = CHANGE_POLL_INTERVAL_MS) -> DatabaseChangeWatcher:
+        """Empieza a revisar cambios de otras conexiones y emite external_change al detectarlos"""
+        if self.change_watcher is None:
+            self.change_watcher = DatabaseChangeWatcher(self.db_manager, interval_ms, self)
+            self.change_watcher.changed.connect(self._on_external_change)
+            self.change_watcher.timer.timeout.connect(self._check_month)
+        else:
+            self.change_watcher.timer.setInterval(interval_ms)
+        self.change_watcher.start()
+        return self.change_watcher
+    
+    def _on_external_change(self):
+        # No se sabe qué filas cambiaron: la caché completa puede estar obsoleta
+        self.query_cache.clear()
+        self.external_change.emit()
+    
+    # Estadísticas del dashboard
+    def _refresh_statistics(self):
+        """Tras una escritura propia relee los contadores en segundo plano
+        
+        Los triggers ya los ajustaron en dashboard_summary, así que leerlos
+        cuesta dos filas; la lectura deja al día la entrada de la caché para
+        get_statistics. Una carga pendiente pudo leer antes de la escritura:
+        se reemplaza por esta.
+        """
+        self.load_statistics_async()
+    
+    def _read_statistics(self) -> Dict:
+        """Lee los contadores sin pasar por la caché y actualiza la entrada guardada (hilo de trabajo)"""
+        stats = self.db_manager.get_statistics()
+        cached = self._cached(('statistics',), lambda: stats, 'statistics')
+        if cached is not stats:
+            self.query_cache.replace(('statistics',), cached, stats)
+        return stats
+    
+    def _adopt_statistics(self, stats: Dict) -> Dict:
+        # Solo el hilo de la interfaz asigna las estadísticas mostradas
+        self._statistics = stats
+        return stats
+    
+    def _check_month(self):
+        """En cada revisión del vigilante: al empezar otro mes (UTC) se recargan los contadores"""
+        month = datetime.utcnow().strftime('%Y-%m')
+        if month != self._statistics_month:
+            self._statistics_month = month
+            self._refresh_statistics()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Contadores de la caché de consultas (aciertos, fallos, desalojos, bytes)"""
+        return self.query_cache.stats()
+    
+    def clear_cache(self):
+        """Descarta toda la caché (cambios hechos fuera del controlador)"""
+        self.query_cache.clear()
+    
+    # Consultas en segundo plano
+    def run_async(self, key: str, func: Callable, *args) -> int:
+        """Ejecuta func(*args) en un hilo de trabajo y emite query_finished(key, resultado)
+        
+        Una nueva solicitud con la misma clave cancela la anterior: si aún no
+        empezó no se ejecuta, y si ya estaba en curso su resultado se descarta.
+        """
+        was_loading = bool(self._latest_requests)
+        request_id = next(self._request_ids)
+        self._latest_requests[key] = request_id
+        self.thread_pool.start(_QueryTask(self._relay, key, request_id,
+                                          self._is_current_request, func, args))
+        if not was_loading:
+            self.loading_changed.emit(True)
+        return request_id
+    
+    def cancel_query(self, key: str):
+        """Cancela la solicitud pendiente de una clave"""
+        if self._latest_requests.pop(key, None) is not None and not self._latest_requests:
+            self.loading_changed.emit(False)
+    
+    def is_loading(self, key: Optional[str] = None) -> bool:
+        """Indica si hay consultas en curso (de una clave o de cualquiera)"""
+        return key in self._latest_requests if key else bool(self._latest_requests)
+    
+    def _is_current_request(self, key: str, request_id: int) -> bool:
+        return self._latest_requests.get(key) == request_id
+    
+    def _on_query_completed(self, key: str, request_id: int, result, error: str):
+        """Recibe en el hilo de la interfaz el resultado de una consulta"""
+        if not self._is_current_request(key, request_id):
+            return  # Solicitud reemplazada o cancelada
+        del self._latest_requests[key]
+        
+        if not error and key in self._result_handlers:
+            result = self._result_handlers[key](result)
+        if error:
+            self.query_failed.emit(key, error)
+        else:
+            self.query_finished.emit(key, result)
+        if not self._latest_requests:
+            self.loading_changed.emit(False)
+    
+    def _load_clients_with_index(self) -> tuple:
+        """Carga los clientes y construye su índice de búsqueda (en el hilo de trabajo)"""
+        clients = self.get_clients_with_status()
+        index = ClientSearchIndex()
+        index.rebuild(zip(clients.ids, clients.names, clients.addresses))
+        return clients, index
+    
+    def _adopt_loaded_clients(self, loaded: tuple) -> ClientStatusTable:
+        clients, index = loaded
+        self.search_index.adopt(index)
+        return clients
+    
+    def load_clients_async(self) -> int:
+        """Carga en segundo plano los clientes con estado (clave 'clients')"""
+        return self.run_async('clients', self._load_clients_with_index)
+    
+    def load_statistics_async(self) -> int:
+        """Carga en segundo plano las estadísticas (clave 'statistics')"""
+        return self.run_async('statistics', self._read_statistics)
+    
+    def load_payments_by_date_async(self, date: str) -> int:
+        """Carga en segundo plano los pagos de un día (clave 'payments_by_date')"""
+        return self.run_async('payments_by_date', self.get_payments_by_date, date)
+    
+    def load_payment_calendar_async(self, year: int, month: int) -> int:
+        """Carga en segundo plano el resumen por día de un mes (clave 'payment_calendar')"""
+        return self.run_async('payment_calendar', self.get_payment_calendar, year, month)
     
     # Gestión de Clientes
     def add_client(self, name: str, address: str) -> Optional[int]:
@@ -44,8 +280,9 @@ class AppController(QObject):
             client_id = self.db_manager.add_client(name.strip(), address.strip())
             
             if client_id:
+                self.search_index.add(client_id, name.strip(), address.strip())
                 self.client_added.emit(client_id)
-                self.data_updated.emit()
+                self._refresh_statistics()
                 return client_id, "Cliente agregado exitosamente"
             else:
                 return None, "Error al agregar el cliente"
@@ -72,8 +309,9 @@ class AppController(QObject):
             success = self.db_manager.update_client(client_id, name.strip(), address.strip(), status)
             
             if success:
+                self.search_index.update(client_id, name.strip(), address.strip())
                 self.client_updated.emit(client_id)
-                self.data_updated.emit()
+                self._refresh_statistics()
                 return True, "Cliente actualizado exitosamente"
             else:
                 return False, "Error al actualizar el cliente"
@@ -93,8 +331,9 @@ class AppController(QObject):
             success = self.db_manager.delete_client(client_id)
             
             if success:
+                self.search_index.remove(client_id)
                 self.client_deleted.emit(client_id)
-                self.data_updated.emit()
+                self._refresh_statistics()
                 return True, "Cliente eliminado exitosamente"
             else:
                 return False, "Error al eliminar el cliente"
@@ -105,17 +344,19 @@ class AppController(QObject):
     def get_client(self, client_id: int) -> Optional[Dict]:
         """Obtiene un cliente por ID"""
         try:
-            return self.db_manager.get_client(client_id)
+            return self._cached(('client', client_id), lambda: self.db_manager.get_client(client_id),
+                                ('client', client_id))
         except Exception as e:
             print(f"Error al obtener cliente: {e}")
             return None
     
-    def search_clients(self, search_term: str) -> List[Dict]:
-        """Busca clientes por nombre, dirección o ID"""
+    def search_clients(self, search_term: str, limit: Optional[int] = None,
+                       offset: int = 0) -> List[Dict]:
+        """Busca clientes por nombre, dirección o ID (ordenados por relevancia)"""
         try:
             if not search_term.strip():
                 return self.get_all_clients()
-            return self.db_manager.search_clients(search_term.strip())
+            return self.db_manager.search_clients(search_term.strip(), limit, offset)
         except Exception as e:
             print(f"Error al buscar clientes: {e}")
             return []
@@ -128,32 +369,46 @@ class AppController(QObject):
             print(f"Error al obtener clientes: {e}")
             return []
     
-    def get_clients_with_status(self) -> List[ClientWithStatus]:
-        """Obtiene clientes con su estado de pago y consumo"""
-        try:
-            clients_data = self.db_manager.get_clients_with_payment_status()
-            return [
-                ClientWithStatus(
-                    id=client['id'],
-                    name=client['name'],
-                    address=client['address'],
-                    status=client['status'],
-                    payment_status=client['payment_status'],
-                    consumption_status=client['consumption_status']
-                ) for client in clients_data
-            ]
+    def get_clients_page(self, after: Optional[PageToken] = None,
+                         page_size: int = PAGE_SIZE) -> Tuple[List[Dict], Optional[PageToken]]:
+        """Obtiene una página de clientes y el token de la siguiente"""
+        try:
+            return self.db_manager.get_clients_page(after, page_size)
+        except Exception as e:
+            print(f"Error al obtener clientes: {e}")
+            return [], None
+    
+    def get_client_with_status(self, client_id: int) -> Optional[ClientWithStatus]:
+        """Obtiene un cliente con su estado de pago y consumo (una fila del dashboard)"""
+        try:
+            row = self._cached(('client_with_status', client_id),
+                               lambda: self.db_manager.get_client_with_payment_status(client_id),
+                               ('client', client_id))
+            return ClientWithStatus(**row) if row else None
+        except Exception as e:
+            print(f"Error al obtener cliente con estado: {e}")
+            return None
+    
+    def get_clients_with_status(self) -> ClientStatusTable:
+        """Obtiene clientes con su estado de pago y consumo (tabla por columnas)"""
+        try:
+            clients = self._cached(('clients_with_status',), lambda: ClientStatusTable.from_rows(
+                self.db_manager.get_clients_with_payment_status()), 'clients')
+            return self._refresh_stale_rows(clients)
         except Exception as e:
             print(f"Error al obtener clientes con estado: {e}")
-            return []
+            return ClientStatusTable()
     
     # Gestión de Pagos
-    def add_payment(self, client_id: int, amount: float, status: str = 'pagado', notes: str = '') -> tuple:
-        """Agrega un nuevo pago"""
+    def add_payment(self, client_id: int, amount: Union[Money, str, float],
+                    status: str = 'pagado', notes: str = '') -> tuple:
+        """Agrega un nuevo pago (monto en pesos o Money; se guarda en centavos)"""
         try:
             # Validar monto
             amount_valid, amount_msg = ValidationUtils.validate_amount(amount)
             if not amount_valid:
                 return None, amount_msg
+            amount = Money.from_value(amount)
             
             if status not in ['pagado', 'pendiente']:
                 return None, "Estado de pago inválido"
@@ -168,7 +423,7 @@ class AppController(QObject):
             
             if payment_id:
                 self.payment_added.emit(payment_id, client_id)
-                self.data_updated.emit()
+                self._refresh_statistics()
                 return payment_id, "Pago registrado exitosamente"
             else:
                 return None, "Error al registrar el pago"
@@ -179,29 +434,81 @@ class AppController(QObject):
     def get_client_payments(self, client_id: int) -> List[Dict]:
         """Obtiene todos los pagos de un cliente"""
         try:
-            return self.db_manager.get_client_payments(client_id)
+            return self._cached(('client_payments', client_id),
+                                lambda: self.db_manager.get_client_payments(client_id),
+                                ('client', client_id))
         except Exception as e:
             print(f"Error al obtener pagos del cliente: {e}")
             return []
     
+    def get_client_payments_page(self, client_id: int, after: Optional[PageToken] = None,
+                                 page_size: int = PAGE_SIZE) -> Tuple[List[Dict], Optional[PageToken]]:
+        """Obtiene una página de pagos de un cliente y el token de la siguiente"""
+        try:
+            return self._cached(('client_payments_page', client_id, after, page_size),
+                                lambda: self.db_manager.get_client_payments_page(client_id, after, page_size),
+                                ('client', client_id))
+        except Exception as e:
+            print(f"Error al obtener pagos del cliente: {e}")
+            return [], None
+    
     def get_payments_by_date(self, date: str) -> List[Dict]:
         """Obtiene pagos por fecha específica"""
         try:
-            return self.db_manager.get_payments_by_date(date)
+            return self._cached(('payments_by_date', date),
+                                lambda: self.db_manager.get_payments_by_date(date), 'payments')
         except Exception as e:
             print(f"Error al obtener pagos por fecha: {e}")
             return []
     
+    def get_payment_calendar(self, year: int, month: int) -> Dict[int, Dict[str, int]]:
+        """Obtiene pagos y excesos por día de un mes, para marcar el calendario"""
+        try:
+            return self._cached(('payment_calendar', year, month),
+                                lambda: self.db_manager.get_payment_calendar(year, month), 'payments')
+        except Exception as e:
+            print(f"Error al obtener el calendario de pagos: {e}")
+            return {}
+    
+    def get_payments_between(self, start, end) -> List[Dict]:
+        """Obtiene los pagos en el rango semiabierto [start, end)"""
+        try:
+            return self.db_manager.get_payments_between(start, end)
+        except Exception as e:
+            print(f"Error al obtener pagos por rango: {e}")
+            return []
+    
+    def get_payments_by_month(self, year: int, month: int) -> List[Dict]:
+        """Obtiene los pagos de un mes"""
+        try:
+            return self.db_manager.get_payments_by_month(year, month)
+        except Exception as e:
+            print(f"Error al obtener pagos del mes: {e}")
+            return []
+    
+    def get_payments_by_week(self, day) -> List[Dict]:
+        """Obtiene los pagos de la semana que contiene una fecha"""
+        try:
+            return self.db_manager.get_payments_by_week(day)
+        except Exception as e:
+            print(f"Error al obtener pagos de la semana: {e}")
+            return []
+    
     def update_payment_status(self, payment_id: int, status: str) -> tuple:
         """Actualiza el estado de un pago"""
         try:
             if status not in ['pagado', 'pendiente']:
                 return False, "Estado inválido"
             
+            payment = self.db_manager.get_payment(payment_id)
+            if not payment:
+                return False, "Pago no encontrado"
+            
             success = self.db_manager.update_payment_status(payment_id, status)
             
             if success:
-                self.data_updated.emit()
+                self.payment_updated.emit(payment_id, payment['client_id'])
+                self._refresh_statistics()
                 return True, "Estado del pago actualizado"
             else:
                 return False, "Error al actualizar el pago"
@@ -226,7 +533,7 @@ class AppController(QObject):
             
             if consumption_id:
                 self.consumption_added.emit(consumption_id, client_id)
-                self.data_updated.emit()
+                self._refresh_statistics()
                 return consumption_id, "Consumo registrado exitosamente"
             else:
                 return None, "Error al registrar el consumo"
@@ -234,21 +541,115 @@ class AppController(QObject):
         except Exception as e:
             return None, f"Error inesperado: {str(e)}"
     
+    def get_client_profile(self, client_id: int) -> Dict:
+        """Obtiene el cliente con la primera página de sus pagos y consumos
+        
+        payments_next y consumption_next son los tokens para pedir las
+        páginas siguientes (None si no hay más).
+        """
+        payments, payments_next = self.get_client_payments_page(client_id)
+        consumption, consumption_next = self.get_client_consumption_page(client_id)
+        return {
+            'client': self.get_client(client_id),
+            'payments': payments,
+            'payments_next': payments_next,
+            'consumption': consumption,
+            'consumption_next': consumption_next,
+        }
+    
     def get_client_consumption(self, client_id: int) -> List[Dict]:
         """Obtiene el historial de consumo de un cliente"""
         try:
-            return self.db_manager.get_client_consumption(client_id)
+            return self._cached(('client_consumption', client_id),
+                                lambda: self.db_manager.get_client_consumption(client_id),
+                                ('client', client_id))
         except Exception as e:
             print(f"Error al obtener consumo del cliente: {e}")
             return []
     
+    def get_client_consumption_page(self, client_id: int, after: Optional[PageToken] = None,
+                                    page_size: int = PAGE_SIZE) -> Tuple[List[Dict], Optional[PageToken]]:
+        """Obtiene una página del historial de consumo y el token de la siguiente"""
+        try:
+            return self._cached(('client_consumption_page', client_id, after, page_size),
+                                lambda: self.db_manager.get_client_consumption_page(client_id, after, page_size),
+                                ('client', client_id))
+        except Exception as e:
+            print(f"Error al obtener consumo del cliente: {e}")
+            return [], None
+    
+    # Operaciones masivas
+    @staticmethod
+    def _validated(rows: Iterable, validate) -> Iterable:
+        """Valida las filas a medida que se consumen; la primera inválida aborta el lote"""
+        for row_number, row in enumerate(rows, start=1):
+            valid, message = validate(row)
+            if not valid:
+                raise ValueError(f"Fila {row_number}: {message}")
+            yield row
+    
+    @staticmethod
+    def _validate_client_row(client) -> tuple:
+        name, address = (client['name'], client['address']) if isinstance(client, dict) else client[:2]
+        name_valid, name_msg = ValidationUtils.validate_client_name(name)
+        if not name_valid:
+            return False, name_msg
+        return ValidationUtils.validate_address(address)
+    
+    @staticmethod
+    def _validate_payment_row(payment) -> tuple:
+        if isinstance(payment, dict):
+            amount, status = payment['amount'], payment.get('status', 'pagado')
+        else:
+            amount, status = payment[1], payment[2] if len(payment) > 2 else 'pagado'
+        if status not in ['pagado', 'pendiente']:
+            return False, "Estado de pago inválido"
+        return ValidationUtils.validate_amount(amount)
+    
+    @staticmethod
+    def _validate_consumption_row(record) -> tuple:
+        if isinstance(record, dict):
+            consumption_type = record.get('consumption_type', 'normal')
+        else:
+            consumption_type = record[1] if len(record) > 1 else 'normal'
+        if consumption_type not in ['normal', 'exceso']:
+            return False, "Tipo de consumo inválido"
+        return True, "Consumo válido"
+    
+    def _run_bulk(self, insert, rows: Iterable, validate, chunk_size: int, label: str) -> tuple:
+        """Ejecuta una inserción masiva y emite una sola señal data_updated"""
+        try:
+            ids = insert(self._validated(rows, validate), chunk_size)
+        except ValueError as e:
+            return [], str(e)
+        except Exception as e:
+            return [], f"Error al registrar {label}: {str(e)}"
+        
+        if ids:
+            self.query_cache.clear()
+            self.data_updated.emit()
+        return ids, f"{len(ids)} {label} registrados exitosamente"
+    
+    def add_clients_bulk(self, clients: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> tuple:
+        """Agrega muchos clientes en una sola transacción"""
+        return self._run_bulk(self.db_manager.add_clients_bulk, clients,
+                              self._validate_client_row, chunk_size, "clientes")
+    
+    def add_payments_bulk(self, payments: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> tuple:
+        """Agrega muchos pagos en una sola transacción"""
+        return self._run_bulk(self.db_manager.add_payments_bulk, payments,
+                              self._validate_payment_row, chunk_size, "pagos")
+    
+    def add_consumption_bulk(self, records: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> tuple:
+        """Registra muchos consumos en una sola transacción"""
+        return self._run_bulk(self.db_manager.add_consumption_bulk, records,
+                              self._validate_consumption_row, chunk_size, "consumos")
+    
     # Estadísticas y Reportes
     def get_statistics(self) -> Dict:
         """Obtiene estadísticas generales del sistema"""
         try:
-            stats = self.db_manager.get_statistics()
-            self._statistics = stats
-            return stats
+            return self._cached(('statistics',), self.db_manager.get_statistics, 'statistics')
         except Exception as e:
             print(f"Error al obtener estadísticas: {e}")
             return {
@@ -258,49 +659,98 @@ class AppController(QObject):
                 'excess_consumption': 0
             }
     
+    def export_table_to_csv(self, table: str, filename: str, columns: Optional[List[str]] = None) -> tuple:
+        """Exporta una tabla completa a CSV (o .csv.gz) sin cargarla en memoria"""
+        try:
+            cursor = self.db_manager.get_export_cursor(table, columns)
+        except ValueError as e:
+            return False, str(e)
+        
+        try:
+            exported = DataExporter.export_cursor_to_csv(cursor, filename)
+        finally:
+            cursor.close()
+        
+        if exported < 0:
+            return False, "Error al exportar los datos"
+        return True, f"{exported} registros exportados"
+    
+    def export_table_to_columnar(self, table: str, directory: str, columns: Optional[List[str]] = None,
+                                 file_format: Optional[str] = None) -> tuple:
+        """Exporta una tabla a Parquet (o .npz) en directory/<tabla>, particionada por mes"""
+        date_column = EXPORT_DATE_COLUMNS.get(table)
+        if columns and date_column and date_column not in columns:
+            columns = list(columns) + [date_column]
+        
+        try:
+            column_types = self.db_manager.get_export_columns(table)
+            cursor = self.db_manager.get_export_cursor(table, columns, order_by_date=bool(date_column))
+        except ValueError as e:
+            return False, str(e)
+        
+        try:
+            exported = DataExporter.export_cursor_to_columnar(
+                cursor, os.path.join(directory, table), column_types,
+                partition_column=date_column, file_format=file_format
+            )
+        finally:
+            cursor.close()
+        
+        if exported < 0:
+            return False, "Error al exportar los datos"
+        return True, f"{exported} registros exportados"
+    
+    def generate_all_client_reports(self, output: str, as_zip: bool = False,
+                                    workers: Optional[int] = None) -> tuple:
+        """Genera el reporte de todos los clientes en un directorio o un zip"""
+        try:
+            result = BatchReportGenerator(self.db_manager, output, as_zip, workers).run()
+        except Exception as e:
+            print(f"Error al generar reportes: {e}")
+            return False, "Error al generar los reportes"
+        
+        return True, (f"{result['reports']} reportes generados "
+                      f"({result['reports_per_second']:.0f} reportes/s)")
+    
     def get_monthly_payment_data(self, months: int = 12) -> List[Dict]:
-        """Obtiene datos de pagos por mes para gráficos"""
+        """Obtiene los pagos de los últimos N meses para gráficos (meses sin pagos en cero)"""
         try:
-            # Esta funcionalidad se puede expandir agregando métodos específicos al DatabaseManager
-            # Por ahora retornamos datos de ejemplo
-            from datetime import datetime, timedelta
-            from utils.helpers import DateUtils
-            
-            monthly_data = []
             month_list = DateUtils.get_last_n_months(months)
+            if not month_list:
+                return []
+            rows = self._cached(('monthly_totals', month_list[0], month_list[-1]),
+                                lambda: self.db_manager.get_monthly_payment_totals(month_list[0], month_list[-1]),
+                                'statistics', 'payments')
+            totals = {row['month']: row for row in rows}
             
-            for month in month_list:
-                # Aquí se implementaría la consulta real a la base de datos
-                # Por ahora usamos datos simulados
-                monthly_data.append({
-                    'month': month,
-                    'total_amount': 0,  # Se calcularía desde la BD
-                    'payment_count': 0   # Se calcularía desde la BD
-                })
-            
-            return monthly_data
+            empty = {'payment_count': 0, 'total_amount': Money(0),
+                     'pending_count': 0, 'pending_amount': Money(0)}
+            return [{**totals.get(month, empty), 'month': month} for month in month_list]
             
         except Exception as e:
             print(f"Error al obtener datos mensuales: {e}")
             return []
     
     def get_payment_status_summary(self) -> Dict[str, int]:
-        """Obtiene resumen de estados de pago"""
+        """Obtiene cuántos clientes activos están al corriente, con deuda o sin pagos
+        
+        Cuenta por el estado del pago más reciente de cada cliente activo (el
+        mismo que muestra la tabla del dashboard). El desglose por mes está en
+        get_monthly_payment_data (payment_count y pending_count).
+        """
         try:
-            # Esta consulta se puede agregar al DatabaseManager
-            # Por ahora usamos las estadísticas existentes
-            stats = self.get_statistics()
-            total_clients = stats['total_clients']
-            clients_with_debt = stats['clients_with_debt']
-            
+            counts = self._cached(('payment_status_counts',),
+                                  self.db_manager.get_client_payment_status_counts,
+                                  'statistics', 'payments')
             return {
-                'paid': total_clients - clients_with_debt,
-                'pending': clients_with_debt
+                'paid': counts['pagado'],
+                'pending': counts['pendiente'],
+                'no_payments': counts['sin_pagos']
             }
             
         except Exception as e:
             print(f"Error al obtener resumen de pagos: {e}")
-            return {'paid': 0, 'pending': 0}
+            return {'paid': 0, 'pending': 0, 'no_payments': 0}
     
     # Gestión de Configuración
     def verify_pin(self, pin: str) -> bool:
@@ -338,14 +788,10 @@ class AppController(QObject):
     def filter_clients_by_status(self, clients: List[ClientWithStatus], filter_type: str) -> List[ClientWithStatus]:
         """Filtra clientes según criterios específicos"""
         try:
-            if filter_type == "Solo con deuda":
-                return [c for c in clients if c.payment_status == "pendiente"]
-            elif filter_type == "Solo al corriente":
-                return [c for c in clients if c.payment_status == "pagado"]
-            elif filter_type == "Exceso de consumo":
-                return [c for c in clients if c.consumption_status == "exceso"]
-            else:  # "Todos"
+            if filter_type not in CLIENT_STATUS_FILTERS:  # "Todos"
                 return clients
+            field, value = CLIENT_STATUS_FILTERS[filter_type]
+            return [c for c in clients if getattr(c, field) == value]
                 
         except Exception as e:
             print(f"Error al filtrar clientes: {e}")
@@ -357,16 +803,13 @@ class AppController(QObject):
             if not search_term.strip():
                 return clients
             
-            search_lower = search_term.lower().strip()
-            
-            filtered = []
-            for client in clients:
-                if (search_lower in client.name.lower() or 
-                    search_lower in client.address.lower() or 
-                    search_lower in str(client.id)):
-                    filtered.append(client)
+            # El índice ya tiene los campos normalizados; solo se reconstruye
+            # si la lista recibida trae clientes que no conoce
+            if any(client.id not in self.search_index for client in clients):
+                self.search_index.rebuild((client.id, client.name, client.address) for client in clients)
             
-            return filtered
+            matched = self.search_index.search(search_term)
+            return [client for client in clients if client.id in matched]
             
         except Exception as e:
             print(f"Error al filtrar por búsqueda: {e}")
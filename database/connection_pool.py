@@ -0,0 +1,219 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Pool de Conexiones SQLite
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Dict, Union
+
+# Perfiles de rendimiento (PRAGMAs aplicados a cada conexión nueva).
+# "durable": WAL con fsync en cada commit, para equipos sin respaldo eléctrico.
+# "fast": WAL con synchronous=NORMAL; un corte de luz puede perder las últimas
+#         transacciones, pero nunca corrompe la base de datos.
+PERFORMANCE_PROFILES: Dict[str, Dict[str, Union[str, int]]] = {
+    'durable': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -8000,  # KiB (negativo = tamaño en KiB)
+        'temp_store': 'DEFAULT',
+    },
+    'fast': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -32000,
+        'mmap_size': 268435456,  # 256 MiB
+        'temp_store': 'MEMORY',
+    },
+}
+
+DEFAULT_PROFILE = 'fast'
+
+# Variable de entorno para elegir el perfil por instalación
+PROFILE_ENV_VAR = 'AGUA_DB_PROFILE'
+
+# Pools compartidos por ruta de base de datos (todas las instancias de
+# DatabaseManager que apuntan al mismo archivo reutilizan las conexiones)
+_pools: Dict[str, "ConnectionPool"] = {}
+_pools_lock = threading.Lock()
+
+class PoolExhaustedError(sqlite3.OperationalError):
+    """Se lanza cuando no hay conexiones disponibles en el pool"""
+
+def resolve_profile(profile: Union[str, Dict, None] = None) -> Dict[str, Union[str, int]]:
+    """Obtiene los PRAGMAs de un perfil por nombre, diccionario o variable de entorno"""
+    if isinstance(profile, dict):
+        return dict(profile)
+
+    name = profile or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE
+    if name not in PERFORMANCE_PROFILES:
+        raise ValueError(f"Perfil de base de datos desconocido: {name}")
+    return dict(PERFORMANCE_PROFILES[name])
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, Union[str, int]]):
+    """Aplica una lista de PRAGMAs a una conexión"""
+    for pragma, value in pragmas.items():
+        conn.execute(f'PRAGMA {pragma} = {value}')
+
+class _ThreadToken:
+    """Marca guardada en el almacenamiento local del hilo dueño de una conexión"""
+
+class ConnectionPool:
+    """Pool de conexiones persistentes, una por hilo
+
+    La conexión de un hilo de threading se cierra cuando el hilo termina: su
+    almacenamiento local se destruye con él y el finalizador de la marca
+    libera el lugar. Los hilos ajenos a threading (los de QThreadPool) no
+    conservan ese almacenamiento entre tareas, así que su conexión dura
+    hasta release() o close_all().
+    """
+
+    def __init__(self, db_path: str, max_size: int = 8, timeout: float = 5.0,
+                 health_check_interval: float = 30.0,
+                 profile: Union[str, Dict, None] = None):
+        self.db_path = db_path
+        self.pragmas = resolve_profile(profile)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._connections: Dict[int, sqlite3.Connection] = {}
+        self._last_checked: Dict[int, float] = {}
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._closed = False
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Crea una nueva conexión configurada"""
+        # check_same_thread=False solo para poder cerrarla desde close_all();
+        # cada conexión se usa exclusivamente desde el hilo que la creó
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Permite acceso por nombre de columna
+        apply_pragmas(conn, self.pragmas)
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Verifica que la conexión siga respondiendo"""
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _bind_to_thread(self, thread_id: int, conn: sqlite3.Connection):
+        """Programa el cierre de la conexión para cuando termine su hilo"""
+        self._local.connection = conn
+        if any(thread.ident == thread_id for thread in threading.enumerate()):
+            token = _ThreadToken()
+            weakref.finalize(token, self._release_finished_thread, thread_id, conn)
+            self._local.token = token
+
+    def _release_finished_thread(self, thread_id: int, conn: sqlite3.Connection):
+        """Finalizador: cierra la conexión de un hilo que terminó"""
+        with self._condition:
+            # Si el identificador ya se reutilizó, la conexión es de otro hilo
+            if self._connections.get(thread_id) is conn:
+                self._discard(thread_id)
+                self._condition.notify()
+
+    def _discard(self, thread_id: int):
+        """Elimina y cierra la conexión de un hilo"""
+        conn = self._connections.pop(thread_id, None)
+        self._last_checked.pop(thread_id, None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Obtiene la conexión persistente del hilo actual"""
+        thread_id = threading.get_ident()
+        now = time.monotonic()
+
+        with self._condition:
+            if self._closed:
+                raise sqlite3.ProgrammingError("El pool de conexiones está cerrado")
+
+            conn = self._connections.get(thread_id)
+            if conn is not None:
+                if getattr(self._local, 'connection', None) is not conn:
+                    # Conexión heredada con el identificador o hilo ajeno a threading
+                    self._bind_to_thread(thread_id, conn)
+                # Verificación de salud periódica
+                if now - self._last_checked[thread_id] < self.health_check_interval:
+                    return conn
+                if self._is_healthy(conn):
+                    self._last_checked[thread_id] = now
+                    return conn
+                self._discard(thread_id)
+
+            deadline = now + self.timeout
+            while len(self._connections) >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhaustedError(
+                        f"No hay conexiones disponibles (máximo {self.max_size})"
+                    )
+                self._condition.wait(remaining)
+
+            conn = self._create_connection()
+            self._connections[thread_id] = conn
+            self._last_checked[thread_id] = time.monotonic()
+            self._bind_to_thread(thread_id, conn)
+            return conn
+
+    def release(self):
+        """Libera la conexión del hilo actual (útil en hilos de trabajo)"""
+        with self._condition:
+            self._discard(threading.get_ident())
+            self._condition.notify()
+
+    def size(self) -> int:
+        """Número de conexiones abiertas"""
+        with self._condition:
+            return len(self._connections)
+
+    def close_all(self):
+        """Cierra todas las conexiones del pool"""
+        with self._condition:
+            for thread_id in list(self._connections):
+                self._discard(thread_id)
+            self._closed = True
+            self._condition.notify_all()
+
+def get_pool(db_path: str, **options) -> ConnectionPool:
+    """Obtiene (o crea) el pool compartido para una base de datos
+
+    Las opciones (tamaño, perfil) solo se aplican al crear el pool; las
+    instancias posteriores para la misma ruta comparten el pool existente.
+    """
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(db_path, **options)
+            _pools[key] = pool
+        return pool
+
+def close_pool(db_path: str):
+    """Cierra el pool de una base de datos específica"""
+    with _pools_lock:
+        pool = _pools.pop(os.path.abspath(db_path), None)
+    if pool is not None:
+        pool.close_all()
+
+def close_all_pools():
+    """Cierra todos los pools (se ejecuta al salir de la aplicación)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+atexit.register(close_all_pools)
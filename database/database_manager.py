@@ -5,19 +5,81 @@ Módulo: Gestor de Base de Datos SQLite
 
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from contextlib import contextmanager
+from dataclasses import fields
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import groupby, islice
+from typing import List, Dict, Optional, Tuple, Union, Iterable, Iterator
+from database.connection_pool import get_pool, close_pool
+from database.schema import (SCHEMA_MIGRATIONS, DASHBOARD_SUMMARY_SOURCE,
+                             CLIENT_LAST_PAYMENT_REFRESH, CLIENT_LAST_CONSUMPTION_REFRESH,
+                             CLIENT_SEARCH_POPULATE, PAYMENTS_MONTHLY_ROLLUP_SOURCE,
+                             fold_search_text)
+from models.data_models import Client, Money, Payment
+from utils.date_utils import DateUtils
+from utils.search_index import NGRAM_SIZE
+
+# Filas por llamada a executemany en las inserciones masivas
+BULK_CHUNK_SIZE = 1000
+
+# Filas por página en las consultas paginadas por clave
+PAGE_SIZE = 100
+
+# Token de continuación de una página: (clave de orden, id) de su última fila
+PageToken = Tuple[str, int]
+
+# Filas leídas por llamada a fetchmany en los iteradores
+ITER_BATCH_SIZE = 1000
+
+# Formatos de fila de los iteradores: diccionario, tupla o modelo de data_models
+ROW_FORMATS = ('dict', 'tuple', 'model')
+
+# Tablas que se pueden exportar completas
+EXPORTABLE_TABLES = ('clients', 'payments', 'water_consumption')
+
+# Columna de fecha usada para particionar por mes las exportaciones columnares
+EXPORT_DATE_COLUMNS = {'payments': 'payment_date', 'water_consumption': 'consumption_date'}
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "database/agua_system.db"):
+    def __init__(self, db_path: str = "database/agua_system.db", pool_size: int = 8,
+                 profile: Union[str, Dict, None] = None):
+        """
+        profile: perfil de rendimiento ("durable", "fast" o un diccionario de
+        PRAGMAs); si se omite se usa la variable de entorno AGUA_DB_PROFILE
+        o el perfil por defecto.
+        """
         self.db_path = db_path
+        self.pool = get_pool(db_path, max_size=pool_size, profile=profile)
         self.init_database()
     
     def get_connection(self) -> sqlite3.Connection:
-        """Obtiene una conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Permite acceso por nombre de columna
-        return conn
+        """Obtiene la conexión persistente del hilo actual desde el pool"""
+        return self.pool.get_connection()
+    
+    def close(self):
+        """Cierra las conexiones del pool de esta base de datos"""
+        close_pool(self.db_path)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Ejecuta un bloque dentro de una transacción de escritura
+        
+        Es reentrante: si el hilo ya tiene una transacción abierta, el bloque
+        se une a ella y el commit lo hace la transacción externa.
+        """
+        conn = self.get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
     
     def init_database(self):
         """Inicializa la base de datos y crea las tablas necesarias"""
@@ -45,12 +107,14 @@ class DatabaseManager:
                 )
             ''')
             
-            # Tabla de pagos
+            # Tabla de pagos: el monto se guarda en centavos; amount (pesos) es
+            # una columna generada, así que los INSERT deben usar amount_cents
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS payments (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     client_id INTEGER NOT NULL,
-                    amount REAL NOT NULL,
+                    amount_cents INTEGER NOT NULL,
+                    amount REAL GENERATED ALWAYS AS (amount_cents / 100.0) VIRTUAL,
                     payment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     status TEXT DEFAULT 'pagado' CHECK(status IN ('pagado', 'pendiente')),
                     notes TEXT,
@@ -78,6 +142,51 @@ class DatabaseManager:
                 cursor.execute('INSERT INTO admins (pin) VALUES (?)', ('1234',))
             
             conn.commit()
+            
+            self.apply_migrations(conn)
+    
+    def get_schema_version(self) -> int:
+        """Obtiene la versión actual del esquema"""
+        with self.get_connection() as conn:
+            return conn.execute('PRAGMA user_version').fetchone()[0]
+
+    def get_data_version(self) -> Optional[int]:
+        """Obtiene PRAGMA data_version de la conexión del hilo actual
+
+        El valor cambia solo cuando otra conexión (otro hilo, proceso o
+        estación) confirma cambios; los commits de esta conexión no lo
+        alteran. Retorna None si la base de datos no responde.
+        """
+        try:
+            return self.get_connection().execute('PRAGMA data_version').fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error al leer data_version: {e}")
+            return None
+
+    def apply_migrations(self, conn: sqlite3.Connection):
+        """Aplica las migraciones de esquema pendientes"""
+        current = conn.execute('PRAGMA user_version').fetchone()[0]
+        if current >= SCHEMA_MIGRATIONS[-1][0]:
+            return
+        
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            # Releer dentro de la transacción por si otra instancia ya migró
+            current = cursor.execute('PRAGMA user_version').fetchone()[0]
+            for version, description, statements in SCHEMA_MIGRATIONS:
+                if version <= current:
+                    continue
+                for statement in statements:
+                    if callable(statement):
+                        statement(cursor)
+                    else:
+                        cursor.execute(statement)
+                cursor.execute(f'PRAGMA user_version = {version}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
     
     def verify_pin(self, pin: str) -> bool:
         """Verifica si el PIN es correcto"""
@@ -129,17 +238,99 @@ class DatabaseManager:
             cursor.execute('SELECT * FROM clients ORDER BY name')
             return [dict(row) for row in cursor.fetchall()]
     
-    def search_clients(self, search_term: str) -> List[Dict]:
-        """Busca clientes por nombre, dirección o ID"""
+    @staticmethod
+    def _fetch_page(cursor: sqlite3.Cursor, page_size: int,
+                    sort_column: str) -> Tuple[List[Dict], Optional[PageToken]]:
+        """Lee una página (la consulta pide page_size + 1 filas) y arma el token siguiente"""
+        rows = [dict(row) for row in cursor.fetchmany(page_size + 1)]
+        if len(rows) <= page_size:
+            return rows, None
+        del rows[page_size:]
+        return rows, (rows[-1][sort_column], rows[-1]['id'])
+    
+    def get_clients_page(self, after: Optional[PageToken] = None,
+                         page_size: int = PAGE_SIZE) -> Tuple[List[Dict], Optional[PageToken]]:
+        """Obtiene una página de clientes ordenados por nombre
+        
+        after es el token (nombre, id) que retornó la página anterior. Retorna
+        las filas y el token de la siguiente página (None si era la última).
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            search_term = f"%{search_term}%"
-            cursor.execute('''
-                SELECT * FROM clients 
-                WHERE name LIKE ? OR address LIKE ? OR CAST(id AS TEXT) LIKE ?
-                ORDER BY name
-            ''', (search_term, search_term, search_term))
-            return [dict(row) for row in cursor.fetchall()]
+            if after is None:
+                cursor.execute('SELECT * FROM clients ORDER BY name, id LIMIT ?', (page_size + 1,))
+            else:
+                cursor.execute('''
+                    SELECT * FROM clients WHERE (name, id) > (?, ?)
+                    ORDER BY name, id LIMIT ?
+                ''', (after[0], after[1], page_size + 1))
+            return self._fetch_page(cursor, page_size, 'name')
+    
+    def has_client_search_index(self) -> bool:
+        """Indica si existe el índice de texto completo clients_fts (requiere FTS5)"""
+        with self.get_connection() as conn:
+            return conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'clients_fts'"
+            ).fetchone() is not None
+
+    def search_clients(self, search_term: str, limit: Optional[int] = None,
+                       offset: int = 0) -> List[Dict]:
+        """Busca clientes por nombre, dirección o ID
+
+        La búsqueda ignora mayúsculas y acentos. Un término numérico que sea
+        el ID de un cliente lo pone primero; el resto de los resultados se
+        ordena por relevancia (bm25) y nombre. limit/offset permiten paginar.
+        """
+        term = fold_search_text(search_term).strip()
+        if not term:
+            return []
+        limit = -1 if limit is None else limit
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            results = []
+            exact_id = None
+            if term.isdigit():
+                cursor.execute('SELECT * FROM clients WHERE id = ?', (int(term),))
+                row = cursor.fetchone()
+                if row:
+                    exact_id = row['id']
+                    if offset == 0:
+                        results.append(dict(row))
+                    else:
+                        offset -= 1
+                    if limit > 0:
+                        limit -= len(results)
+                        if limit == 0:
+                            return results
+
+            if len(term) >= NGRAM_SIZE and self.has_client_search_index():
+                # Trigram: la frase entre comillas coincide como subcadena
+                cursor.execute('''
+                    SELECT c.* FROM clients_fts f
+                    JOIN clients c ON c.id = f.rowid
+                    WHERE clients_fts MATCH ? AND f.rowid IS NOT ?
+                    ORDER BY f.rank, c.name
+                    LIMIT ? OFFSET ?
+                ''', ('"' + term.replace('"', '""') + '"', exact_id, limit, offset))
+            elif term.isdigit():
+                # Los números cortos solo se buscan como ID
+                return results
+            else:
+                # Términos de menos de tres letras (o SQLite sin FTS5): LIKE
+                # ignora mayúsculas pero no acentos; ordenar por el índice de
+                # nombre permite detenerse al llenar la página
+                raw_term = search_term.strip()
+                pattern = '%' + raw_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                cursor.execute('''
+                    SELECT * FROM clients
+                    WHERE (name LIKE ? ESCAPE '\\' OR address LIKE ? ESCAPE '\\')
+                    AND id IS NOT ?
+                    ORDER BY name
+                    LIMIT ? OFFSET ?
+                ''', (pattern, pattern, exact_id, limit, offset))
+            results.extend(dict(row) for row in cursor.fetchall())
+            return results
     
     def update_client(self, client_id: int, name: str, address: str, status: str) -> bool:
         """Actualiza un cliente"""
@@ -175,21 +366,31 @@ class DatabaseManager:
             return False
     
     # CRUD de Pagos
-    def add_payment(self, client_id: int, amount: float, status: str = 'pagado', notes: str = '') -> Optional[int]:
-        """Agrega un nuevo pago"""
+    def add_payment(self, client_id: int, amount: Union[Money, Decimal, str, float],
+                    status: str = 'pagado', notes: str = '') -> Optional[int]:
+        """Agrega un nuevo pago (el monto se guarda en centavos)"""
         try:
+            amount_cents = Money.from_value(amount).cents
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT INTO payments (client_id, amount, status, notes)
+                    INSERT INTO payments (client_id, amount_cents, status, notes)
                     VALUES (?, ?, ?, ?)
-                ''', (client_id, amount, status, notes))
+                ''', (client_id, amount_cents, status, notes))
                 conn.commit()
                 return cursor.lastrowid
         except Exception as e:
             print(f"Error al agregar pago: {e}")
             return None
-    
+
+    def get_payment(self, payment_id: int) -> Optional[Dict]:
+        """Obtiene un pago por ID"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM payments WHERE id = ?', (payment_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
     def get_client_payments(self, client_id: int) -> List[Dict]:
         """Obtiene todos los pagos de un cliente"""
         with self.get_connection() as conn:
@@ -201,19 +402,129 @@ class DatabaseManager:
             ''', (client_id,))
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_client_payments_page(self, client_id: int, after: Optional[PageToken] = None,
+                                 page_size: int = PAGE_SIZE) -> Tuple[List[Dict], Optional[PageToken]]:
+        """Obtiene una página de pagos de un cliente, del más reciente al más antiguo
+        
+        after es el token (payment_date, id) de la página anterior. Los empates
+        de fecha se ordenan por id ascendente, el orden del índice
+        (client_id, payment_date DESC), así cada página es un rango del índice.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if after is None:
+                cursor.execute('''
+                    SELECT * FROM payments WHERE client_id = ?
+                    ORDER BY payment_date DESC, id LIMIT ?
+                ''', (client_id, page_size + 1))
+            else:
+                cursor.execute('''
+                    SELECT * FROM payments
+                    WHERE client_id = ? AND payment_date <= ?
+                    AND (payment_date < ? OR id > ?)
+                    ORDER BY payment_date DESC, id LIMIT ?
+                ''', (client_id, after[0], after[0], after[1], page_size + 1))
+            return self._fetch_page(cursor, page_size, 'payment_date')
+    
     def get_payments_by_date(self, date: str) -> List[Dict]:
-        """Obtiene pagos por fecha específica"""
+        """Obtiene pagos por fecha específica (YYYY-MM-DD)"""
+        day_key = DateUtils.to_day_key(datetime.strptime(date, '%Y-%m-%d'))
+        return self._get_payments_by_days(day_key, day_key)
+    
+    def _get_payments_by_days(self, first_day: int, last_day: int) -> List[Dict]:
+        """Obtiene los pagos con clave day (AAAAMMDD) entre first_day y last_day inclusive
+        
+        Ordenar por day y luego por payment_date equivale a ordenar solo por
+        la fecha, y así el índice (day, payment_date) entrega las filas en orden.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT p.*, c.name, c.address 
+                FROM payments p
+                JOIN clients c ON p.client_id = c.id
+                WHERE p.day BETWEEN ? AND ?
+                ORDER BY p.day DESC, p.payment_date DESC
+            ''', (first_day, last_day))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_payments_between(self, start: Union[datetime, str], end: Union[datetime, str]) -> List[Dict]:
+        """Obtiene los pagos en el rango semiabierto [start, end)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT p.*, c.name, c.address 
                 FROM payments p
                 JOIN clients c ON p.client_id = c.id
-                WHERE DATE(p.payment_date) = ?
+                WHERE p.payment_date >= ? AND p.payment_date < ?
                 ORDER BY p.payment_date DESC
-            ''', (date,))
+            ''', (DateUtils.to_db_timestamp(start), DateUtils.to_db_timestamp(end)))
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_payments_by_month(self, year: int, month: int) -> List[Dict]:
+        """Obtiene los pagos de un mes"""
+        month_key = DateUtils.to_month_key(year, month)
+        return self._get_payments_by_days(month_key * 100 + 1, month_key * 100 + 31)
+    
+    def get_payments_by_week(self, day: date) -> List[Dict]:
+        """Obtiene los pagos de la semana (lunes a domingo) que contiene una fecha"""
+        monday, next_monday = DateUtils.get_week_bounds(day)
+        return self._get_payments_by_days(DateUtils.to_day_key(monday),
+                                          DateUtils.to_day_key(next_monday - timedelta(days=1)))
+    
+    def get_payment_calendar(self, year: int, month: int) -> Dict[int, Dict[str, int]]:
+        """Resume por día de un mes los pagos (pagados y pendientes) y los excesos de consumo
+        
+        Retorna {día del mes: {'paid', 'pending', 'excess'}} solo para los días
+        con registros. Agrupa por la columna day usando sus índices.
+        """
+        first_day = DateUtils.to_month_key(year, month) * 100 + 1
+        last_day = first_day + 30
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT day, SUM(paid), SUM(pending), SUM(excess) FROM (
+                    SELECT day, status = 'pagado' AS paid, status = 'pendiente' AS pending,
+                           0 AS excess
+                    FROM payments WHERE day BETWEEN ? AND ?
+                    UNION ALL
+                    SELECT day, 0, 0, consumption_type = 'exceso'
+                    FROM water_consumption WHERE day BETWEEN ? AND ?
+                )
+                GROUP BY day
+            ''', (first_day, last_day, first_day, last_day))
+            return {row[0] % 100: {'paid': row[1], 'pending': row[2], 'excess': row[3]}
+                    for row in cursor.fetchall()}
+    
+    def get_payments_total(self, client_id: Optional[int] = None,
+                           start: Union[datetime, str, None] = None,
+                           end: Union[datetime, str, None] = None,
+                           status: Optional[str] = 'pagado') -> Money:
+        """Suma exacta de los pagos, calculada en SQLite sobre los centavos enteros
+        
+        Filtros opcionales: cliente, rango semiabierto [start, end) y estado
+        (None suma todos los estados).
+        """
+        conditions, params = [], []
+        if client_id is not None:
+            conditions.append('client_id = ?')
+            params.append(client_id)
+        if status is not None:
+            conditions.append('status = ?')
+            params.append(status)
+        if start is not None:
+            conditions.append('payment_date >= ?')
+            params.append(DateUtils.to_db_timestamp(start))
+        if end is not None:
+            conditions.append('payment_date < ?')
+            params.append(DateUtils.to_db_timestamp(end))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        with self.get_connection() as conn:
+            row = conn.execute(f'SELECT COALESCE(SUM(amount_cents), 0) FROM payments {where}',
+                               tuple(params)).fetchone()
+            return Money(row[0])
+    
     def update_payment_status(self, payment_id: int, status: str) -> bool:
         """Actualiza el estado de un pago"""
         try:
@@ -255,69 +566,471 @@ class DatabaseManager:
             ''', (client_id,))
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_client_consumption_page(self, client_id: int, after: Optional[PageToken] = None,
+                                    page_size: int = PAGE_SIZE) -> Tuple[List[Dict], Optional[PageToken]]:
+        """Obtiene una página del historial de consumo de un cliente (ver get_client_payments_page)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if after is None:
+                cursor.execute('''
+                    SELECT * FROM water_consumption WHERE client_id = ?
+                    ORDER BY consumption_date DESC, id LIMIT ?
+                ''', (client_id, page_size + 1))
+            else:
+                cursor.execute('''
+                    SELECT * FROM water_consumption
+                    WHERE client_id = ? AND consumption_date <= ?
+                    AND (consumption_date < ? OR id > ?)
+                    ORDER BY consumption_date DESC, id LIMIT ?
+                ''', (client_id, after[0], after[0], after[1], page_size + 1))
+            return self._fetch_page(cursor, page_size, 'consumption_date')
+    
+    # Inserciones masivas
+    def _insert_bulk(self, sql: str, rows: Iterable[tuple], chunk_size: int) -> List[int]:
+        """Inserta filas por bloques con executemany y retorna los IDs asignados"""
+        ids = []
+        iterator = iter(rows)
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                cursor.executemany(sql, chunk)
+                # Con AUTOINCREMENT y la transacción de escritura abierta los IDs
+                # del bloque son consecutivos y terminan en last_insert_rowid()
+                last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+                ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+        return ids
+    
+    def add_clients_bulk(self, clients: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """Agrega clientes en una sola transacción y retorna sus IDs
+        
+        Cada elemento es un diccionario (name, address, status) o una tupla
+        (name, address[, status]). Si alguna fila falla se revierte todo el lote.
+        """
+        def rows():
+            for client in clients:
+                if isinstance(client, dict):
+                    yield client['name'], client['address'], client.get('status', 'activo')
+                else:
+                    name, address, *rest = client
+                    yield name, address, rest[0] if rest else 'activo'
+        
+        return self._insert_bulk(
+            'INSERT INTO clients (name, address, status) VALUES (?, ?, ?)',
+            rows(), chunk_size
+        )
+    
+    def add_payments_bulk(self, payments: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """Agrega pagos en una sola transacción y retorna sus IDs
+        
+        Cada elemento es un diccionario (client_id, amount, status, notes,
+        payment_date) o una tupla en ese orden; status, notes y payment_date
+        son opcionales. amount es un Money o un monto en pesos. Si alguna fila
+        falla se revierte todo el lote.
+        """
+        def rows():
+            for payment in payments:
+                if isinstance(payment, dict):
+                    yield (payment['client_id'], Money.from_value(payment['amount']).cents,
+                           payment.get('status', 'pagado'), payment.get('notes', ''),
+                           payment.get('payment_date'))
+                else:
+                    client_id, amount, *rest = payment
+                    rest += [None] * (3 - len(rest))
+                    yield (client_id, Money.from_value(amount).cents,
+                           rest[0] or 'pagado', rest[1] or '', rest[2])
+        
+        return self._insert_bulk('''
+            INSERT INTO payments (client_id, amount_cents, status, notes, payment_date)
+            VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ''', rows(), chunk_size)
+    
+    def add_consumption_bulk(self, records: Iterable, chunk_size: int = BULK_CHUNK_SIZE) -> List[int]:
+        """Registra consumos en una sola transacción y retorna sus IDs
+        
+        Cada elemento es un diccionario (client_id, consumption_type, notes,
+        consumption_date) o una tupla en ese orden; los campos después de
+        client_id son opcionales. Si alguna fila falla se revierte todo el lote.
+        """
+        def rows():
+            for record in records:
+                if isinstance(record, dict):
+                    yield (record['client_id'], record.get('consumption_type', 'normal'),
+                           record.get('notes', ''), record.get('consumption_date'))
+                else:
+                    client_id, *rest = record
+                    rest += [None] * (3 - len(rest))
+                    yield client_id, rest[0] or 'normal', rest[1] or '', rest[2]
+        
+        return self._insert_bulk('''
+            INSERT INTO water_consumption (client_id, consumption_type, notes, consumption_date)
+            VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ''', rows(), chunk_size)
+    
+    def get_existing_client_ids(self, client_ids: Iterable[int]) -> set:
+        """Retorna cuáles de los IDs indicados corresponden a clientes existentes"""
+        ids = list(set(client_ids))
+        found = set()
+        with self.get_connection() as conn:
+            # SQLite limita la cantidad de parámetros por consulta
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ', '.join('?' * len(chunk))
+                cursor = conn.execute(f'SELECT id FROM clients WHERE id IN ({placeholders})', chunk)
+                found.update(row[0] for row in cursor)
+        return found
+    
+    # Recorridos en streaming
+    def _iter_rows(self, sql: str, params: tuple, model: type, row_format: str,
+                   batch_size: int) -> Iterator:
+        """Ejecuta una consulta sobre las columnas del modelo y genera sus filas por bloques
+        
+        sql recibe la lista de columnas en {columns}, en el orden de los campos
+        del modelo. Las filas se arman directamente en el formato pedido, sin
+        pasar por sqlite3.Row.
+        """
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"Formato de fila desconocido: {row_format}")
+        columns = tuple(field.name for field in fields(model))
+        
+        cursor = self.get_connection().cursor()
+        if row_format == 'dict':
+            cursor.row_factory = lambda _cursor, row: dict(zip(columns, row))
+        elif row_format == 'model':
+            cursor.row_factory = lambda _cursor, row: model(*row)
+        else:
+            cursor.row_factory = None
+        
+        cursor.execute(sql.format(columns=', '.join(columns)), params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    
+    def iter_clients(self, row_format: str = 'dict',
+                     batch_size: int = ITER_BATCH_SIZE) -> Iterator:
+        """Recorre todos los clientes en orden de ID sin cargarlos en memoria
+        
+        row_format: 'dict', 'tuple' (en el orden de los campos de Client) o
+        'model' (objetos Client). Se debe consumir en el hilo que lo creó.
+        """
+        return self._iter_rows('SELECT {columns} FROM clients ORDER BY id', (),
+                               Client, row_format, batch_size)
+    
+    def iter_payments(self, client_id: Optional[int] = None,
+                      start: Union[datetime, str, None] = None,
+                      end: Union[datetime, str, None] = None,
+                      row_format: str = 'dict', batch_size: int = ITER_BATCH_SIZE) -> Iterator:
+        """Recorre pagos en orden cronológico sin cargarlos en memoria
+        
+        Filtros opcionales: cliente y rango semiabierto [start, end). Los
+        formatos de fila son los de iter_clients (con objetos Payment).
+        """
+        conditions, params = [], []
+        if client_id is not None:
+            conditions.append('client_id = ?')
+            params.append(client_id)
+        if start is not None:
+            conditions.append('payment_date >= ?')
+            params.append(DateUtils.to_db_timestamp(start))
+        if end is not None:
+            conditions.append('payment_date < ?')
+            params.append(DateUtils.to_db_timestamp(end))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        return self._iter_rows(f'SELECT {{columns}} FROM payments {where} ORDER BY payment_date',
+                               tuple(params), Payment, row_format, batch_size)
+    
+    # Exportación
+    def get_export_columns(self, table: str) -> Dict[str, str]:
+        """Obtiene las columnas de una tabla exportable con su tipo declarado
+        
+        Incluye las columnas generadas (como payments.amount), que
+        table_info omite; hidden 2 y 3 son generadas virtuales y guardadas.
+        """
+        if table not in EXPORTABLE_TABLES:
+            raise ValueError(f"Tabla no exportable: {table}")
+        
+        conn = self.get_connection()
+        return {row[1]: row[2].upper() for row in conn.execute(f'PRAGMA table_xinfo({table})')
+                if row[6] in (0, 2, 3)}
+    
+    def get_export_cursor(self, table: str, columns: Optional[List[str]] = None,
+                          order_by_date: bool = False) -> sqlite3.Cursor:
+        """Abre un cursor sobre una tabla completa ordenada por ID, para leer en streaming
+        
+        El cursor no carga las filas en memoria; quien lo recibe debe leerlo
+        con fetchmany (por ejemplo DataExporter.export_cursor_to_csv).
+        order_by_date ordena por la columna de fecha de la tabla (usando su
+        índice), para que cada mes llegue en un bloque contiguo.
+        """
+        valid_columns = self.get_export_columns(table)
+        if columns:
+            invalid = [column for column in columns if column not in valid_columns]
+            if invalid:
+                raise ValueError(f"Columnas inexistentes: {', '.join(invalid)}")
+            column_list = ', '.join(columns)
+        else:
+            column_list = '*'
+        
+        order = 'id'
+        if order_by_date:
+            if table not in EXPORT_DATE_COLUMNS:
+                raise ValueError(f"La tabla {table} no tiene columna de fecha para ordenar")
+            order = f'{EXPORT_DATE_COLUMNS[table]}, id'
+        
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = None  # Tuplas simples: menos memoria que sqlite3.Row
+        cursor.execute(f'SELECT {column_list} FROM {table} ORDER BY {order}')
+        return cursor
+    
+    def iter_client_report_data(self) -> Iterator[Tuple[Dict, List[Dict], List[Dict]]]:
+        """Recorre todos los clientes con sus pagos y consumos para reportes masivos
+        
+        Usa tres consultas ordenadas por cliente (una por tabla, apoyadas en los
+        índices por cliente y fecha) y las combina en un solo recorrido, en
+        lugar de tres consultas por cliente. Genera (cliente, pagos, consumos)
+        en orden de ID con el mismo orden de historial que get_client_payments.
+        """
+        conn = self.get_connection()
+        clients = conn.execute('SELECT * FROM clients ORDER BY id')
+        payments = groupby(conn.execute(
+            'SELECT * FROM payments ORDER BY client_id, payment_date DESC'
+        ), key=lambda row: row['client_id'])
+        consumption = groupby(conn.execute(
+            'SELECT * FROM water_consumption ORDER BY client_id, consumption_date DESC'
+        ), key=lambda row: row['client_id'])
+        
+        next_payments = next(payments, None)
+        next_consumption = next(consumption, None)
+        for client in clients:
+            client_id = client['id']
+            client_payments, client_consumption = [], []
+            
+            # Avanzar cada historial hasta el cliente actual (saltando huérfanos)
+            while next_payments is not None and next_payments[0] <= client_id:
+                if next_payments[0] == client_id:
+                    client_payments = [dict(row) for row in next_payments[1]]
+                next_payments = next(payments, None)
+            while next_consumption is not None and next_consumption[0] <= client_id:
+                if next_consumption[0] == client_id:
+                    client_consumption = [dict(row) for row in next_consumption[1]]
+                next_consumption = next(consumption, None)
+            
+            yield dict(client), client_payments, client_consumption
+    
+    # Puntos de control de importación
+    def get_import_checkpoint(self, source: str) -> Optional[Dict]:
+        """Obtiene el avance guardado de una importación"""
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT * FROM import_checkpoints WHERE source = ?', (source,)).fetchone()
+            return dict(row) if row else None
+    
+    def save_import_checkpoint(self, source: str, kind: str, rows_done: int, completed: bool = False):
+        """Guarda el avance de una importación (usar dentro de la transacción del lote)"""
+        with self.transaction() as conn:
+            conn.execute('''
+                INSERT INTO import_checkpoints (source, kind, rows_done, completed, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(source) DO UPDATE SET
+                    kind = excluded.kind, rows_done = excluded.rows_done,
+                    completed = excluded.completed, updated_at = excluded.updated_at
+            ''', (source, kind, rows_done, int(completed)))
+    
+    def clear_import_checkpoint(self, source: str):
+        """Elimina el avance guardado de una importación"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM import_checkpoints WHERE source = ?', (source,))
+    
     # Métodos para Dashboard y Reportes
     def get_clients_with_payment_status(self) -> List[Dict]:
         """Obtiene clientes con su estado de pago más reciente"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # last_payment_status y last_consumption_type se mantienen por triggers
             cursor.execute('''
                 SELECT 
-                    c.id,
-                    c.name,
-                    c.address,
-                    c.status,
-                    COALESCE(p.status, 'sin_pagos') as payment_status,
-                    COALESCE(wc.consumption_type, 'normal') as consumption_status
-                FROM clients c
-                LEFT JOIN (
-                    SELECT client_id, status,
-                           ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY payment_date DESC) as rn
-                    FROM payments
-                ) p ON c.id = p.client_id AND p.rn = 1
-                LEFT JOIN (
-                    SELECT client_id, consumption_type,
-                           ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY consumption_date DESC) as rn
-                    FROM water_consumption
-                ) wc ON c.id = wc.client_id AND wc.rn = 1
-                ORDER BY c.name
+                    id,
+                    name,
+                    address,
+                    status,
+                    COALESCE(last_payment_status, 'sin_pagos') as payment_status,
+                    COALESCE(last_consumption_type, 'normal') as consumption_status
+                FROM clients
+                ORDER BY name
             ''')
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_client_with_payment_status(self, client_id: int) -> Optional[Dict]:
+        """Obtiene un cliente con su estado de pago más reciente (misma fila que la tabla completa)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT 
+                    id,
+                    name,
+                    address,
+                    status,
+                    COALESCE(last_payment_status, 'sin_pagos') as payment_status,
+                    COALESCE(last_consumption_type, 'normal') as consumption_status
+                FROM clients
+                WHERE id = ?
+            ''', (client_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def get_client_payment_status_counts(self, client_status: Optional[str] = 'activo') -> Dict[str, int]:
+        """Cuenta los clientes según el estado de su pago más reciente
+        
+        Retorna {'pagado', 'pendiente', 'sin_pagos'}. Por defecto solo cuenta
+        clientes activos (None cuenta todos). Lee last_payment_status, que
+        mantienen los triggers, con el índice (status, last_payment_status):
+        no toca la tabla de pagos.
+        """
+        where = 'WHERE status = ?' if client_status is not None else ''
+        params = (client_status,) if client_status is not None else ()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT COALESCE(last_payment_status, 'sin_pagos'), COUNT(*)
+                FROM clients {where}
+                GROUP BY last_payment_status
+            ''', params)
+            counts = {'pagado': 0, 'pendiente': 0, 'sin_pagos': 0}
+            counts.update(cursor.fetchall())
+            return counts
+    
+    def rebuild_client_status(self):
+        """Recalcula el último estado de pago y consumo de todos los clientes"""
+        with self.transaction() as conn:
+            conn.execute(CLIENT_LAST_PAYMENT_REFRESH)
+            conn.execute(CLIENT_LAST_CONSUMPTION_REFRESH)
+    
+    def rebuild_client_search(self) -> bool:
+        """Reconstruye el índice de texto completo de clientes"""
+        if not self.has_client_search_index():
+            return False
+        with self.transaction() as conn:
+            conn.execute("INSERT INTO clients_fts (clients_fts) VALUES ('delete-all')")
+            conn.execute(CLIENT_SEARCH_POPULATE)
+        return True
+    
     def get_statistics(self) -> Dict:
-        """Obtiene estadísticas generales del sistema"""
+        """Obtiene estadísticas generales del sistema desde el resumen materializado"""
+        # CURRENT_TIMESTAMP se guarda en UTC
+        current_month = datetime.utcnow().strftime('%Y-%m')
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Total de clientes
-            cursor.execute('SELECT COUNT(*) FROM clients WHERE status = "activo"')
-            total_clients = cursor.fetchone()[0]
-            
-            # Clientes con deuda
             cursor.execute('''
-                SELECT COUNT(DISTINCT client_id) FROM payments 
-                WHERE status = "pendiente"
-            ''')
-            clients_with_debt = cursor.fetchone()[0]
+                SELECT t.active_clients, t.clients_with_debt,
+                       COALESCE(m.payments_paid, 0), COALESCE(m.clients_with_excess, 0)
+                FROM dashboard_summary t
+                LEFT JOIN dashboard_summary m ON m.period = ?
+                WHERE t.period = 'total'
+            ''', (current_month,))
+            row = cursor.fetchone() or (0, 0, 0, 0)
             
-            # Pagos del mes actual
+            return {
+                'total_clients': row[0],
+                'clients_with_debt': row[1],
+                'payments_this_month': row[2],
+                'excess_consumption': row[3]
+            }
+    
+    def rebuild_dashboard_summary(self):
+        """Recalcula el resumen del dashboard desde las tablas base"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM dashboard_summary')
+            conn.execute('INSERT INTO dashboard_summary ' + DASHBOARD_SUMMARY_SOURCE)
+    
+    def get_monthly_payment_totals(self, first_month: str, last_month: str) -> List[Dict]:
+        """Totales de pagos por mes entre dos meses 'YYYY-MM' (inclusive)
+        
+        Lee el resumen mensual payments_monthly_rollup, así que su costo
+        depende del número de meses y no del de pagos. Retorna solo los meses
+        con pagos, en orden, con cantidad y monto (Money) pagado y pendiente.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute('''
-                SELECT COUNT(*) FROM payments 
-                WHERE strftime('%Y-%m', payment_date) = strftime('%Y-%m', 'now')
-                AND status = "pagado"
-            ''')
-            payments_this_month = cursor.fetchone()[0]
-            
-            # Clientes con exceso de consumo
+                SELECT month,
+                       SUM(CASE WHEN status = 'pagado' THEN payment_count ELSE 0 END),
+                       SUM(CASE WHEN status = 'pagado' THEN amount_cents ELSE 0 END),
+                       SUM(CASE WHEN status = 'pendiente' THEN payment_count ELSE 0 END),
+                       SUM(CASE WHEN status = 'pendiente' THEN amount_cents ELSE 0 END)
+                FROM payments_monthly_rollup
+                WHERE month BETWEEN ? AND ?
+                GROUP BY month
+                HAVING SUM(payment_count) > 0
+                ORDER BY month
+            ''', (DateUtils.parse_month_key(first_month), DateUtils.parse_month_key(last_month)))
+            return [{
+                'month': DateUtils.format_month_key(row[0]),
+                'payment_count': row[1],
+                'total_amount': Money(row[2]),
+                'pending_count': row[3],
+                'pending_amount': Money(row[4]),
+            } for row in cursor.fetchall()]
+    
+    def rebuild_payments_rollup(self):
+        """Recalcula los totales mensuales de pagos desde la tabla de pagos"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM payments_monthly_rollup')
+            conn.execute('INSERT INTO payments_monthly_rollup ' + PAYMENTS_MONTHLY_ROLLUP_SOURCE)
+    
+    def check_payments_rollup(self) -> List[Dict]:
+        """Compara los totales mensuales guardados con la tabla de pagos y retorna las diferencias"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute('''
-                SELECT COUNT(DISTINCT client_id) FROM water_consumption 
-                WHERE consumption_type = "exceso"
-                AND strftime('%Y-%m', consumption_date) = strftime('%Y-%m', 'now')
+                SELECT month, status, payment_count, amount_cents FROM payments_monthly_rollup
+                WHERE payment_count != 0 OR amount_cents != 0
             ''')
-            excess_consumption = cursor.fetchone()[0]
-            
-            return {
-                'total_clients': total_clients,
-                'clients_with_debt': clients_with_debt,
-                'payments_this_month': payments_this_month,
-                'excess_consumption': excess_consumption
-            }
+            stored = {(row[0], row[1]): tuple(row[2:]) for row in cursor.fetchall()}
+            cursor.execute(PAYMENTS_MONTHLY_ROLLUP_SOURCE)
+            expected = {(row[0], row[1]): tuple(row[2:]) for row in cursor.fetchall()}
+        
+        zeros = (0, 0)
+        drift = []
+        for month, status in sorted(set(stored) | set(expected)):
+            stored_values = stored.get((month, status), zeros)
+            expected_values = expected.get((month, status), zeros)
+            for field, stored_value, expected_value in zip(('payment_count', 'amount_cents'),
+                                                           stored_values, expected_values):
+                if stored_value != expected_value:
+                    drift.append({
+                        'period': f"{DateUtils.format_month_key(month)} {status}",
+                        'field': field,
+                        'stored': stored_value,
+                        'expected': expected_value
+                    })
+        return drift
+    
+    def check_dashboard_summary(self) -> List[Dict]:
+        """Compara el resumen materializado con las tablas base y retorna las diferencias"""
+        fields = ('active_clients', 'clients_with_debt', 'payments_paid', 'clients_with_excess')
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT period, ' + ', '.join(fields) + ' FROM dashboard_summary')
+            stored = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+            cursor.execute(DASHBOARD_SUMMARY_SOURCE)
+            expected = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+        
+        # Un periodo ausente equivale a contadores en cero
+        zeros = (0,) * len(fields)
+        drift = []
+        for period in sorted(set(stored) | set(expected)):
+            stored_values = stored.get(period, zeros)
+            expected_values = expected.get(period, zeros)
+            for field, stored_value, expected_value in zip(fields, stored_values, expected_values):
+                if stored_value != expected_value:
+                    drift.append({
+                        'period': period,
+                        'field': field,
+                        'stored': stored_value,
+                        'expected': expected_value
+                    })
+        return drift
@@ -0,0 +1,99 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Tareas de Mantenimiento de la Base de Datos
+
+Uso:
+    python -m database.maintenance rebuild-summary [--db RUTA]
+    python -m database.maintenance check-summary [--db RUTA]
+    python -m database.maintenance rebuild-client-status [--db RUTA]
+    python -m database.maintenance rebuild-search [--db RUTA]
+    python -m database.maintenance rebuild-rollup [--db RUTA]
+    python -m database.maintenance check-rollup [--db RUTA]
+"""
+
+import argparse
+import sys
+import os
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database_manager import DatabaseManager
+
+def rebuild_summary(db_manager: DatabaseManager) -> int:
+    """Recalcula el resumen materializado del dashboard"""
+    db_manager.rebuild_dashboard_summary()
+    print("✅ Resumen del dashboard reconstruido")
+    return 0
+
+def check_summary(db_manager: DatabaseManager) -> int:
+    """Verifica que el resumen materializado coincida con las tablas base"""
+    drift = db_manager.check_dashboard_summary()
+    if not drift:
+        print("✅ El resumen del dashboard es consistente")
+        return 0
+
+    print(f"❌ Se encontraron {len(drift)} diferencias:")
+    for item in drift:
+        print(f"   {item['period']} {item['field']}: "
+              f"guardado={item['stored']} esperado={item['expected']}")
+    print("   Ejecute 'rebuild-summary' para corregirlas")
+    return 1
+
+def rebuild_client_status(db_manager: DatabaseManager) -> int:
+    """Recalcula el último estado de pago y consumo de cada cliente"""
+    db_manager.rebuild_client_status()
+    print("✅ Estado de clientes reconstruido")
+    return 0
+
+def rebuild_search(db_manager: DatabaseManager) -> int:
+    """Reconstruye el índice de búsqueda de texto completo de clientes"""
+    if not db_manager.rebuild_client_search():
+        print("❌ Esta instalación de SQLite no incluye FTS5; la búsqueda usa LIKE")
+        return 1
+    print("✅ Índice de búsqueda de clientes reconstruido")
+    return 0
+
+def rebuild_rollup(db_manager: DatabaseManager) -> int:
+    """Recalcula los totales mensuales de pagos"""
+    db_manager.rebuild_payments_rollup()
+    print("✅ Totales mensuales de pagos reconstruidos")
+    return 0
+
+def check_rollup(db_manager: DatabaseManager) -> int:
+    """Verifica que los totales mensuales coincidan con la tabla de pagos"""
+    drift = db_manager.check_payments_rollup()
+    if not drift:
+        print("✅ Los totales mensuales de pagos son consistentes")
+        return 0
+
+    print(f"❌ Se encontraron {len(drift)} diferencias:")
+    for item in drift:
+        print(f"   {item['period']} {item['field']}: "
+              f"guardado={item['stored']} esperado={item['expected']}")
+    print("   Ejecute 'rebuild-rollup' para corregirlas")
+    return 1
+
+COMMANDS = {
+    'rebuild-summary': rebuild_summary,
+    'check-summary': check_summary,
+    'rebuild-client-status': rebuild_client_status,
+    'rebuild-search': rebuild_search,
+    'rebuild-rollup': rebuild_rollup,
+    'check-rollup': check_rollup,
+}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mantenimiento de la base de datos")
+    parser.add_argument('command', choices=sorted(COMMANDS))
+    parser.add_argument('--db', default="database/agua_system.db", help="Ruta de la base de datos")
+    args = parser.parse_args(argv)
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        return COMMANDS[args.command](db_manager)
+    finally:
+        db_manager.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,545 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Esquema y Migraciones de la Base de Datos
+"""
+
+import sqlite3
+
+# Consulta que calcula el resumen del dashboard desde las tablas base.
+# Fila 'total': contadores globales; filas 'YYYY-MM': contadores mensuales.
+DASHBOARD_SUMMARY_SOURCE = '''
+    SELECT 'total' AS period,
+           (SELECT COUNT(*) FROM clients WHERE status = 'activo') AS active_clients,
+           (SELECT COUNT(DISTINCT client_id) FROM payments
+            WHERE status = 'pendiente') AS clients_with_debt,
+           0 AS payments_paid,
+           0 AS clients_with_excess
+    UNION ALL
+    SELECT month, 0, 0, SUM(paid), SUM(excess) FROM (
+        SELECT substr(payment_date, 1, 7) AS month, COUNT(*) AS paid, 0 AS excess
+        FROM payments
+        WHERE status = 'pagado' AND payment_date IS NOT NULL
+        GROUP BY month
+        UNION ALL
+        SELECT substr(consumption_date, 1, 7), 0, COUNT(DISTINCT client_id)
+        FROM water_consumption
+        WHERE consumption_type = 'exceso' AND consumption_date IS NOT NULL
+        GROUP BY 1
+    )
+    GROUP BY month
+'''
+
+# Triggers que mantienen dashboard_summary al día con cada escritura
+DASHBOARD_SUMMARY_TRIGGERS = [
+    # Clientes activos
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_clients_insert
+       AFTER INSERT ON clients WHEN NEW.status = 'activo'
+       BEGIN
+           UPDATE dashboard_summary SET active_clients = active_clients + 1
+           WHERE period = 'total';
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_clients_update
+       AFTER UPDATE OF status ON clients WHEN OLD.status IS NOT NEW.status
+       BEGIN
+           UPDATE dashboard_summary
+           SET active_clients = active_clients + (NEW.status = 'activo') - (OLD.status = 'activo')
+           WHERE period = 'total';
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_clients_delete
+       AFTER DELETE ON clients WHEN OLD.status = 'activo'
+       BEGIN
+           UPDATE dashboard_summary SET active_clients = active_clients - 1
+           WHERE period = 'total';
+       END''',
+
+    # Clientes con deuda y pagos del mes
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_payments_insert
+       AFTER INSERT ON payments
+       BEGIN
+           UPDATE dashboard_summary SET clients_with_debt = clients_with_debt + 1
+           WHERE period = 'total' AND NEW.status = 'pendiente'
+           AND NOT EXISTS (SELECT 1 FROM payments WHERE client_id = NEW.client_id
+                           AND status = 'pendiente' AND id != NEW.id);
+
+           INSERT OR IGNORE INTO dashboard_summary (period)
+           SELECT substr(NEW.payment_date, 1, 7)
+           WHERE NEW.status = 'pagado' AND NEW.payment_date IS NOT NULL;
+           UPDATE dashboard_summary SET payments_paid = payments_paid + 1
+           WHERE period = substr(NEW.payment_date, 1, 7) AND NEW.status = 'pagado';
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_payments_update
+       AFTER UPDATE OF status, client_id, payment_date ON payments
+       WHEN OLD.status IS NOT NEW.status OR OLD.client_id IS NOT NEW.client_id
+            OR OLD.payment_date IS NOT NEW.payment_date
+       BEGIN
+           UPDATE dashboard_summary SET clients_with_debt = clients_with_debt - 1
+           WHERE period = 'total' AND OLD.status = 'pendiente'
+           AND (OLD.client_id IS NOT NEW.client_id OR NEW.status IS NOT 'pendiente')
+           AND NOT EXISTS (SELECT 1 FROM payments WHERE client_id = OLD.client_id
+                           AND status = 'pendiente');
+           UPDATE dashboard_summary SET clients_with_debt = clients_with_debt + 1
+           WHERE period = 'total' AND NEW.status = 'pendiente'
+           AND (OLD.client_id IS NOT NEW.client_id OR OLD.status IS NOT 'pendiente')
+           AND NOT EXISTS (SELECT 1 FROM payments WHERE client_id = NEW.client_id
+                           AND status = 'pendiente' AND id != NEW.id);
+
+           UPDATE dashboard_summary SET payments_paid = payments_paid - 1
+           WHERE period = substr(OLD.payment_date, 1, 7) AND OLD.status = 'pagado';
+           INSERT OR IGNORE INTO dashboard_summary (period)
+           SELECT substr(NEW.payment_date, 1, 7)
+           WHERE NEW.status = 'pagado' AND NEW.payment_date IS NOT NULL;
+           UPDATE dashboard_summary SET payments_paid = payments_paid + 1
+           WHERE period = substr(NEW.payment_date, 1, 7) AND NEW.status = 'pagado';
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_payments_delete
+       AFTER DELETE ON payments
+       BEGIN
+           UPDATE dashboard_summary SET clients_with_debt = clients_with_debt - 1
+           WHERE period = 'total' AND OLD.status = 'pendiente'
+           AND NOT EXISTS (SELECT 1 FROM payments WHERE client_id = OLD.client_id
+                           AND status = 'pendiente');
+
+           UPDATE dashboard_summary SET payments_paid = payments_paid - 1
+           WHERE period = substr(OLD.payment_date, 1, 7) AND OLD.status = 'pagado';
+       END''',
+
+    # Clientes con exceso de consumo en el mes. El "+" en +consumption_type
+    # obliga a buscar por el índice (client_id, consumption_date) en lugar de
+    # recorrer todos los excesos del mes con idx_consumption_type_date.
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_consumption_insert
+       AFTER INSERT ON water_consumption
+       WHEN NEW.consumption_type = 'exceso' AND NEW.consumption_date IS NOT NULL
+       BEGIN
+           INSERT OR IGNORE INTO dashboard_summary (period)
+           VALUES (substr(NEW.consumption_date, 1, 7));
+           UPDATE dashboard_summary SET clients_with_excess = clients_with_excess + 1
+           WHERE period = substr(NEW.consumption_date, 1, 7)
+           AND NOT EXISTS (
+               SELECT 1 FROM water_consumption
+               WHERE client_id = NEW.client_id AND +consumption_type = 'exceso' AND id != NEW.id
+               AND consumption_date >= substr(NEW.consumption_date, 1, 7) || '-01'
+               AND consumption_date < date(substr(NEW.consumption_date, 1, 7) || '-01', '+1 month')
+           );
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_consumption_update
+       AFTER UPDATE OF consumption_type, client_id, consumption_date ON water_consumption
+       WHEN OLD.consumption_type IS NOT NEW.consumption_type
+            OR OLD.client_id IS NOT NEW.client_id
+            OR substr(OLD.consumption_date, 1, 7) IS NOT substr(NEW.consumption_date, 1, 7)
+       BEGIN
+           UPDATE dashboard_summary SET clients_with_excess = clients_with_excess - 1
+           WHERE period = substr(OLD.consumption_date, 1, 7) AND OLD.consumption_type = 'exceso'
+           AND NOT EXISTS (
+               SELECT 1 FROM water_consumption
+               WHERE client_id = OLD.client_id AND +consumption_type = 'exceso'
+               AND consumption_date >= substr(OLD.consumption_date, 1, 7) || '-01'
+               AND consumption_date < date(substr(OLD.consumption_date, 1, 7) || '-01', '+1 month')
+           );
+           INSERT OR IGNORE INTO dashboard_summary (period)
+           SELECT substr(NEW.consumption_date, 1, 7)
+           WHERE NEW.consumption_type = 'exceso' AND NEW.consumption_date IS NOT NULL;
+           UPDATE dashboard_summary SET clients_with_excess = clients_with_excess + 1
+           WHERE period = substr(NEW.consumption_date, 1, 7) AND NEW.consumption_type = 'exceso'
+           AND NOT EXISTS (
+               SELECT 1 FROM water_consumption
+               WHERE client_id = NEW.client_id AND +consumption_type = 'exceso' AND id != NEW.id
+               AND consumption_date >= substr(NEW.consumption_date, 1, 7) || '-01'
+               AND consumption_date < date(substr(NEW.consumption_date, 1, 7) || '-01', '+1 month')
+           );
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_summary_consumption_delete
+       AFTER DELETE ON water_consumption WHEN OLD.consumption_type = 'exceso'
+       BEGIN
+           UPDATE dashboard_summary SET clients_with_excess = clients_with_excess - 1
+           WHERE period = substr(OLD.consumption_date, 1, 7)
+           AND NOT EXISTS (
+               SELECT 1 FROM water_consumption
+               WHERE client_id = OLD.client_id AND +consumption_type = 'exceso'
+               AND consumption_date >= substr(OLD.consumption_date, 1, 7) || '-01'
+               AND consumption_date < date(substr(OLD.consumption_date, 1, 7) || '-01', '+1 month')
+           );
+       END''',
+]
+
+# Recalcula el último estado de pago y consumo de los clientes indicados
+# (la condición WHERE se agrega al usarla)
+CLIENT_LAST_PAYMENT_REFRESH = '''
+    UPDATE clients SET (last_payment_status, last_payment_date) = (
+        SELECT status, payment_date FROM payments
+        WHERE client_id = clients.id
+        ORDER BY payment_date DESC, id DESC LIMIT 1
+    )
+'''
+
+CLIENT_LAST_CONSUMPTION_REFRESH = '''
+    UPDATE clients SET (last_consumption_type, last_consumption_date) = (
+        SELECT consumption_type, consumption_date FROM water_consumption
+        WHERE client_id = clients.id
+        ORDER BY consumption_date DESC, id DESC LIMIT 1
+    )
+'''
+
+# Triggers que mantienen las columnas last_* de clients
+CLIENT_STATUS_TRIGGERS = [
+    # Un pago nuevo solo reemplaza al último si no es anterior a él
+    '''CREATE TRIGGER IF NOT EXISTS trg_client_status_payments_insert
+       AFTER INSERT ON payments
+       BEGIN
+           UPDATE clients
+           SET last_payment_status = NEW.status, last_payment_date = NEW.payment_date
+           WHERE id = NEW.client_id
+           AND (last_payment_date IS NULL OR NEW.payment_date >= last_payment_date);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_client_status_payments_update
+       AFTER UPDATE OF status, payment_date, client_id ON payments
+       BEGIN
+           ''' + CLIENT_LAST_PAYMENT_REFRESH + '''
+           WHERE id IN (OLD.client_id, NEW.client_id);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_client_status_payments_delete
+       AFTER DELETE ON payments
+       BEGIN
+           ''' + CLIENT_LAST_PAYMENT_REFRESH + '''
+           WHERE id = OLD.client_id;
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_client_status_consumption_insert
+       AFTER INSERT ON water_consumption
+       BEGIN
+           UPDATE clients
+           SET last_consumption_type = NEW.consumption_type,
+               last_consumption_date = NEW.consumption_date
+           WHERE id = NEW.client_id
+           AND (last_consumption_date IS NULL OR NEW.consumption_date >= last_consumption_date);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_client_status_consumption_update
+       AFTER UPDATE OF consumption_type, consumption_date, client_id ON water_consumption
+       BEGIN
+           ''' + CLIENT_LAST_CONSUMPTION_REFRESH + '''
+           WHERE id IN (OLD.client_id, NEW.client_id);
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_client_status_consumption_delete
+       AFTER DELETE ON water_consumption
+       BEGIN
+           ''' + CLIENT_LAST_CONSUMPTION_REFRESH + '''
+           WHERE id = OLD.client_id;
+       END''',
+]
+
+# Normalización del texto indexado: minúsculas y sin acentos en SQL puro,
+# para que cualquier conexión (otra estación, un cliente sqlite3 sin
+# funciones registradas) pueda escribir en clients. lower() de SQLite solo
+# cubre ASCII, así que las letras acentuadas del español se reemplazan una
+# por una (el analizador de SQLite limita el anidamiento de replace()).
+SEARCH_ACCENTS = {'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u', 'ü': 'u', 'ñ': 'n',
+                  'Á': 'a', 'É': 'e', 'Í': 'i', 'Ó': 'o', 'Ú': 'u', 'Ü': 'u', 'Ñ': 'n'}
+
+SEARCH_FOLD_TABLE = {**{code: chr(code).lower() for code in range(ord('A'), ord('Z') + 1)},
+                     **str.maketrans(SEARCH_ACCENTS)}
+
+def fold_search_text(text: str) -> str:
+    """Equivalente en Python de la normalización SQL de clients_fts ("Peña" -> "pena")"""
+    return (text or '').translate(SEARCH_FOLD_TABLE)
+
+def _sql_fold(expression: str) -> str:
+    expression = f'lower({expression})'
+    for accented, plain in SEARCH_ACCENTS.items():
+        expression = f"replace({expression}, '{accented}', '{plain}')"
+    return expression
+
+# Índice de texto completo de clientes (FTS5 con tokenizador trigram, para
+# coincidencias por subcadena). El texto se guarda normalizado con _sql_fold
+# y el rowid es el ID del cliente.
+CLIENT_SEARCH_TABLE = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+        name, address, content='', tokenize='trigram'
+    )
+'''
+
+CLIENT_SEARCH_POPULATE = f'''
+    INSERT INTO clients_fts (rowid, name, address)
+    SELECT id, {_sql_fold('name')}, {_sql_fold('address')} FROM clients
+'''
+
+# Triggers que mantienen clients_fts al día (al ser una tabla sin contenido,
+# para borrar una fila se repiten los valores que se indexaron)
+CLIENT_SEARCH_TRIGGERS = [
+    f'''CREATE TRIGGER IF NOT EXISTS trg_clients_fts_insert
+       AFTER INSERT ON clients
+       BEGIN
+           INSERT INTO clients_fts (rowid, name, address)
+           VALUES (NEW.id, {_sql_fold('NEW.name')}, {_sql_fold('NEW.address')});
+       END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_clients_fts_update
+       AFTER UPDATE OF name, address ON clients
+       BEGIN
+           INSERT INTO clients_fts (clients_fts, rowid, name, address)
+           VALUES ('delete', OLD.id, {_sql_fold('OLD.name')}, {_sql_fold('OLD.address')});
+           INSERT INTO clients_fts (rowid, name, address)
+           VALUES (NEW.id, {_sql_fold('NEW.name')}, {_sql_fold('NEW.address')});
+       END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_clients_fts_delete
+       AFTER DELETE ON clients
+       BEGIN
+           INSERT INTO clients_fts (clients_fts, rowid, name, address)
+           VALUES ('delete', OLD.id, {_sql_fold('OLD.name')}, {_sql_fold('OLD.address')});
+       END''',
+]
+
+def create_client_search(cursor):
+    """Crea y llena clients_fts si SQLite incluye FTS5 (si no, la búsqueda usa LIKE)"""
+    try:
+        cursor.execute(CLIENT_SEARCH_TABLE)
+    except sqlite3.OperationalError as e:
+        print(f"Búsqueda de texto completo no disponible: {e}")
+        return
+    cursor.execute(CLIENT_SEARCH_POPULATE)
+    for trigger in CLIENT_SEARCH_TRIGGERS:
+        cursor.execute(trigger)
+
+def refold_client_search(cursor):
+    """Cambia los triggers de clients_fts que llamaban a la función fold_text por SQL puro"""
+    if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'clients_fts'").fetchone() is None:
+        return
+    for name in ('insert', 'update', 'delete'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS trg_clients_fts_{name}')
+    for trigger in CLIENT_SEARCH_TRIGGERS:
+        cursor.execute(trigger)
+    cursor.execute("INSERT INTO clients_fts (clients_fts) VALUES ('delete-all')")
+    cursor.execute(CLIENT_SEARCH_POPULATE)
+
+# Tabla de pagos con el monto en centavos enteros. amount queda como columna
+# generada (en pesos, REAL) para las lecturas y exportaciones existentes.
+PAYMENTS_CENTS_TABLE = '''
+    CREATE TABLE payments_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        client_id INTEGER NOT NULL,
+        amount_cents INTEGER NOT NULL,
+        amount REAL GENERATED ALWAYS AS (amount_cents / 100.0) VIRTUAL,
+        payment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        status TEXT DEFAULT 'pagado' CHECK(status IN ('pagado', 'pendiente')),
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (client_id) REFERENCES clients (id)
+    )
+'''
+
+PAYMENTS_INDEXES = [
+    '''CREATE INDEX IF NOT EXISTS idx_payments_client_date
+       ON payments (client_id, payment_date DESC)''',
+    '''CREATE INDEX IF NOT EXISTS idx_payments_status_date
+       ON payments (status, payment_date)''',
+    '''CREATE INDEX IF NOT EXISTS idx_payments_date
+       ON payments (payment_date)''',
+]
+
+def migrate_payments_to_cents(cursor):
+    """Reconstruye payments guardando el monto como centavos enteros
+
+    SQLite no permite cambiar el tipo de una columna: se copia a una tabla
+    nueva, conservando IDs y la secuencia de AUTOINCREMENT, y se vuelven a
+    crear sus índices y triggers.
+    """
+    columns = [row[1] for row in cursor.execute('PRAGMA table_xinfo(payments)')]
+    if 'amount_cents' in columns:
+        return
+    cursor.execute(PAYMENTS_CENTS_TABLE)
+    cursor.execute('''
+        INSERT INTO payments_new (id, client_id, amount_cents, payment_date, status, notes, created_at)
+        SELECT id, client_id, CAST(ROUND(amount * 100) AS INTEGER), payment_date, status, notes, created_at
+        FROM payments
+    ''')
+    # No reutilizar IDs de pagos borrados
+    cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'payments_new'")
+    cursor.execute('''
+        INSERT INTO sqlite_sequence (name, seq)
+        SELECT 'payments_new', MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'payments'), 0),
+                                   COALESCE((SELECT MAX(id) FROM payments_new), 0))
+    ''')
+    cursor.execute('DROP TABLE payments')
+    cursor.execute('ALTER TABLE payments_new RENAME TO payments')
+    for statement in PAYMENTS_INDEXES:
+        cursor.execute(statement)
+    for trigger in DASHBOARD_SUMMARY_TRIGGERS + CLIENT_STATUS_TRIGGERS:
+        if 'ON payments' in trigger:
+            cursor.execute(trigger)
+
+# Columnas generadas con la fecha como entero (year_month = AAAAMM y
+# day = AAAAMMDD), calculadas desde el texto de CURRENT_TIMESTAMP. Son
+# virtuales: no ocupan espacio en la tabla y SQLite las mantiene solas; sus
+# índices guardan el valor ya calculado para agrupar y filtrar sin leer texto.
+DATE_KEY_COLUMNS = {
+    'payments': 'payment_date',
+    'water_consumption': 'consumption_date',
+}
+
+DATE_KEY_EXPRESSIONS = {
+    'year_month': "CAST(substr({0}, 1, 4) || substr({0}, 6, 2) AS INTEGER)",
+    'day': "CAST(substr({0}, 1, 4) || substr({0}, 6, 2) || substr({0}, 9, 2) AS INTEGER)",
+}
+
+DATE_KEY_INDEXES = [
+    # (day, payment_date) entrega los pagos de un rango de días ya ordenados
+    '''CREATE INDEX IF NOT EXISTS idx_payments_day
+       ON payments (day, payment_date)''',
+    '''CREATE INDEX IF NOT EXISTS idx_payments_year_month
+       ON payments (year_month)''',
+    '''CREATE INDEX IF NOT EXISTS idx_consumption_day
+       ON water_consumption (day)''',
+]
+
+def add_date_key_columns(cursor):
+    """Agrega las columnas generadas year_month y day a pagos y consumos"""
+    for table, date_column in DATE_KEY_COLUMNS.items():
+        existing = {row[1] for row in cursor.execute(f'PRAGMA table_xinfo({table})')}
+        for column, expression in DATE_KEY_EXPRESSIONS.items():
+            if column not in existing:
+                cursor.execute(f'''
+                    ALTER TABLE {table} ADD COLUMN {column} INTEGER
+                    GENERATED ALWAYS AS ({expression.format(date_column)}) VIRTUAL
+                ''')
+    for statement in DATE_KEY_INDEXES:
+        cursor.execute(statement)
+
+# Totales mensuales de pagos por estado (month = year_month, AAAAMM), para
+# graficar cualquier rango de meses sin recorrer la tabla de pagos
+PAYMENTS_MONTHLY_ROLLUP_TABLE = '''
+    CREATE TABLE IF NOT EXISTS payments_monthly_rollup (
+        month INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        payment_count INTEGER NOT NULL DEFAULT 0,
+        amount_cents INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (month, status)
+    ) WITHOUT ROWID
+'''
+
+PAYMENTS_MONTHLY_ROLLUP_SOURCE = '''
+    SELECT year_month, status, COUNT(*), SUM(amount_cents)
+    FROM payments
+    WHERE year_month IS NOT NULL
+    GROUP BY year_month, status
+'''
+
+# Suma una fila de pago (NEW) a su mes y estado
+_ROLLUP_ADD_NEW = '''
+           INSERT INTO payments_monthly_rollup (month, status, payment_count, amount_cents)
+           SELECT NEW.year_month, NEW.status, 1, NEW.amount_cents
+           WHERE NEW.year_month IS NOT NULL
+           ON CONFLICT (month, status) DO UPDATE
+           SET payment_count = payment_count + 1,
+               amount_cents = amount_cents + excluded.amount_cents;
+'''
+
+# Resta una fila de pago (OLD) de su mes y estado
+_ROLLUP_SUBTRACT_OLD = '''
+           UPDATE payments_monthly_rollup
+           SET payment_count = payment_count - 1, amount_cents = amount_cents - OLD.amount_cents
+           WHERE month = OLD.year_month AND status = OLD.status;
+'''
+
+# Triggers que mantienen payments_monthly_rollup al día con cada escritura
+PAYMENTS_MONTHLY_ROLLUP_TRIGGERS = [
+    '''CREATE TRIGGER IF NOT EXISTS trg_rollup_payments_insert
+       AFTER INSERT ON payments
+       BEGIN''' + _ROLLUP_ADD_NEW + '''
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_rollup_payments_update
+       AFTER UPDATE OF status, payment_date, amount_cents ON payments
+       WHEN OLD.status IS NOT NEW.status OR OLD.payment_date IS NOT NEW.payment_date
+            OR OLD.amount_cents IS NOT NEW.amount_cents
+       BEGIN''' + _ROLLUP_SUBTRACT_OLD + _ROLLUP_ADD_NEW + '''
+       END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_rollup_payments_delete
+       AFTER DELETE ON payments
+       BEGIN''' + _ROLLUP_SUBTRACT_OLD + '''
+       END''',
+]
+
+# Migraciones de esquema, aplicadas en orden según PRAGMA user_version.
+# Cada sentencia puede ser SQL o una función que recibe el cursor.
+SCHEMA_MIGRATIONS = [
+    (1, "Índices para consultas por cliente y por fecha", [
+        '''CREATE INDEX IF NOT EXISTS idx_payments_client_date
+           ON payments (client_id, payment_date DESC)''',
+        '''CREATE INDEX IF NOT EXISTS idx_consumption_client_date
+           ON water_consumption (client_id, consumption_date DESC)''',
+        '''CREATE INDEX IF NOT EXISTS idx_payments_status_date
+           ON payments (status, payment_date)''',
+    ]),
+    (2, "Índices para consultas por rango de fechas", [
+        '''CREATE INDEX IF NOT EXISTS idx_payments_date
+           ON payments (payment_date)''',
+        '''CREATE INDEX IF NOT EXISTS idx_consumption_type_date
+           ON water_consumption (consumption_type, consumption_date)''',
+    ]),
+    (3, "Resumen materializado del dashboard", [
+        '''CREATE TABLE IF NOT EXISTS dashboard_summary (
+               period TEXT PRIMARY KEY,
+               active_clients INTEGER NOT NULL DEFAULT 0,
+               clients_with_debt INTEGER NOT NULL DEFAULT 0,
+               payments_paid INTEGER NOT NULL DEFAULT 0,
+               clients_with_excess INTEGER NOT NULL DEFAULT 0
+           )''',
+        'DELETE FROM dashboard_summary',
+        'INSERT INTO dashboard_summary ' + DASHBOARD_SUMMARY_SOURCE,
+        *DASHBOARD_SUMMARY_TRIGGERS,
+    ]),
+    (4, "Último estado de pago y consumo desnormalizado en clients", [
+        'ALTER TABLE clients ADD COLUMN last_payment_status TEXT',
+        'ALTER TABLE clients ADD COLUMN last_payment_date TIMESTAMP',
+        'ALTER TABLE clients ADD COLUMN last_consumption_type TEXT',
+        'ALTER TABLE clients ADD COLUMN last_consumption_date TIMESTAMP',
+        CLIENT_LAST_PAYMENT_REFRESH,
+        CLIENT_LAST_CONSUMPTION_REFRESH,
+        'CREATE INDEX IF NOT EXISTS idx_clients_name ON clients (name)',
+        *CLIENT_STATUS_TRIGGERS,
+    ]),
+    (5, "Puntos de control para importaciones reanudables", [
+        '''CREATE TABLE IF NOT EXISTS import_checkpoints (
+               source TEXT PRIMARY KEY,
+               kind TEXT NOT NULL,
+               rows_done INTEGER NOT NULL DEFAULT 0,
+               completed INTEGER NOT NULL DEFAULT 0,
+               updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           )''',
+    ]),
+    (6, "Índice por fecha de consumo para exportaciones particionadas por mes", [
+        '''CREATE INDEX IF NOT EXISTS idx_consumption_date
+           ON water_consumption (consumption_date)''',
+    ]),
+    (7, "Triggers de exceso de consumo con búsqueda por cliente", [
+        'DROP TRIGGER IF EXISTS trg_summary_consumption_insert',
+        'DROP TRIGGER IF EXISTS trg_summary_consumption_update',
+        'DROP TRIGGER IF EXISTS trg_summary_consumption_delete',
+        *[trigger for trigger in DASHBOARD_SUMMARY_TRIGGERS if 'trg_summary_consumption_' in trigger],
+    ]),
+    (8, "Búsqueda de clientes por texto completo (FTS5 trigram)", [
+        create_client_search,
+    ]),
+    (9, "Montos de pagos en centavos enteros", [
+        migrate_payments_to_cents,
+    ]),
+    (10, "Columnas generadas year_month y day con índices", [
+        add_date_key_columns,
+    ]),
+    (11, "Totales mensuales de pagos por estado", [
+        PAYMENTS_MONTHLY_ROLLUP_TABLE,
+        'DELETE FROM payments_monthly_rollup',
+        'INSERT INTO payments_monthly_rollup ' + PAYMENTS_MONTHLY_ROLLUP_SOURCE,
+        *PAYMENTS_MONTHLY_ROLLUP_TRIGGERS,
+    ]),
+    (12, "Índice para contar clientes por estado de pago", [
+        '''CREATE INDEX IF NOT EXISTS idx_clients_status_payment
+           ON clients (status, last_payment_status)''',
+    ]),
+    # Cambiar la fecha de un exceso dentro del mismo mes sumaba un cliente de más
+    (13, "Trigger de exceso de consumo solo al cambiar de mes, cliente o tipo", [
+        'DROP TRIGGER IF EXISTS trg_summary_consumption_update',
+        *[trigger for trigger in DASHBOARD_SUMMARY_TRIGGERS if 'trg_summary_consumption_update' in trigger],
+        'DELETE FROM dashboard_summary',
+        'INSERT INTO dashboard_summary ' + DASHBOARD_SUMMARY_SOURCE,
+    ]),
+    # Las conexiones sin la función fold_text no podían escribir en clients
+    (14, "Índice de búsqueda de clientes normalizado en SQL, sin funciones de Python", [
+        refold_client_search,
+    ]),
+]
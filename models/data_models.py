@@ -3,10 +3,126 @@ Sistema de Gestión de Pago de Agua
 Módulo: Modelos de Datos
 """
 
-from dataclasses import dataclass
+import sys
+from array import array
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Optional, List
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import total_ordering
+from typing import Dict, Iterable, Iterator, Optional, List, Union
 
+def slotted(cls):
+    """Recrea una dataclass con __slots__ (sin __dict__ por instancia)
+
+    Equivale a dataclass(slots=True), disponible solo desde Python 3.10.
+    """
+    namespace = dict(cls.__dict__)
+    field_names = tuple(field.name for field in fields(cls))
+    namespace['__slots__'] = field_names
+    # Los valores por defecto ya están en __init__; como atributos de clase
+    # chocarían con los slots
+    for name in field_names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+def intern_status(value):
+    """Comparte una sola copia de cada texto de estado entre todos los objetos"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+@total_ordering
+class Money:
+    """Monto de dinero exacto, guardado como centavos enteros
+
+    Evita los errores de redondeo de float al sumar muchos pagos. Los valores
+    en pesos (str, Decimal, int o float) se convierten redondeando a centavos
+    con ROUND_HALF_UP; en la base de datos se guarda cents tal cual.
+    """
+
+    __slots__ = ('cents',)
+
+    CENT = Decimal('0.01')
+
+    def __init__(self, cents: int = 0):
+        if isinstance(cents, bool) or not isinstance(cents, int):
+            raise TypeError(f"Los centavos deben ser un entero: {cents!r}")
+        self.cents = cents
+
+    @classmethod
+    def from_value(cls, value: Union["Money", Decimal, str, int, float]) -> "Money":
+        """Convierte un monto en pesos a Money (ValueError si no es un monto válido)"""
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, bool) or value is None:
+            raise ValueError(f"Monto inválido: {value!r}")
+        try:
+            # str() de un float da su representación más corta (0.1 -> '0.1'),
+            # así 0.1 se vuelve exactamente 10 centavos
+            amount = Decimal(value.strip() if isinstance(value, str) else str(value))
+            cents = amount.quantize(cls.CENT, rounding=ROUND_HALF_UP) * 100
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"Monto inválido: {value!r}")
+        if not cents.is_finite():
+            raise ValueError(f"Monto inválido: {value!r}")
+        return cls(int(cents))
+
+    @classmethod
+    def sum(cls, values: Iterable[Union["Money", Decimal, str, int, float]]) -> "Money":
+        """Suma exacta de varios montos"""
+        return cls(sum(cls.from_value(value).cents for value in values))
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-2)
+
+    def __float__(self) -> float:
+        return self.cents / 100
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def __format__(self, spec: str) -> str:
+        return format(self.to_decimal(), spec) if spec else str(self)
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        return NotImplemented
+
+    def __radd__(self, other):
+        # Permite sum() sobre montos (empieza en 0)
+        if other == 0 and not isinstance(other, bool):
+            return self
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.cents)
+
+@slotted
 @dataclass
 class Client:
     """Modelo de datos para Cliente"""
@@ -17,6 +133,9 @@ class Client:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
+    def __post_init__(self):
+        self.status = intern_status(self.status)
+    
     def to_dict(self) -> dict:
         return {
             'id': self.id,
@@ -27,9 +146,14 @@ class Client:
             'updated_at': self.updated_at
         }
 
+@slotted
 @dataclass
 class Payment:
-    """Modelo de datos para Pago"""
+    """Modelo de datos para Pago
+    
+    amount es el monto en pesos (float), como siempre; amount_cents y money
+    se derivan de él redondeando a centavos.
+    """
     id: Optional[int] = None
     client_id: int = 0
     amount: float = 0.0
@@ -38,17 +162,32 @@ class Payment:
     notes: str = ""
     created_at: Optional[datetime] = None
     
+    def __post_init__(self):
+        # Acepta pesos como float, str, Decimal o Money; se guarda redondeado a centavos
+        self.amount = float(Money.from_value(self.amount))
+        self.status = intern_status(self.status)
+    
+    @property
+    def money(self) -> Money:
+        return Money.from_value(self.amount)
+    
+    @property
+    def amount_cents(self) -> int:
+        return self.money.cents
+    
     def to_dict(self) -> dict:
         return {
             'id': self.id,
             'client_id': self.client_id,
             'amount': self.amount,
+            'amount_cents': self.amount_cents,
             'payment_date': self.payment_date,
             'status': self.status,
             'notes': self.notes,
             'created_at': self.created_at
         }
 
+@slotted
 @dataclass
 class WaterConsumption:
     """Modelo de datos para Consumo de Agua"""
@@ -59,6 +198,9 @@ class WaterConsumption:
     notes: str = ""
     created_at: Optional[datetime] = None
     
+    def __post_init__(self):
+        self.consumption_type = intern_status(self.consumption_type)
+    
     def to_dict(self) -> dict:
         return {
             'id': self.id,
@@ -69,6 +211,14 @@ class WaterConsumption:
             'created_at': self.created_at
         }
 
+# Filtros de estado del dashboard: opción -> (atributo, valor requerido)
+CLIENT_STATUS_FILTERS = {
+    "Solo con deuda": ('payment_status', 'pendiente'),
+    "Solo al corriente": ('payment_status', 'pagado'),
+    "Exceso de consumo": ('consumption_status', 'exceso'),
+}
+
+@slotted
 @dataclass
 class ClientWithStatus:
     """Modelo extendido de Cliente con estados de pago y consumo"""
@@ -79,6 +229,11 @@ class ClientWithStatus:
     payment_status: str  # pagado, pendiente, sin_pagos
     consumption_status: str  # normal, exceso
     
+    def __post_init__(self):
+        self.status = intern_status(self.status)
+        self.payment_status = intern_status(self.payment_status)
+        self.consumption_status = intern_status(self.consumption_status)
+    
     def get_status_icon(self) -> str:
         """Retorna el ícono según el estado del cliente"""
         if self.payment_status == "pendiente":
@@ -100,3 +255,91 @@ class ClientWithStatus:
             return "Al Corriente"
         else:
             return "Sin Registros"
+
+class ClientStatusTable:
+    """Colección compacta de clientes con estado, guardada por columnas
+
+    Los IDs van en un array de enteros y cada estado como un código de un
+    byte; solo nombre y dirección quedan como textos. Se comporta como una
+    secuencia de ClientWithStatus (los objetos se crean al leerlos), así que
+    sirve donde antes se usaba una lista.
+    """
+
+    STATUS_COLUMNS = ('status', 'payment_status', 'consumption_status')
+
+    def __init__(self, clients: Iterable[ClientWithStatus] = ()):
+        self.ids = array('q')
+        self.names: List[str] = []
+        self.addresses: List[str] = []
+        # Por columna de estado: textos distintos, su código y los códigos por fila
+        self._values: Dict[str, List[str]] = {column: [] for column in self.STATUS_COLUMNS}
+        self._codes: Dict[str, Dict[str, int]] = {column: {} for column in self.STATUS_COLUMNS}
+        self._columns: Dict[str, array] = {column: array('B') for column in self.STATUS_COLUMNS}
+        for client in clients:
+            self.append(client.id, client.name, client.address, client.status,
+                        client.payment_status, client.consumption_status)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "ClientStatusTable":
+        """Crea la tabla desde filas de DatabaseManager.get_clients_with_payment_status"""
+        table = cls()
+        for row in rows:
+            table.append(row['id'], row['name'], row['address'], row['status'],
+                         row['payment_status'], row['consumption_status'])
+        return table
+
+    def _code(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self._values[column].append(intern_status(value))
+        return code
+
+    def append(self, client_id: int, name: str, address: str, status: str,
+               payment_status: str, consumption_status: str):
+        """Agrega un cliente al final de la tabla"""
+        self.ids.append(client_id)
+        self.names.append(name)
+        self.addresses.append(address)
+        for column, value in zip(self.STATUS_COLUMNS, (status, payment_status, consumption_status)):
+            self._columns[column].append(self._code(column, value))
+
+    def replaced(self, client: ClientWithStatus) -> "ClientStatusTable":
+        """Copia de la tabla con los datos de un cliente cambiados (o agregado al final)"""
+        table = ClientStatusTable()
+        table.ids = array('q', self.ids)
+        table.names = list(self.names)
+        table.addresses = list(self.addresses)
+        table._values = {column: list(values) for column, values in self._values.items()}
+        table._codes = {column: dict(codes) for column, codes in self._codes.items()}
+        table._columns = {column: array('B', codes) for column, codes in self._columns.items()}
+        try:
+            index = table.ids.index(client.id)
+        except ValueError:
+            table.append(client.id, client.name, client.address, client.status,
+                         client.payment_status, client.consumption_status)
+            return table
+        table.names[index] = client.name
+        table.addresses[index] = client.address
+        for column in self.STATUS_COLUMNS:
+            table._columns[column][index] = table._code(column, getattr(client, column))
+        return table
+
+    def status_column(self, column: str) -> List[str]:
+        """Textos de una columna de estado, uno por fila (compartidos, no copias)"""
+        values = self._values[column]
+        return [values[code] for code in self._columns[column]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> ClientWithStatus:
+        return ClientWithStatus(
+            self.ids[index], self.names[index], self.addresses[index],
+            *(self._values[column][self._columns[column][index]] for column in self.STATUS_COLUMNS)
+        )
+
+    def __iter__(self) -> Iterator[ClientWithStatus]:
+        for index in range(len(self.ids)):
+            yield self[index]
@@ -0,0 +1,139 @@
+"""
+Test de las consultas en segundo plano: el hilo de la interfaz nunca ejecuta SQL
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QDate, QEventLoop, QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def create_controller(tmp):
+    db_manager = DatabaseManager(os.path.join(tmp, "async.db"))
+    for i in range(30):
+        client_id = db_manager.add_client(f"Cliente {i}", f"Calle {i} #100")
+        db_manager.add_payment(client_id, 100.0 + i, 'pagado' if i % 2 else 'pendiente')
+    return AppController(db_manager)
+
+def record_sql_threads(db_manager):
+    """Registra el hilo de cada sentencia SQL ejecutada a partir de ahora"""
+    threads = set()
+    get_connection = db_manager.get_connection
+
+    def traced_connection():
+        conn = get_connection()
+        conn.set_trace_callback(lambda sql: threads.add(threading.get_ident()))
+        return conn
+
+    db_manager.get_connection = traced_connection
+    return threads
+
+def wait_until_idle(controller, timeout_ms=5000):
+    """Procesa eventos hasta que no queden consultas en curso"""
+    loop = QEventLoop()
+    controller.loading_changed.connect(lambda loading: loading or loop.quit())
+    QTimer.singleShot(timeout_ms, loop.quit)
+    if controller.is_loading():
+        loop.exec_()
+    app.processEvents()
+    assert not controller.is_loading(), "Las consultas no terminaron a tiempo"
+
+def test_queries_run_off_the_gui_thread():
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = create_controller(tmp)
+        try:
+            threads = record_sql_threads(controller.db_manager)
+            results = {}
+            loading = []
+            controller.query_finished.connect(lambda key, result: results.__setitem__(key, result))
+            controller.loading_changed.connect(loading.append)
+
+            controller.load_clients_async()
+            controller.load_statistics_async()
+            wait_until_idle(controller)
+
+            assert len(results['clients']) == 30
+            assert results['statistics']['total_clients'] == 30
+            assert loading == [True, False]
+            assert threads and threading.get_ident() not in threads
+            print("✅ Las consultas se ejecutan fuera del hilo de la interfaz")
+        finally:
+            controller.thread_pool.waitForDone()
+            controller.db_manager.close()
+
+def test_superseded_requests_are_dropped():
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = create_controller(tmp)
+        try:
+            results = []
+            controller.query_finished.connect(lambda key, result: results.append((key, result)))
+
+            # Solo debe llegar el resultado de la última fecha solicitada
+            controller.load_payments_by_date_async('2020-01-01')
+            controller.load_payments_by_date_async('2021-01-01')
+            today = QDate.currentDate().toString("yyyy-MM-dd")
+            controller.load_payments_by_date_async(today)
+            wait_until_idle(controller)
+            assert len(results) == 1 and len(results[0][1]) == 30
+
+            # Una consulta cancelada no entrega resultado
+            controller.load_statistics_async()
+            controller.cancel_query('statistics')
+            assert not controller.is_loading()
+            controller.thread_pool.waitForDone()
+            app.processEvents()
+            assert len(results) == 1
+            print("✅ Las solicitudes reemplazadas o canceladas se descartan")
+        finally:
+            controller.thread_pool.waitForDone()
+            controller.db_manager.close()
+
+def test_windows_load_without_sql_on_gui_thread():
+    from ui.main_window import MainWindow
+    from ui.client_dialogs import ClientProfileDialog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = create_controller(tmp)
+        try:
+            threads = record_sql_threads(controller.db_manager)
+            # La detección de cambios tiene su propia prueba (test_change_watcher.py)
+            window = MainWindow(controller, watch_changes=False)
+            window.show_payments_by_date(QDate.currentDate())
+            wait_until_idle(controller)
+            assert window.clients_model.rowCount() == 30
+            assert window.total_clients_card.findChild(type(window.loading_label), "stat-number").text() == "30"
+            assert "Cliente 1 - $101.00" in window.date_payments_text.toPlainText()
+            # El calendario marca el día con pagos pendientes
+            marked = window.calendar.dateTextFormat(QDate.currentDate())
+            assert marked.fontWeight() == QFont.Bold and "15 pendiente(s)" in marked.toolTip()
+            assert not window.loading_label.isVisible()
+
+            dialog = ClientProfileDialog(window.clients_model.client_id(0), window, controller)
+            wait_until_idle(controller)
+            assert dialog.name_label.text() == window.clients_model.client_name(0)
+            assert dialog.payments_table.rowCount() == 1
+            dialog.reject()
+
+            assert threads and threading.get_ident() not in threads
+            window.close()
+            print("✅ Dashboard, calendario y perfil cargan sin SQL en el hilo de la interfaz")
+        finally:
+            controller.thread_pool.waitForDone()
+            controller.db_manager.close()
+
+if __name__ == "__main__":
+    test_queries_run_off_the_gui_thread()
+    test_superseded_requests_are_dropped()
+    test_windows_load_without_sql_on_gui_thread()
+    print("\n🎉 ¡Todos los tests de consultas en segundo plano pasaron!")
@@ -0,0 +1,87 @@
+"""
+Test de la generación masiva de reportes sin GUI
+"""
+
+import sys
+import os
+import tempfile
+import zipfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+from utils.exporters import DataExporter
+from utils.reports import BatchReportGenerator, report_filename
+
+def create_test_db(tmp, clients=12):
+    db_manager = DatabaseManager(os.path.join(tmp, "reports.db"))
+    client_ids = db_manager.add_clients_bulk((f"Cliente {i}", f"Calle {i} #100") for i in range(clients))
+    # Pagos y consumos solo para algunos clientes, en orden mezclado
+    for i, client_id in enumerate(reversed(client_ids)):
+        if i % 3:
+            db_manager.add_payment(client_id, 100.0 + i, 'pagado', f"nota {i}")
+            db_manager.add_payment(client_id, 50.0, 'pendiente')
+        if i % 2:
+            db_manager.add_water_consumption(client_id, 'exceso')
+    return db_manager, client_ids
+
+def test_prefetch_matches_per_client_queries():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager, client_ids = create_test_db(tmp)
+        try:
+            data = list(db_manager.iter_client_report_data())
+            assert [client['id'] for client, _, _ in data] == client_ids
+            for client, payments, consumption in data:
+                assert client == db_manager.get_client(client['id'])
+                assert payments == db_manager.get_client_payments(client['id'])
+                assert consumption == db_manager.get_client_consumption(client['id'])
+            print("✅ La precarga coincide con las consultas por cliente")
+        finally:
+            db_manager.close()
+
+def test_single_report_has_real_line_breaks():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager, client_ids = create_test_db(tmp)
+        try:
+            filename = os.path.join(tmp, "reporte.txt")
+            assert DataExporter.export_client_report(db_manager, client_ids[-2], filename)
+            with open(filename, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            assert lines[0] == "REPORTE DE CLIENTE"
+            assert "Número de pagos: 2" in lines and "\\n" not in "".join(lines)
+            print("✅ El reporte individual tiene saltos de línea reales")
+        finally:
+            db_manager.close()
+
+def test_batch_reports_in_directory_and_zip():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager, client_ids = create_test_db(tmp)
+        try:
+            directory = os.path.join(tmp, "reportes")
+            result = BatchReportGenerator(db_manager, directory, workers=2, shard_size=5).run()
+            assert result['reports'] == len(client_ids) and result['reports_per_second'] > 0
+            assert sorted(os.listdir(directory)) == sorted(report_filename(i) for i in client_ids)
+
+            single = os.path.join(tmp, "uno.txt")
+            DataExporter.export_client_report(db_manager, client_ids[0], single)
+            with open(single, encoding='utf-8') as a, \
+                 open(os.path.join(directory, report_filename(client_ids[0])), encoding='utf-8') as b:
+                # Solo difiere la hora de generación
+                assert a.read().splitlines()[:-1] == b.read().splitlines()[:-1]
+
+            archive = os.path.join(tmp, "reportes.zip")
+            result = BatchReportGenerator(db_manager, archive, as_zip=True, workers=1, shard_size=5).run()
+            with zipfile.ZipFile(archive) as zf:
+                assert len(zf.namelist()) == result['reports'] == len(client_ids)
+                text = zf.read(report_filename(client_ids[1])).decode('utf-8')
+            assert text.startswith("REPORTE DE CLIENTE\n")
+            print("✅ Reportes masivos en directorio (multiproceso) y en zip")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_prefetch_matches_per_client_queries()
+    test_single_report_has_real_line_breaks()
+    test_batch_reports_in_directory_and_zip()
+    print("\n🎉 ¡Todos los tests de reportes pasaron!")
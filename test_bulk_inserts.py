@@ -0,0 +1,67 @@
+"""
+Test de inserciones masivas sin GUI
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+def test_bulk_inserts_return_ids():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bulk.db"))
+        try:
+            db_manager.add_client("Previo", "Calle Previa 1")
+            client_ids = db_manager.add_clients_bulk(
+                ((f"Cliente {i}", f"Calle {i} #100") for i in range(25)), chunk_size=10
+            )
+            assert client_ids == list(range(2, 27))
+            assert db_manager.get_client(client_ids[-1])['name'] == "Cliente 24"
+
+            payment_ids = db_manager.add_payments_bulk(
+                ({'client_id': cid, 'amount': 10.5, 'status': 'pendiente'} for cid in client_ids),
+                chunk_size=7
+            )
+            assert len(payment_ids) == 25
+            payment = db_manager.get_client_payments(client_ids[3])[0]
+            assert payment['id'] == payment_ids[3] and payment['status'] == 'pendiente'
+
+            consumption_ids = db_manager.add_consumption_bulk(
+                [(cid, 'exceso', '', '2024-05-10 08:00:00') for cid in client_ids[:5]]
+            )
+            record = db_manager.get_client_consumption(client_ids[0])[0]
+            assert record['id'] == consumption_ids[0]
+            assert record['consumption_date'] == '2024-05-10 08:00:00'
+
+            assert db_manager.get_statistics()['clients_with_debt'] == 25
+            assert db_manager.check_dashboard_summary() == []
+            print("✅ Las inserciones masivas retornan los IDs asignados")
+        finally:
+            db_manager.close()
+
+def test_bulk_insert_is_atomic():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bulk.db"))
+        try:
+            client_id = db_manager.add_client("Ana", "Calle Uno 100")
+            rows = [(client_id, 10.0, 'pagado')] * 5 + [(client_id, 10.0, 'invalido')]
+            try:
+                db_manager.add_payments_bulk(rows, chunk_size=2)
+                assert False, "Se esperaba un error de integridad"
+            except sqlite3.IntegrityError:
+                pass
+            assert db_manager.get_client_payments(client_id) == []
+            assert db_manager.get_statistics()['payments_this_month'] == 0
+            print("✅ Un error revierte el lote completo")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_bulk_inserts_return_ids()
+    test_bulk_insert_is_atomic()
+    print("\n🎉 ¡Todos los tests de inserciones masivas pasaron!")
@@ -0,0 +1,160 @@
+"""
+Test de la detección de cambios de otras estaciones (PRAGMA data_version)
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+from utils.change_watcher import DatabaseChangeWatcher
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def other_station(db_path):
+    """Conexión independiente, como la de otra estación que comparte el archivo"""
+    return sqlite3.connect(db_path)
+
+def test_only_other_connections_trigger_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "watch.db"))
+        try:
+            watcher = DatabaseChangeWatcher(db_manager)
+            emitted = []
+            watcher.changed.connect(lambda: emitted.append(True))
+            watcher.start()
+            assert not watcher.check()
+
+            # Las escrituras propias ya emiten las señales del controlador
+            db_manager.add_client("Ana", "Calle Uno 100")
+            assert not watcher.check()
+
+            conn = other_station(db_manager.db_path)
+            conn.execute("INSERT INTO clients (name, address) VALUES ('Luis', 'Calle Dos 200')")
+            conn.commit()
+            assert watcher.check()
+            assert not watcher.check()
+            conn.close()
+            assert emitted == [True] and watcher.changes == 1 and watcher.checks == 4
+            assert watcher._files == (None, None)  # Con data_version no se consulta el archivo
+            watcher.stop()
+            print("✅ Solo los commits de otras conexiones cuentan como cambios")
+        finally:
+            db_manager.close()
+
+def test_file_state_fallback():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "fallback.db"))
+        try:
+            db_manager.get_data_version = lambda: None  # Como si el PRAGMA fallara
+            watcher = DatabaseChangeWatcher(db_manager)
+            watcher.start()
+            assert not watcher.check()
+            conn = other_station(db_manager.db_path)
+            conn.execute("INSERT INTO clients (name, address) VALUES ('Luis', 'Calle Dos 200')")
+            conn.commit()
+            conn.close()
+            assert watcher.check()
+            print("✅ Sin data_version se compara la fecha de modificación del archivo")
+        finally:
+            db_manager.close()
+
+def test_data_version_is_the_only_gui_thread_sql():
+    """Excepción documentada a "sin SQL en el hilo de la interfaz" (test_async_queries.py)
+
+    Cada revisión ejecuta PRAGMA data_version en el hilo de la interfaz: debe
+    usar la misma conexión que las escrituras propias para no confundirlas
+    con cambios externos, y solo lee un contador en memoria compartida. La
+    recarga que dispara un cambio externo sí corre en segundo plano.
+    """
+    from ui.main_window import MainWindow
+
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = AppController(DatabaseManager(os.path.join(tmp, "window.db")))
+        try:
+            controller.add_client("Ana García", "Calle Uno 100")
+            gui_thread = threading.get_ident()
+            statements = []
+            get_connection = controller.db_manager.get_connection
+
+            def traced_connection():
+                conn = get_connection()
+                conn.set_trace_callback(
+                    lambda sql: threading.get_ident() == gui_thread and statements.append(sql))
+                return conn
+
+            controller.db_manager.get_connection = traced_connection
+            window = MainWindow(controller)
+            window.change_watcher.stop()  # Las revisiones se hacen a mano
+            controller.thread_pool.waitForDone()
+            app.processEvents()
+            assert not window.change_watcher.check()
+
+            conn = other_station(controller.db_manager.db_path)
+            conn.execute("INSERT INTO clients (name, address) VALUES ('Luis Pérez', 'Calle Dos 200')")
+            conn.commit()
+            conn.close()
+            assert window.change_watcher.check()
+            controller.thread_pool.waitForDone()
+            app.processEvents()
+            assert window.clients_model.rowCount() == 2
+            assert statements and set(statements) == {'PRAGMA data_version'}
+            window.close()
+            print("✅ En el hilo de la interfaz solo corre PRAGMA data_version")
+        finally:
+            controller.thread_pool.waitForDone()
+            controller.db_manager.close()
+
+def test_main_window_reloads_on_external_change():
+    from ui.main_window import MainWindow
+
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = AppController(DatabaseManager(os.path.join(tmp, "window.db")))
+        try:
+            controller.add_client("Ana García", "Calle Uno 100")
+            window = MainWindow(controller)
+            window.change_watcher.stop()
+            controller.thread_pool.waitForDone()
+            app.processEvents()
+            assert window.clients_model.rowCount() == 1
+            controller.watch_changes(interval_ms=50)
+            invalidations = controller.get_cache_stats()['invalidations']
+
+            conn = other_station(controller.db_manager.db_path)
+            conn.execute("INSERT INTO clients (name, address) VALUES ('Luis Pérez', 'Calle Dos 200')")
+            conn.commit()
+            conn.close()
+
+            # El temporizador detecta el cambio y la ventana recarga sin intervención
+            loop = QEventLoop()
+            controller.query_finished.connect(lambda key, result: key == 'statistics' and loop.quit())
+            QTimer.singleShot(5000, loop.quit)
+            loop.exec_()
+            controller.thread_pool.waitForDone()
+            app.processEvents()
+            assert window.clients_model.rowCount() == 2
+            total = window.total_clients_card.findChild(type(window.loading_label), "stat-number")
+            assert total.text() == "2"
+            assert controller.get_cache_stats()['invalidations'] > invalidations
+            window.close()
+            assert not window.change_watcher.is_active()
+            print("✅ El dashboard se recarga cuando otra estación confirma cambios")
+        finally:
+            controller.thread_pool.waitForDone()
+            controller.db_manager.close()
+
+if __name__ == "__main__":
+    test_only_other_connections_trigger_changes()
+    test_file_state_fallback()
+    test_data_version_is_the_only_gui_thread_sql()
+    test_main_window_reloads_on_external_change()
+    print("\n🎉 ¡Todos los tests de detección de cambios pasaron!")
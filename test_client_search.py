@@ -0,0 +1,162 @@
+"""
+Test de la búsqueda de clientes por texto completo (FTS5 trigram) sin GUI
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+def create_test_db(tmp):
+    db_manager = DatabaseManager(os.path.join(tmp, "search.db"))
+    db_manager.add_clients_bulk([
+        ("José Peña", "Calle Álamo 123"),
+        ("Ana López", "Av. Juárez 45"),
+        ("Pedro Pérez", "Calle Peñasco 9"),
+        ("Luis Gómez", "Privada 123 Norte"),
+    ])
+    return db_manager
+
+def names(results):
+    return [client['name'] for client in results]
+
+def test_substring_search_ignores_case_and_accents():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            assert db_manager.has_client_search_index()
+            assert sorted(names(db_manager.search_clients("pena"))) == ["José Peña", "Pedro Pérez"]
+            assert names(db_manager.search_clients("JUAREZ")) == ["Ana López"]
+            assert names(db_manager.search_clients("ópe")) == ["Ana López"]
+            assert names(db_manager.search_clients("zzz")) == []
+            # Términos cortos usan LIKE (sin distinguir mayúsculas)
+            assert names(db_manager.search_clients("JO")) == ["José Peña"]
+            print("✅ Búsqueda por subcadena sin mayúsculas ni acentos")
+        finally:
+            db_manager.close()
+
+def test_numeric_term_puts_exact_id_first():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            assert names(db_manager.search_clients("2")) == ["Ana López"]
+            # "123" no es un ID: se busca en las direcciones
+            assert sorted(names(db_manager.search_clients("123"))) == ["José Peña", "Luis Gómez"]
+
+            for i in range(120):
+                db_manager.add_client(f"Cliente {i}", f"Calle {i}")
+            results = db_manager.search_clients("123")
+            assert results[0]['id'] == 123 and results[0]['name'] == "Cliente 118"
+            assert sorted(names(results[1:])) == ["José Peña", "Luis Gómez"]
+            print("✅ Un término numérico prioriza el ID exacto")
+        finally:
+            db_manager.close()
+
+def test_limit_and_offset_paginate_ranked_results():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            for i in range(30):
+                db_manager.add_client(f"Vecino {i:02d}", "Colonia Centro")
+            everything = db_manager.search_clients("centro")
+            assert len(everything) == 30
+            pages = [db_manager.search_clients("centro", limit=8, offset=offset)
+                     for offset in range(0, 30, 8)]
+            assert [len(page) for page in pages] == [8, 8, 8, 6]
+            assert [client['id'] for page in pages for client in page] == \
+                [client['id'] for client in everything]
+
+            # El ID exacto cuenta como el primer resultado de la primera página
+            first = db_manager.search_clients("123", limit=1)
+            second = db_manager.search_clients("123", limit=1, offset=1)
+            assert len(first) == 1 and len(second) == 1
+            assert first[0]['id'] != second[0]['id']
+            print("✅ limit/offset paginan los resultados ordenados")
+        finally:
+            db_manager.close()
+
+def test_triggers_keep_index_in_sync():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            client_id = db_manager.add_client("Marta Ríos", "Calle Sol 7")
+            assert names(db_manager.search_clients("rios")) == ["Marta Ríos"]
+
+            db_manager.update_client(client_id, "Marta Núñez", "Calle Luna 7", 'activo')
+            assert names(db_manager.search_clients("rios")) == []
+            assert names(db_manager.search_clients("nunez luna")) == []
+            assert names(db_manager.search_clients("luna")) == ["Marta Núñez"]
+
+            db_manager.delete_client(client_id)
+            assert names(db_manager.search_clients("nunez")) == []
+
+            assert db_manager.rebuild_client_search()
+            assert sorted(names(db_manager.search_clients("pena"))) == ["José Peña", "Pedro Pérez"]
+            print("✅ Los triggers mantienen el índice sincronizado")
+        finally:
+            db_manager.close()
+
+def test_search_uses_fts_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            conn = db_manager.get_connection()
+            statements = []
+            conn.set_trace_callback(statements.append)
+            db_manager.search_clients("calle")
+            conn.set_trace_callback(None)
+
+            sql = next(s for s in statements if 'clients_fts' in s and s.lstrip().startswith('SELECT c.*'))
+            plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+            assert any('VIRTUAL TABLE INDEX' in step for step in plan), plan
+            assert not any(step.strip().startswith('SCAN c') for step in plan), plan
+            print("✅ La búsqueda usa el índice FTS5")
+        finally:
+            db_manager.close()
+
+def test_plain_connections_can_write_clients():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "plain.db")
+        db_manager = DatabaseManager(db_path)
+        try:
+            # Una base migrada con los triggers anteriores, que llamaban a fold_text
+            with db_manager.transaction() as conn:
+                conn.execute('DROP TRIGGER trg_clients_fts_insert')
+                conn.execute('''CREATE TRIGGER trg_clients_fts_insert AFTER INSERT ON clients
+                                BEGIN
+                                    INSERT INTO clients_fts (rowid, name, address)
+                                    VALUES (NEW.id, fold_text(NEW.name), fold_text(NEW.address));
+                                END''')
+                conn.execute('PRAGMA user_version = 13')
+        finally:
+            db_manager.close()
+
+        db_manager = DatabaseManager(db_path)
+        try:
+            # Conexión sin funciones registradas, como la de otra estación
+            conn = sqlite3.connect(db_path)
+            conn.execute("INSERT INTO clients (name, address) VALUES ('Íñigo Muñoz', 'Calle Ébano 3')")
+            client_id = conn.execute("SELECT id FROM clients").fetchone()[0]
+            conn.execute("UPDATE clients SET address = 'Calle Ámbar 4' WHERE id = ?", (client_id,))
+            conn.commit()
+            conn.close()
+            assert names(db_manager.search_clients("INIGO munoz")) == ["Íñigo Muñoz"]
+            assert names(db_manager.search_clients("ámbar")) == ["Íñigo Muñoz"]
+            assert names(db_manager.search_clients("ebano")) == []
+            print("✅ Cualquier conexión escribe clientes sin funciones de Python")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_substring_search_ignores_case_and_accents()
+    test_numeric_term_puts_exact_id_first()
+    test_limit_and_offset_paginate_ranked_results()
+    test_triggers_keep_index_in_sync()
+    test_search_uses_fts_index()
+    test_plain_connections_can_write_clients()
+    print("\n🎉 ¡Todas las pruebas de búsqueda pasaron!")
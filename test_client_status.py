@@ -0,0 +1,160 @@
+"""
+Test del estado de pago y consumo desnormalizado en clients
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+# Consulta original con funciones de ventana, usada como referencia
+WINDOW_QUERY = '''
+    SELECT c.id, COALESCE(p.status, 'sin_pagos'), COALESCE(wc.consumption_type, 'normal')
+    FROM clients c
+    LEFT JOIN (
+        SELECT client_id, status,
+               ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY payment_date DESC, id DESC) as rn
+        FROM payments
+    ) p ON c.id = p.client_id AND p.rn = 1
+    LEFT JOIN (
+        SELECT client_id, consumption_type,
+               ROW_NUMBER() OVER (PARTITION BY client_id ORDER BY consumption_date DESC, id DESC) as rn
+        FROM water_consumption
+    ) wc ON c.id = wc.client_id AND wc.rn = 1
+    ORDER BY c.id
+'''
+
+def denormalized(db_manager):
+    return sorted((c['id'], c['payment_status'], c['consumption_status'])
+                  for c in db_manager.get_clients_with_payment_status())
+
+def reference(db_manager):
+    return [tuple(row) for row in db_manager.get_connection().execute(WINDOW_QUERY)]
+
+def test_latest_status_follows_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "status.db"))
+        try:
+            conn = db_manager.get_connection()
+            ana = db_manager.add_client("Ana", "Calle Uno 100")
+            luis = db_manager.add_client("Luis", "Calle Dos 200")
+            db_manager.add_client("Eva", "Calle Tres 300")
+
+            p1 = db_manager.add_payment(ana, 100.0, 'pendiente')
+            p2 = db_manager.add_payment(ana, 100.0, 'pagado')
+            db_manager.add_water_consumption(luis, 'exceso')
+            assert denormalized(db_manager) == reference(db_manager)
+            assert denormalized(db_manager)[0] == (ana, 'pagado', 'normal')
+
+            # Un pago con fecha anterior no reemplaza al último
+            p3 = db_manager.add_payment(luis, 50.0, 'pagado')
+            conn.execute("UPDATE payments SET payment_date = '2000-01-01 00:00:00' WHERE id = ?", (p3,))
+            db_manager.add_payment(luis, 50.0, 'pendiente')
+            conn.execute("UPDATE payments SET payment_date = '1999-01-01 00:00:00' WHERE id = ?",
+                         (p3 + 1,))
+            conn.commit()
+            assert denormalized(db_manager) == reference(db_manager)
+
+            db_manager.update_payment_status(p2, 'pendiente')
+            conn.execute('DELETE FROM payments WHERE id = ?', (p1,))
+            conn.execute("UPDATE water_consumption SET consumption_type = 'normal'")
+            conn.commit()
+            assert denormalized(db_manager) == reference(db_manager)
+
+            conn.execute('DELETE FROM payments')
+            conn.commit()
+            assert denormalized(db_manager) == reference(db_manager)
+            print("✅ El estado desnormalizado coincide con la consulta de ventana")
+        finally:
+            db_manager.close()
+
+def test_rebuild_restores_status():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "status.db"))
+        try:
+            client_id = db_manager.add_client("Ana", "Calle Uno 100")
+            db_manager.add_payment(client_id, 100.0, 'pendiente')
+            conn = db_manager.get_connection()
+            conn.execute('UPDATE clients SET last_payment_status = NULL')
+            conn.commit()
+
+            db_manager.rebuild_client_status()
+            assert denormalized(db_manager) == [(client_id, 'pendiente', 'normal')]
+            print("✅ La reconstrucción recalcula el estado de los clientes")
+        finally:
+            db_manager.close()
+
+def test_migration_backfills_existing_database():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "legacy.db")
+        # Base de datos creada por una versión anterior (sin migraciones)
+        legacy = DatabaseManager(db_path)
+        conn = legacy.get_connection()
+        legacy.add_client("Ana", "Calle Uno 100")
+        conn.execute("INSERT INTO payments (client_id, amount_cents, status) VALUES (1, 1000, 'pendiente')")
+        conn.execute('UPDATE clients SET last_payment_status = NULL')
+        conn.execute('PRAGMA user_version = 3')
+        conn.commit()
+        triggers = conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                                "AND name LIKE 'trg_client_status_%'").fetchall()
+        for (trigger,) in triggers:
+            conn.execute(f'DROP TRIGGER {trigger}')
+        conn.execute('DROP INDEX idx_clients_status_payment')
+        for column in ('last_payment_status', 'last_payment_date',
+                       'last_consumption_type', 'last_consumption_date'):
+            conn.execute(f'ALTER TABLE clients DROP COLUMN {column}')
+        conn.commit()
+        legacy.close()
+
+        db_manager = DatabaseManager(db_path)
+        try:
+            assert denormalized(db_manager) == [(1, 'pendiente', 'normal')]
+            print("✅ La migración llena el estado de clientes existentes")
+        finally:
+            db_manager.close()
+
+def test_status_counts_use_latest_payment_of_active_clients():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "counts.db"))
+        try:
+            ana = db_manager.add_client("Ana", "Calle Uno 100")
+            luis = db_manager.add_client("Luis", "Calle Dos 200")
+            eva = db_manager.add_client("Eva", "Calle Tres 300")
+            db_manager.add_client("Sin Pagos", "Calle Cuatro 400")
+            conn = db_manager.get_connection()
+            # Ana debía pero su último pago está al corriente
+            db_manager.add_payment(ana, 10.0, 'pendiente')
+            conn.execute("UPDATE payments SET payment_date = '2020-01-01 00:00:00'")
+            conn.commit()
+            db_manager.add_payment(ana, 10.0, 'pagado')
+            db_manager.add_payment(luis, 10.0, 'pendiente')
+            db_manager.add_payment(eva, 10.0, 'pendiente')
+            db_manager.update_client(eva, "Eva", "Calle Tres 300", 'inactivo')
+
+            assert db_manager.get_client_payment_status_counts() == \
+                {'pagado': 1, 'pendiente': 1, 'sin_pagos': 1}
+            assert db_manager.get_client_payment_status_counts(None) == \
+                {'pagado': 1, 'pendiente': 2, 'sin_pagos': 1}
+
+            statements = []
+            conn.set_trace_callback(statements.append)
+            db_manager.get_client_payment_status_counts()
+            conn.set_trace_callback(None)
+            sql = next(s for s in statements if 'last_payment_status' in s)
+            plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+            assert any('COVERING INDEX idx_clients_status_payment' in step for step in plan), plan
+            assert 'payments' not in sql.replace('last_payment_status', '')
+            print("✅ Resumen de estados por el último pago de clientes activos")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_latest_status_follows_writes()
+    test_rebuild_restores_status()
+    test_migration_backfills_existing_database()
+    test_status_counts_use_latest_payment_of_active_clients()
+    print("\n🎉 ¡Todos los tests de estado de clientes pasaron!")
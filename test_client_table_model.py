@@ -0,0 +1,127 @@
+"""
+Test del modelo virtual de la tabla de clientes (sin ventana visible)
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QPersistentModelIndex, Qt, QTimer
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+from models.data_models import ClientWithStatus
+from ui.client_table_model import ClientTableModel
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def sample_clients():
+    return [
+        ClientWithStatus(3, "Ana López", "Calle Uno 10", "activo", "pagado", "normal"),
+        ClientWithStatus(1, "Beatriz Ruiz", "Av. Juárez 5", "activo", "pendiente", "exceso"),
+        ClientWithStatus(12, "carlos Díaz", "Calle Dos 7", "inactivo", "sin_pagos", "normal"),
+        ClientWithStatus(7, "Daniel Mora", "Juárez 99", "activo", "pagado", "exceso"),
+    ]
+
+def column(model, col):
+    return [model.data(model.index(row, col)) for row in range(model.rowCount())]
+
+def test_display_roles():
+    model = ClientTableModel()
+    model.set_clients(sample_clients())
+    assert model.rowCount() == 4 and model.columnCount() == 5
+    assert column(model, 0) == ["3", "1", "12", "7"]
+    assert column(model, 3)[2] == "Inactivo"
+    assert column(model, 4)[:3] == ["✅ Al Corriente", "❌ Pago Pendiente", "⚪ Sin Registros"]
+    assert model.data(model.index(0, 0), Qt.TextAlignmentRole) == Qt.AlignCenter
+    assert model.data(model.index(0, 1), Qt.TextAlignmentRole) is None
+    assert model.headerData(2, Qt.Horizontal) == "Dirección"
+    print("✅ El modelo muestra las columnas de la tabla original")
+
+def test_filters_match_controller_rules():
+    model = ClientTableModel()
+    model.set_clients(sample_clients())
+
+    model.set_filter("juárez", "Todos")
+    assert column(model, 0) == ["1", "7"]
+    model.set_filter("  JUÁREZ ", "Solo al corriente")
+    assert column(model, 0) == ["7"]
+    model.set_filter("", "Exceso de consumo")
+    assert column(model, 0) == ["1", "7"]
+    model.set_filter("12", "Todos")
+    assert column(model, 0) == ["12"]
+
+    # El filtro se conserva al recargar los datos
+    model.set_clients(sample_clients() + [
+        ClientWithStatus(20, "Elena Paz", "Calle 12", "activo", "pagado", "normal")])
+    assert column(model, 0) == ["12", "20"]
+    assert model.total_count() == 5
+    print("✅ Búsqueda y filtros de estado sobre las columnas")
+
+def test_sort_keeps_selection():
+    model = ClientTableModel()
+    model.set_clients(sample_clients())
+    selected = QPersistentModelIndex(model.index(1, 1))
+    assert model.client_id(selected.row()) == 1
+
+    model.sort(0, Qt.DescendingOrder)
+    assert column(model, 0) == ["12", "7", "3", "1"]
+    assert model.client_id(selected.row()) == 1 and selected.column() == 1
+
+    model.sort(1, Qt.AscendingOrder)
+    assert column(model, 1) == ["Ana López", "Beatriz Ruiz", "carlos Díaz", "Daniel Mora"]
+    assert model.client_name(selected.row()) == "Beatriz Ruiz"
+
+    model.sort(-1)
+    assert column(model, 0) == ["3", "1", "12", "7"]
+    assert model.client_id(99) is None
+    print("✅ Ordenar no recrea filas y conserva la selección")
+
+def wait(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec_()
+
+def test_debounced_search_with_controller_index():
+    from ui.main_window import MainWindow, SEARCH_DEBOUNCE_MS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = AppController(DatabaseManager(os.path.join(tmp, "search.db")))
+        try:
+            controller.add_clients_bulk([("José Peña", "Calle Uno 1"), ("Ana Ruiz", "Av. Juárez 2")])
+            window = MainWindow(controller)
+            window.change_watcher.stop()
+            controller.thread_pool.waitForDone()
+            wait(50)
+            assert window.clients_model.rowCount() == 2
+
+            calls = []
+            window.search_timer.timeout.connect(lambda: calls.append(window.search_input.text()))
+            for end in range(1, 5):
+                window.search_input.setText("pena"[:end])
+            assert window.clients_model.rowCount() == 2  # Aún no se filtra
+            wait(SEARCH_DEBOUNCE_MS + 100)
+            assert calls == ["pena"]
+            assert window.clients_model.rowCount() == 1
+
+            # El índice del controlador se actualiza con cada alta
+            client_id, _ = controller.add_client("Pedro Peñaloza", "Calle Tres 3")
+            assert client_id in controller.search_index.search("penalo")
+            assert [c.name for c in controller.filter_clients_by_search(
+                controller.get_clients_with_status(), "PEÑA")] == ["José Peña", "Pedro Peñaloza"]
+            window.close()
+            print("✅ La búsqueda espera a que el usuario deje de escribir")
+        finally:
+            controller.thread_pool.waitForDone()
+            controller.db_manager.close()
+
+if __name__ == "__main__":
+    test_display_roles()
+    test_filters_match_controller_rules()
+    test_sort_keeps_selection()
+    test_debounced_search_with_controller_index()
+    print("\n🎉 ¡Todos los tests del modelo de tabla pasaron!")
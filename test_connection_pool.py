@@ -0,0 +1,137 @@
+"""
+Test del pool de conexiones sin GUI
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.connection_pool import ConnectionPool, PoolExhaustedError
+from database.database_manager import DatabaseManager
+
+def test_same_thread_reuses_connection():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "test.db"))
+        try:
+            assert db_manager.get_connection() is db_manager.get_connection()
+            assert db_manager.verify_pin("1234")
+            print("✅ El mismo hilo reutiliza su conexión")
+        finally:
+            db_manager.close()
+
+def test_threads_get_their_own_connection():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "test.db"))
+        try:
+            main_conn = db_manager.get_connection()
+            worker_conns = []
+
+            def worker():
+                worker_conns.append(db_manager.get_connection())
+                db_manager.verify_pin("1234")
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+            assert worker_conns[0] is not main_conn
+            print("✅ Cada hilo obtiene su propia conexión")
+        finally:
+            db_manager.close()
+
+def test_pool_size_limit_and_dead_threads():
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, "test.db"), max_size=1, timeout=0.1)
+        try:
+            # Un hilo terminado libera su lugar en el pool
+            thread = threading.Thread(target=pool.get_connection)
+            thread.start()
+            thread.join()
+            pool.get_connection()
+            assert pool.size() == 1
+
+            # Con un hilo vivo ocupando el pool, otro hilo debe esperar y fallar
+            errors = []
+            ready = threading.Event()
+            done = threading.Event()
+
+            def holder():
+                pool.get_connection()
+                ready.set()
+                done.wait()
+
+            pool.release()
+            holder_thread = threading.Thread(target=holder)
+            holder_thread.start()
+            ready.wait()
+            try:
+                pool.get_connection()
+            except PoolExhaustedError as e:
+                errors.append(e)
+            done.set()
+            holder_thread.join()
+
+            assert errors
+            print("✅ El pool respeta el tamaño máximo")
+        finally:
+            pool.close_all()
+
+def test_finished_thread_releases_connection():
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, "test.db"))
+        try:
+            for _ in range(3):
+                thread = threading.Thread(target=pool.get_connection)
+                thread.start()
+                thread.join()
+                assert pool.size() == 0  # Sin esperar a que el pool se llene
+
+            # El finalizador de un hilo anterior con el mismo identificador no
+            # cierra la conexión del hilo actual
+            main_conn = pool.get_connection()
+            stale_conn = pool._create_connection()
+            pool._release_finished_thread(threading.get_ident(), stale_conn)
+            stale_conn.close()
+            assert pool.get_connection() is main_conn and pool.size() == 1
+            print("✅ Al terminar un hilo se libera su conexión")
+        finally:
+            pool.close_all()
+
+def test_health_check_replaces_broken_connection():
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, "test.db"), health_check_interval=0)
+        try:
+            conn = pool.get_connection()
+            conn.close()
+            new_conn = pool.get_connection()
+            assert new_conn is not conn
+            new_conn.execute('SELECT 1')
+            print("✅ Las conexiones dañadas se reemplazan")
+        finally:
+            pool.close_all()
+
+def test_performance_profiles_applied():
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile, synchronous in (('durable', 2), ('fast', 1)):
+            pool = ConnectionPool(os.path.join(tmp, f"{profile}.db"), profile=profile)
+            try:
+                conn = pool.get_connection()
+                assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+                assert conn.execute('PRAGMA synchronous').fetchone()[0] == synchronous
+                assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == 5000
+            finally:
+                pool.close_all()
+        print("✅ Los perfiles de rendimiento se aplican a cada conexión")
+
+if __name__ == "__main__":
+    test_same_thread_reuses_connection()
+    test_threads_get_their_own_connection()
+    test_pool_size_limit_and_dead_threads()
+    test_finished_thread_releases_connection()
+    test_health_check_replaces_broken_connection()
+    test_performance_profiles_applied()
+    print("\n🎉 ¡Todos los tests del pool pasaron!")
@@ -0,0 +1,125 @@
+"""
+Test de la importación masiva desde CSV sin GUI
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+from utils.importers import CsvImporter
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def read_rejected(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))[1:]
+
+def test_import_validates_and_rejects():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "import.db"))
+        try:
+            clients_csv = os.path.join(tmp, "clientes.csv")
+            write_csv(clients_csv, ['name', 'address', 'status'], [
+                ['Ana López', 'Calle Uno 100', 'activo'],
+                ['X', 'Calle Dos 200', 'activo'],          # nombre muy corto
+                ['Luis Pérez', 'Calle Tres 300', ''],
+            ])
+            result = CsvImporter(db_manager, 'clients', clients_csv, batch_size=2).run()
+            assert result['inserted'] == 2 and result['rejected'] == 1
+            rejected = read_rejected(os.path.join(tmp, "clientes.rechazados.csv"))
+            assert rejected[0][0] == '3' and rejected[0][2] == 'X'
+
+            payments_csv = os.path.join(tmp, "pagos.csv")
+            write_csv(payments_csv, ['client_id', 'amount', 'status', 'notes', 'payment_date'], [
+                ['1', '150.50', 'pagado', 'histórico', '15/01/2020'],
+                ['2', '80', 'pendiente', '', ''],
+                ['99', '80', 'pagado', '', ''],             # cliente inexistente
+                ['1', '-5', 'pagado', '', ''],              # monto inválido
+            ])
+            result = CsvImporter(db_manager, 'payments', payments_csv).run()
+            assert result['inserted'] == 2 and result['rejected'] == 2
+            payments = db_manager.get_client_payments(1)
+            assert payments[0]['payment_date'] == '2020-01-15 00:00:00'
+            assert db_manager.check_dashboard_summary() == []
+            print("✅ La importación valida, inserta y guarda los rechazos")
+        finally:
+            db_manager.close()
+
+def test_import_resumes_after_interruption():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "import.db"))
+        try:
+            clients_csv = os.path.join(tmp, "clientes.csv")
+            write_csv(clients_csv, ['name', 'address'],
+                      [[f"Cliente {i}", f"Calle {i} #100"] for i in range(10)])
+
+            def interrupt(status):
+                raise KeyboardInterrupt
+
+            try:
+                CsvImporter(db_manager, 'clients', clients_csv, batch_size=4, progress=interrupt).run()
+            except KeyboardInterrupt:
+                pass
+            assert len(db_manager.get_all_clients()) == 4
+
+            result = CsvImporter(db_manager, 'clients', clients_csv, batch_size=4).run()
+            assert result['resumed_from'] == 4 and result['inserted'] == 6
+            names = sorted(c['name'] for c in db_manager.get_all_clients())
+            assert names == sorted(f"Cliente {i}" for i in range(10))
+
+            # Un archivo ya importado no se vuelve a importar
+            result = CsvImporter(db_manager, 'clients', clients_csv).run()
+            assert result['already_completed'] and result['inserted'] == 0
+            print("✅ La importación se reanuda sin duplicar filas")
+        finally:
+            db_manager.close()
+
+def test_rejected_rows_survive_interrupted_commit():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "import.db"))
+        try:
+            clients_csv = os.path.join(tmp, "clientes.csv")
+            # Un nombre inválido (muy corto) en cada lote de 4
+            write_csv(clients_csv, ['name', 'address'],
+                      [["X" if i % 4 == 1 else f"Cliente {i}", f"Calle {i} #100"] for i in range(10)])
+
+            # Falla al guardar el avance del segundo lote: sus rechazos ya están
+            # en disco pero la transacción no se confirma
+            save_checkpoint = db_manager.save_import_checkpoint
+            def failing_checkpoint(key, kind, rows_done, completed=False):
+                if rows_done == 8:
+                    raise KeyboardInterrupt
+                return save_checkpoint(key, kind, rows_done, completed)
+            db_manager.save_import_checkpoint = failing_checkpoint
+            try:
+                CsvImporter(db_manager, 'clients', clients_csv, batch_size=4).run()
+            except KeyboardInterrupt:
+                pass
+            db_manager.save_import_checkpoint = save_checkpoint
+
+            rejected_path = os.path.join(tmp, "clientes.rechazados.csv")
+            assert [row[0] for row in read_rejected(rejected_path)] == ['3', '7']
+
+            result = CsvImporter(db_manager, 'clients', clients_csv, batch_size=4).run()
+            assert result['resumed_from'] == 4 and result['rejected'] == 2
+            # Cada fila rechazada aparece una sola vez tras reanudar
+            assert [row[0] for row in read_rejected(rejected_path)] == ['3', '7', '11']
+            assert len(db_manager.get_all_clients()) == 7
+            print("✅ Los rechazos se guardan antes del avance y no se duplican al reanudar")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_import_validates_and_rejects()
+    test_import_resumes_after_interruption()
+    test_rejected_rows_survive_interrupted_commit()
+    print("\n🎉 ¡Todos los tests de importación pasaron!")
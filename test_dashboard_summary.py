@@ -0,0 +1,109 @@
+"""
+Test del resumen materializado del dashboard sin GUI
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+def test_triggers_keep_summary_consistent():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "summary.db"))
+        try:
+            ana = db_manager.add_client("Ana", "Calle Uno 100")
+            luis = db_manager.add_client("Luis", "Calle Dos 200")
+            db_manager.add_client("Eva", "Calle Tres 300")
+
+            p1 = db_manager.add_payment(ana, 100.0, 'pendiente')
+            db_manager.add_payment(ana, 100.0, 'pendiente')
+            db_manager.add_payment(luis, 100.0, 'pagado')
+            db_manager.add_water_consumption(ana, 'exceso')
+            db_manager.add_water_consumption(ana, 'exceso')
+            db_manager.add_water_consumption(luis, 'normal')
+
+            stats = db_manager.get_statistics()
+            assert stats == {
+                'total_clients': 3,
+                'clients_with_debt': 1,
+                'payments_this_month': 1,
+                'excess_consumption': 1
+            }, stats
+
+            db_manager.update_client(luis, "Luis", "Calle Dos 200", 'inactivo')
+            db_manager.update_payment_status(p1, 'pagado')
+            assert db_manager.get_statistics()['clients_with_debt'] == 1
+            assert db_manager.get_statistics()['payments_this_month'] == 2
+
+            # Mover un pago a otro mes y borrar consumos también debe reflejarse
+            conn = db_manager.get_connection()
+            conn.execute("UPDATE payments SET payment_date = '2020-01-15 10:00:00' WHERE id = ?", (p1,))
+            conn.execute("UPDATE payments SET status = 'pagado' WHERE client_id = ?", (ana,))
+            conn.execute("DELETE FROM water_consumption WHERE client_id = ?", (ana,))
+            conn.commit()
+
+            stats = db_manager.get_statistics()
+            assert stats['total_clients'] == 2
+            assert stats['clients_with_debt'] == 0
+            assert stats['excess_consumption'] == 0
+            assert db_manager.check_dashboard_summary() == []
+            print("✅ Los triggers mantienen el resumen consistente")
+        finally:
+            db_manager.close()
+
+def test_excess_date_change_within_month():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "summary.db"))
+        try:
+            ana = db_manager.add_client("Ana", "Calle Uno 100")
+            conn = db_manager.get_connection()
+            conn.execute("""INSERT INTO water_consumption (client_id, consumption_type, consumption_date)
+                            VALUES (?, 'exceso', '2024-03-05 10:00:00')""", (ana,))
+            conn.commit()
+            conn.execute("UPDATE water_consumption SET consumption_date = '2024-03-20 10:00:00'")
+            conn.commit()
+
+            row = conn.execute(
+                "SELECT clients_with_excess FROM dashboard_summary WHERE period = '2024-03'").fetchone()
+            assert row[0] == 1
+            assert db_manager.check_dashboard_summary() == []
+
+            # Cambiar de mes sí mueve al cliente de un periodo a otro
+            conn.execute("UPDATE water_consumption SET consumption_date = '2024-04-02 10:00:00'")
+            conn.commit()
+            assert db_manager.check_dashboard_summary() == []
+            print("✅ Cambiar la fecha de un exceso dentro del mes no altera el resumen")
+        finally:
+            db_manager.close()
+
+def test_checker_detects_and_rebuild_fixes_drift():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "summary.db"))
+        try:
+            client_id = db_manager.add_client("Ana", "Calle Uno 100")
+            db_manager.add_payment(client_id, 100.0, 'pagado')
+
+            conn = db_manager.get_connection()
+            conn.execute("UPDATE dashboard_summary SET active_clients = 99 WHERE period = 'total'")
+            conn.commit()
+
+            drift = db_manager.check_dashboard_summary()
+            assert drift == [{'period': 'total', 'field': 'active_clients',
+                              'stored': 99, 'expected': 1}], drift
+
+            db_manager.rebuild_dashboard_summary()
+            assert db_manager.check_dashboard_summary() == []
+            assert db_manager.get_statistics()['payments_this_month'] == 1
+            print("✅ El verificador detecta diferencias y la reconstrucción las corrige")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_triggers_keep_summary_consistent()
+    test_excess_date_change_within_month()
+    test_checker_detects_and_rebuild_fixes_drift()
+    print("\n🎉 ¡Todos los tests del resumen pasaron!")
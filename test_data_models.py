@@ -0,0 +1,73 @@
+"""
+Test de los modelos de datos compactos (__slots__, estados compartidos y tabla por columnas)
+"""
+
+import sys
+import os
+from dataclasses import fields
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.data_models import (Client, Payment, WaterConsumption, ClientWithStatus,
+                                ClientStatusTable)
+
+def fresh(text):
+    """Crea una copia nueva del texto (como las que retorna SQLite)"""
+    return ''.join(list(text))
+
+def test_models_use_slots_and_keep_dataclass_behavior():
+    for model in (Client, Payment, WaterConsumption):
+        instance = model()
+        assert not hasattr(instance, '__dict__'), model
+        assert tuple(f.name for f in fields(model)) == model.__slots__
+        assert instance == model() and instance.to_dict()['id'] is None
+
+    client = Client(5, "Ana", "Calle Uno")
+    assert client.status == "activo"
+    try:
+        client.nickname = "Anita"
+        assert False, "Los modelos no deben aceptar atributos nuevos"
+    except AttributeError:
+        pass
+    print("✅ Los modelos usan __slots__ y conservan el comportamiento de dataclass")
+
+def test_status_strings_are_shared():
+    first = ClientWithStatus(1, "Ana", "Calle", fresh("activo"), fresh("pendiente"), fresh("exceso"))
+    second = ClientWithStatus(2, "Luis", "Calle", fresh("activo"), fresh("pendiente"), fresh("exceso"))
+    assert first.status is second.status
+    assert first.payment_status is second.payment_status
+    assert Payment(status=fresh("pagado")).status is Payment(status=fresh("pagado")).status
+    print("✅ Los textos de estado se comparten entre objetos")
+
+def test_client_status_table_round_trip():
+    clients = [
+        ClientWithStatus(3, "Ana", "Calle Uno", "activo", "pagado", "normal"),
+        ClientWithStatus(9, "Luis", "Calle Dos", "inactivo", "sin_pagos", "exceso"),
+        ClientWithStatus(4, "Eva", "Calle Tres", "activo", "pendiente", "normal"),
+    ]
+    table = ClientStatusTable(clients)
+    assert len(table) == 3
+    assert list(table) == clients
+    assert table[-1] == clients[-1]
+    assert list(table.ids) == [3, 9, 4]
+    assert table.status_column('payment_status') == ["pagado", "sin_pagos", "pendiente"]
+
+    rows = [{'id': c.id, 'name': c.name, 'address': c.address, 'status': c.status,
+             'payment_status': c.payment_status, 'consumption_status': c.consumption_status}
+            for c in clients]
+    assert list(ClientStatusTable.from_rows(rows)) == clients
+
+    # replaced retorna una copia y deja la tabla original intacta
+    paid = ClientWithStatus(9, "Luis", "Calle Dos", "inactivo", "pagado", "normal")
+    new = ClientWithStatus(7, "Zoe", "Calle Cuatro", "suspendido", "pendiente", "normal")
+    assert list(table.replaced(paid)) == [clients[0], paid, clients[2]]
+    assert list(table.replaced(new)) == clients + [new]
+    assert list(table) == clients
+    print("✅ ClientStatusTable conserva los clientes")
+
+if __name__ == "__main__":
+    test_models_use_slots_and_keep_dataclass_behavior()
+    test_status_strings_are_shared()
+    test_client_status_table_round_trip()
+    print("\n🎉 ¡Todos los tests de modelos pasaron!")
@@ -0,0 +1,97 @@
+"""
+Test de consultas por rango de fechas sin GUI
+"""
+
+import sys
+import os
+import tempfile
+from datetime import date
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+PAYMENT_DATES = [
+    '2024-02-29 23:59:59',
+    '2024-03-01 00:00:00',
+    '2024-03-15 12:30:00',
+    '2024-03-17 08:00:00',
+    '2024-03-31 23:59:59',
+    '2024-04-01 00:00:00',
+]
+
+def create_test_db(tmp):
+    db_manager = DatabaseManager(os.path.join(tmp, "dates.db"))
+    client_id = db_manager.add_client("Cliente Fechas", "Calle Principal 100")
+    conn = db_manager.get_connection()
+    for payment_date in PAYMENT_DATES:
+        payment_id = db_manager.add_payment(client_id, 50.0)
+        conn.execute('UPDATE payments SET payment_date = ? WHERE id = ?', (payment_date, payment_id))
+    conn.commit()
+    return db_manager
+
+def dates_of(payments):
+    return sorted(p['payment_date'] for p in payments)
+
+def test_half_open_ranges():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            assert dates_of(db_manager.get_payments_by_month(2024, 3)) == PAYMENT_DATES[1:5]
+            assert dates_of(db_manager.get_payments_by_date('2024-03-15')) == ['2024-03-15 12:30:00']
+            # Semana del lunes 11 al domingo 17 de marzo de 2024
+            assert dates_of(db_manager.get_payments_by_week(date(2024, 3, 13))) == PAYMENT_DATES[2:4]
+            assert dates_of(db_manager.get_payments_between('2024-02-29', '2024-03-01')) == PAYMENT_DATES[:1]
+            print("✅ Rangos semiabiertos por día, semana y mes")
+        finally:
+            db_manager.close()
+
+def test_generated_date_keys():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            conn = db_manager.get_connection()
+            rows = conn.execute('SELECT year_month, day FROM payments ORDER BY id').fetchall()
+            assert [tuple(row) for row in rows][:2] == [(202402, 20240229), (202403, 20240301)]
+
+            # Las columnas siguen a los cambios de fecha sin triggers
+            conn.execute("UPDATE payments SET payment_date = '2025-01-05 09:00:00' WHERE id = 1")
+            conn.commit()
+            assert tuple(conn.execute('SELECT year_month, day FROM payments WHERE id = 1').fetchone()) \
+                == (202501, 20250105)
+            assert dates_of(db_manager.get_payments_by_date('2025-01-05')) == ['2025-01-05 09:00:00']
+            print("✅ Columnas generadas year_month y day")
+        finally:
+            db_manager.close()
+
+def test_payment_calendar_groups_by_day():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            conn = db_manager.get_connection()
+            conn.execute("UPDATE payments SET status = 'pendiente' WHERE payment_date = '2024-03-17 08:00:00'")
+            consumption_id = db_manager.add_water_consumption(1, 'exceso')
+            conn.execute("UPDATE water_consumption SET consumption_date = '2024-03-17 10:00:00' WHERE id = ?",
+                         (consumption_id,))
+            conn.commit()
+
+            assert db_manager.get_payment_calendar(2024, 3) == {
+                1: {'paid': 1, 'pending': 0, 'excess': 0},
+                15: {'paid': 1, 'pending': 0, 'excess': 0},
+                17: {'paid': 0, 'pending': 1, 'excess': 1},
+                31: {'paid': 1, 'pending': 0, 'excess': 0},
+            }
+            assert db_manager.get_payment_calendar(2023, 3) == {}
+            # Los pagos de la semana salen del más reciente al más antiguo
+            assert [p['payment_date'] for p in db_manager.get_payments_by_week(date(2024, 3, 13))] == \
+                PAYMENT_DATES[3:1:-1]
+            print("✅ Calendario de pagos agrupado por día")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_half_open_ranges()
+    test_generated_date_keys()
+    test_payment_calendar_groups_by_day()
+    print("\n🎉 ¡Todos los tests de fechas pasaron!")
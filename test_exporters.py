@@ -0,0 +1,132 @@
+"""
+Test de la exportación en streaming sin GUI
+"""
+
+import sys
+import os
+import csv
+import gzip
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+from utils.exporters import DataExporter, np, pq
+
+def create_test_db(tmp, payments=25):
+    db_manager = DatabaseManager(os.path.join(tmp, "export.db"))
+    client_id = db_manager.add_client("Ana López", "Calle Uno 100")
+    db_manager.add_payments_bulk((client_id, 10.0 + i, 'pagado', f"nota {i}") for i in range(payments))
+    return db_manager
+
+def test_streaming_export_with_column_selection():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            filename = os.path.join(tmp, "pagos.csv")
+            cursor = db_manager.get_export_cursor('payments')
+            exported = DataExporter.export_cursor_to_csv(cursor, filename,
+                                                         columns=['id', 'amount'], batch_size=7)
+            assert exported == 25
+            with open(filename, newline='', encoding='utf-8') as f:
+                rows = list(csv.reader(f))
+            assert rows[0] == ['id', 'amount']
+            assert rows[1] == ['1', '10.0'] and rows[-1] == ['25', '34.0']
+            print("✅ Exportación en streaming con selección de columnas")
+        finally:
+            db_manager.close()
+
+def test_gzip_export_and_invalid_input():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            filename = os.path.join(tmp, "pagos.csv.gz")
+            cursor = db_manager.get_export_cursor('payments', ['id', 'notes'])
+            assert DataExporter.export_cursor_to_csv(cursor, filename) == 25
+            with gzip.open(filename, 'rt', newline='', encoding='utf-8') as f:
+                rows = list(csv.reader(f))
+            assert rows[0] == ['id', 'notes'] and rows[25] == ['25', 'nota 24']
+
+            for table, columns in (('admins', None), ('payments', ['pin'])):
+                try:
+                    db_manager.get_export_cursor(table, columns)
+                    assert False, "Se esperaba un error de validación"
+                except ValueError:
+                    pass
+            print("✅ Exportación comprimida y validación de tablas y columnas")
+        finally:
+            db_manager.close()
+
+def export_months(db_manager, tmp, file_format):
+    db_manager.add_payment(1, 5.0, 'pendiente', None)
+    with db_manager.transaction() as conn:
+        conn.execute("UPDATE payments SET payment_date = '2024-01-31 23:59:59' WHERE id <= 10")
+        conn.execute("UPDATE payments SET payment_date = '2024-02-01 00:00:00' WHERE id > 10")
+    cursor = db_manager.get_export_cursor('payments', order_by_date=True)
+    directory = os.path.join(tmp, file_format)
+    exported = DataExporter.export_cursor_to_columnar(
+        cursor, directory, db_manager.get_export_columns('payments'),
+        partition_column='payment_date', file_format=file_format, batch_size=4
+    )
+    assert exported == 26
+    assert sorted(os.listdir(directory)) == ['month=2024-01', 'month=2024-02']
+    return directory
+
+def test_parquet_export_partitioned_by_month():
+    if pq is None:
+        print("⚠️  pyarrow no está instalado; se omite la prueba de Parquet")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            directory = export_months(db_manager, tmp, 'parquet')
+            january = pq.read_table(os.path.join(directory, 'month=2024-01', 'part-0.parquet'),
+                                    columns=['id', 'amount', 'payment_date'])
+            assert january.num_rows == 10
+            assert str(january.schema.field('id').type) == 'int64'
+            assert str(january.schema.field('payment_date').type) == 'timestamp[ms]'
+            assert january.column('amount').to_pylist()[0] == 10.0
+
+            february = pq.ParquetFile(os.path.join(directory, 'month=2024-02', 'part-0.parquet'))
+            assert february.metadata.num_rows == 16
+            assert february.metadata.num_row_groups > 1
+            assert february.read(columns=['notes']).column('notes').to_pylist()[-1] is None
+            print("✅ Exportación Parquet tipada y particionada por mes")
+        finally:
+            db_manager.close()
+
+def test_npz_export_partitioned_by_month():
+    if np is None:
+        print("⚠️  numpy no está instalado; se omite la prueba de .npz")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            directory = export_months(db_manager, tmp, 'npz')
+            # Un archivo por lote: la memoria no depende del tamaño del mes
+            february = os.path.join(directory, 'month=2024-02')
+            parts = sorted(os.listdir(february), key=lambda name: int(name[5:-4]))
+            assert parts == [f'part-{number}.npz' for number in range(5)]
+            with np.load(os.path.join(february, parts[0])) as data:
+                assert data['id'].dtype == np.int64 and len(data['id']) == 2
+                assert data['amount'][0] == 20.0
+                assert str(data['payment_date'][0]) == '2024-02-01T00:00:00'
+                assert 'id__null' not in data.files
+            ids = []
+            for part in parts:
+                with np.load(os.path.join(february, part)) as data:
+                    ids.extend(data['id'].tolist())
+            assert ids == list(range(11, 27))
+            with np.load(os.path.join(february, parts[-1])) as data:
+                assert data['notes__null'][-1] and not data['notes__null'][0]
+            print("✅ Exportación .npz tipada y particionada por mes")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_streaming_export_with_column_selection()
+    test_gzip_export_and_invalid_input()
+    test_parquet_export_partitioned_by_month()
+    test_npz_export_partitioned_by_month()
+    print("\n🎉 ¡Todos los tests de exportación pasaron!")
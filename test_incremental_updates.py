@@ -0,0 +1,206 @@
+"""
+Test de las actualizaciones por fila del dashboard (sin recargar toda la tabla)
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QPersistentModelIndex, QTimer, Qt
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+from models.data_models import ClientWithStatus
+from ui.client_table_model import ClientTableModel
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def make_clients():
+    return [
+        ClientWithStatus(1, "Ana", "Calle Uno", "activo", "pagado", "normal"),
+        ClientWithStatus(2, "Beto", "Calle Dos", "activo", "pendiente", "normal"),
+        ClientWithStatus(3, "Carla", "Calle Tres", "activo", "sin_pagos", "normal"),
+    ]
+
+def names(model):
+    return [model.client_name(row) for row in range(model.rowCount())]
+
+def test_model_updates_single_rows():
+    model = ClientTableModel()
+    model.set_clients(make_clients())
+    resets, moves = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.rowsMoved.connect(lambda *args: moves.append(args))
+    changed = []
+    model.dataChanged.connect(lambda top, bottom: changed.append(top.row()))
+
+    # Cambio de estado sin cambiar de lugar
+    model.update_client(ClientWithStatus(2, "Beto", "Calle Dos", "activo", "pagado", "normal"))
+    assert changed == [1] and model.data(model.index(1, 4)) == "✅ Al Corriente"
+
+    # Con la tabla ordenada por nombre la fila se mueve y conserva la selección
+    model.sort(1, Qt.AscendingOrder)
+    persistent = QPersistentModelIndex(model.index(0, 0))
+    model.update_client(ClientWithStatus(1, "Zoe", "Calle Uno", "activo", "pagado", "normal"))
+    assert names(model) == ["Beto", "Carla", "Zoe"] and len(moves) == 1
+    assert persistent.row() == 2
+
+    # Alta en su lugar según el orden, filtro respetado y baja
+    model.update_client(ClientWithStatus(4, "Bruno", "Calle Cuatro", "activo", "pendiente", "normal"))
+    assert names(model) == ["Beto", "Bruno", "Carla", "Zoe"]
+    model.set_filter("", "Solo con deuda")
+    assert names(model) == ["Bruno"]
+    model.update_client(ClientWithStatus(3, "Carla", "Calle Tres", "activo", "pendiente", "normal"))
+    assert names(model) == ["Bruno", "Carla"]
+    model.update_client(ClientWithStatus(4, "Bruno", "Calle Cuatro", "activo", "pagado", "normal"))
+    assert names(model) == ["Carla"]
+    model.set_filter("bruno")
+    assert names(model) == ["Bruno"]
+    model.remove_client(4)
+    assert names(model) == [] and model.total_count() == 3
+    model.set_filter()
+    assert names(model) == ["Beto", "Carla", "Zoe"]
+    assert len(resets) == 3  # Solo los set_filter reinician el modelo
+    print("✅ El modelo actualiza, mueve, agrega y quita filas sueltas")
+
+def wait_until_idle(controller, timeout_ms=5000):
+    """Procesa eventos hasta que no queden consultas en curso"""
+    loop = QEventLoop()
+    controller.loading_changed.connect(lambda loading: loading or loop.quit())
+    QTimer.singleShot(timeout_ms, loop.quit)
+    if controller.is_loading():
+        loop.exec_()
+    app.processEvents()
+    assert not controller.is_loading(), "Las consultas no terminaron a tiempo"
+
+def test_statistics_follow_writes_without_reloading():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "incremental.db"))
+        controller = AppController(db_manager)
+        try:
+            ana, _ = controller.add_client("Ana García", "Calle Uno 100")
+            controller.add_payment(ana, "100.00", 'pendiente')
+            assert controller.is_loading('statistics')  # Se relee aunque nada las muestre
+            wait_until_idle(controller)
+            assert controller._statistics == db_manager.get_statistics()
+            finished = []
+            controller.query_finished.connect(lambda key, result: finished.append(key))
+
+            def check():
+                # Lectura directa justo después de escribir y cuando termina la relectura
+                assert controller.get_statistics() == db_manager.get_statistics()
+                wait_until_idle(controller)
+                assert controller._statistics == db_manager.get_statistics()
+                hits = controller.get_cache_stats()['hits']
+                assert controller.get_statistics() == controller._statistics
+                assert controller.get_cache_stats()['hits'] == hits + 1  # La relectura llenó la caché
+
+            luis, _ = controller.add_client("Luis Pérez", "Calle Dos 200")
+            check()
+            payment_id, _ = controller.add_payment(luis, "50.00", 'pendiente')
+            check()
+            controller.update_payment_status(payment_id, 'pagado')
+            check()
+            controller.add_water_consumption(luis, 'exceso')
+            controller.add_water_consumption(luis, 'exceso')  # Reemplaza la lectura anterior
+            check()
+            controller.update_client(ana, "Ana García", "Calle Uno 100", 'inactivo')
+            pedro, _ = controller.add_client("Pedro Ruiz", "Calle Tres 300")
+            controller.delete_client(pedro)
+            check()
+            assert controller._statistics == {'total_clients': 1, 'clients_with_debt': 1,
+                                              'payments_this_month': 1, 'excess_consumption': 1}
+            assert set(finished) == {'statistics'} and len(finished) <= 7
+            print("✅ Las estadísticas se releen en segundo plano tras cada escritura")
+        finally:
+            controller.thread_pool.waitForDone()
+            db_manager.close()
+
+def test_pending_statistics_load_and_month_rollover():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "pending.db"))
+        controller = AppController(db_manager)
+        try:
+            gui_thread = threading.get_ident()
+            adopted = []
+            adopt = controller._adopt_statistics
+            controller._result_handlers['statistics'] = lambda stats: (
+                adopted.append(threading.get_ident()), adopt(stats))[1]
+
+            # Una carga en curso cuando llega una escritura se reemplaza por otra
+            controller.load_statistics_async()
+            controller.add_client("Ana García", "Calle Uno 100")
+            wait_until_idle(controller)
+            assert controller._statistics['total_clients'] == 1
+            assert adopted == [gui_thread]
+
+            # Al cambiar de mes el vigilante recarga los contadores
+            controller._statistics_month = '2000-01'
+            controller._check_month()
+            assert controller.is_loading('statistics')
+            wait_until_idle(controller)
+            controller._check_month()
+            assert not controller.is_loading() and adopted == [gui_thread] * 2
+            print("✅ Las cargas pendientes se reemplazan y el cambio de mes recarga")
+        finally:
+            controller.thread_pool.waitForDone()
+            db_manager.close()
+
+def wait_for(controller, key, timeout_ms=5000):
+    """Procesa eventos hasta recibir el resultado de una clave"""
+    loop = QEventLoop()
+    controller.query_finished.connect(lambda finished, result: finished == key and loop.quit())
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec_()
+
+def test_main_window_updates_only_the_affected_row():
+    from ui.main_window import MainWindow
+
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = AppController(DatabaseManager(os.path.join(tmp, "window.db")))
+        try:
+            controller.add_clients_bulk([(f"Cliente {i}", f"Calle {i} #100") for i in range(20)])
+            window = MainWindow(controller)
+            window.change_watcher.stop()
+            controller.thread_pool.waitForDone()
+            app.processEvents()
+            assert window.clients_model.rowCount() == 20
+
+            finished = []
+            controller.query_finished.connect(lambda key, result: finished.append(key))
+            client_id = window.clients_model.client_id(3)
+            controller.add_payment(client_id, "80.00", 'pendiente')
+            wait_for(controller, f"client_row:{client_id}")
+            controller.thread_pool.waitForDone()
+            app.processEvents()
+            assert window.debt_clients_card.findChild(type(window.loading_label), "stat-number").text() == "1"
+            assert window.clients_model.data(window.clients_model.index(3, 4)) == "❌ Pago Pendiente"
+
+            new_id, _ = controller.add_client("Zulema Díaz", "Calle Nueva 1")
+            wait_for(controller, f"client_row:{new_id}")
+            controller.thread_pool.waitForDone()
+            app.processEvents()
+            assert window.clients_model.rowCount() == 21
+            assert window.clients_model.client_id(20) == new_id
+            assert window.total_clients_card.findChild(type(window.loading_label), "stat-number").text() == "21"
+            assert 'clients' not in finished  # Las estadísticas sí: dos filas del resumen
+
+            controller.delete_client(new_id)
+            assert window.clients_model.rowCount() == 20
+            window.close()
+            print("✅ El dashboard actualiza solo la fila del cliente afectado")
+        finally:
+            controller.thread_pool.waitForDone()
+            controller.db_manager.close()
+
+if __name__ == "__main__":
+    test_model_updates_single_rows()
+    test_statistics_follow_writes_without_reloading()
+    test_pending_statistics_load_and_month_rollover()
+    test_main_window_updates_only_the_affected_row()
+    print("\n🎉 ¡Todos los tests de actualizaciones por fila pasaron!")
@@ -0,0 +1,167 @@
+"""
+Test de montos en centavos enteros (Money, validación, migración y sumas) sin GUI
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+from decimal import Decimal
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+from models.data_models import Money, Payment
+from utils.exporters import DataExporter
+from utils.validation import ValidationUtils
+
+def test_money_converts_exactly():
+    assert Money.from_value("150.50").cents == 15050
+    assert Money.from_value(0.1).cents == 10
+    assert Money.from_value(Decimal("2.005")).cents == 201
+    assert Money.from_value(7).cents == 700
+    assert Money.from_value(Money(5)) == Money(5)
+    for invalid in ("abc", "", None, True, float('nan')):
+        try:
+            Money.from_value(invalid)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Se aceptó {invalid!r}")
+
+    total = sum(Money.from_value(0.1) for _ in range(10))
+    assert total == Money.from_value(1) and str(total) == "1.00"
+    assert f"{Money(123456):,.2f}" == "1,234.56"
+    assert float(Money(15050)) == 150.5
+    assert Money.sum(["0.10", 0.2, Money(70)]) == Money(100)
+
+    # El orden y el tipo de los campos de Payment no cambian: amount en pesos
+    payment = Payment(None, 1, 25.5)
+    assert payment.amount == 25.5 and payment.amount_cents == 2550
+    assert payment.money == Money(2550)
+    assert Payment(client_id=1, amount="0.1").amount_cents == 10
+    assert Payment(client_id=1, amount=Money(1010)).amount == 10.1
+    assert type(payment.to_dict()['amount']) is float
+    print("✅ Money convierte y suma montos sin errores de redondeo")
+
+def test_validate_amount_uses_cents():
+    assert ValidationUtils.validate_amount("999999.99")[0]
+    assert ValidationUtils.validate_amount(Money(1))[0]
+    assert ValidationUtils.validate_amount(1000000)[1] == "El monto no puede exceder $999,999.99"
+    # Menos de medio centavo se redondea a cero
+    assert ValidationUtils.validate_amount(0.004)[1] == "El monto debe ser mayor a cero"
+    assert ValidationUtils.validate_amount("diez")[1] == "Monto inválido"
+    print("✅ validate_amount valida en centavos")
+
+def test_payments_store_cents_and_sum_in_sql():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "money.db"))
+        try:
+            client_id = db_manager.add_client("Ana", "Calle Uno 100")
+            other_id = db_manager.add_client("Luis", "Calle Dos 200")
+            db_manager.add_payment(client_id, 0.1)
+            db_manager.add_payment(client_id, "0.2")
+            db_manager.add_payment(client_id, Money(5000), 'pendiente')
+            db_manager.add_payments_bulk([(other_id, 0.1, 'pagado', '', '2024-01-10 10:00:00')] * 10)
+
+            row = db_manager.get_connection().execute(
+                'SELECT amount_cents, amount FROM payments WHERE id = 2').fetchone()
+            assert tuple(row) == (20, 0.2)
+
+            assert db_manager.get_payments_total(client_id) == Money(30)
+            assert db_manager.get_payments_total(client_id, status=None) == Money(5030)
+            assert db_manager.get_payments_total(other_id) == Money(100)
+            assert db_manager.get_payments_total(start='2024-01-01', end='2024-02-01') == Money(100)
+            assert db_manager.get_payments_total() == Money(130)
+
+            report = os.path.join(tmp, "reporte.txt")
+            assert DataExporter.export_client_report(db_manager, client_id, report)
+            with open(report, encoding='utf-8') as f:
+                assert "Total pagado: $0.30" in f.read()
+            print("✅ Los pagos se guardan en centavos y se suman en SQL")
+        finally:
+            db_manager.close()
+
+def test_new_databases_use_cents_layout():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "layout.db"))
+        try:
+            conn = db_manager.get_connection()
+            # Creada directamente en centavos, sin pasar por la migración 9
+            columns = {row[1]: (row[2], row[6]) for row in conn.execute('PRAGMA table_xinfo(payments)')}
+            assert columns['amount_cents'] == ('INTEGER', 0)
+            assert columns['amount'][1] == 2  # Columna generada virtual
+            client_id = db_manager.add_client("Ana", "Calle Uno 100")
+
+            # Los INSERT externos deben escribir amount_cents: amount es generada
+            try:
+                conn.execute('INSERT INTO payments (client_id, amount) VALUES (?, 10.0)', (client_id,))
+                raise AssertionError("Se aceptó un INSERT en la columna generada amount")
+            except sqlite3.OperationalError as e:
+                assert 'generated column' in str(e)
+            conn.execute('INSERT INTO payments (client_id, amount_cents) VALUES (?, 1000)', (client_id,))
+            conn.commit()
+            assert conn.execute('SELECT amount FROM payments').fetchone()[0] == 10.0
+            print("✅ Las bases nuevas se crean con montos en centavos")
+        finally:
+            db_manager.close()
+
+def test_migration_converts_real_amounts():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "legacy.db")
+        legacy = DatabaseManager(db_path)
+        legacy.add_client("Ana", "Calle Uno 100")
+        legacy.close()
+
+        # Simular la tabla de pagos anterior, con el monto en REAL
+        conn = sqlite3.connect(db_path)
+        conn.executescript('''
+            DROP TABLE payments;
+            CREATE TABLE payments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                client_id INTEGER NOT NULL,
+                amount REAL NOT NULL,
+                payment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                status TEXT DEFAULT 'pagado' CHECK(status IN ('pagado', 'pendiente')),
+                notes TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (client_id) REFERENCES clients (id)
+            );
+            INSERT INTO payments (client_id, amount, status) VALUES (1, 150.5, 'pagado');
+            INSERT INTO payments (client_id, amount, status) VALUES (1, 0.29, 'pendiente');
+            INSERT INTO payments (client_id, amount, status) VALUES (1, 1, 'pagado');
+            DELETE FROM payments WHERE id = 3;
+            PRAGMA user_version = 8;
+        ''')
+        conn.close()
+
+        db_manager = DatabaseManager(db_path)
+        try:
+            conn = db_manager.get_connection()
+            assert db_manager.get_schema_version() >= 9
+            rows = conn.execute('SELECT id, amount_cents FROM payments ORDER BY id').fetchall()
+            assert [tuple(row) for row in rows] == [(1, 15050), (2, 29)]
+            assert db_manager.get_export_columns('payments')['amount'] == 'REAL'
+
+            triggers = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'payments'")}
+            assert 'trg_summary_payments_insert' in triggers
+            assert 'trg_client_status_payments_delete' in triggers
+            indexes = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'payments'")}
+            assert {'idx_payments_client_date', 'idx_payments_status_date', 'idx_payments_date'} <= indexes
+
+            # El ID borrado no se reutiliza
+            assert db_manager.add_payment(1, "10") == 4
+            print("✅ La migración convierte los montos REAL a centavos")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_money_converts_exactly()
+    test_validate_amount_uses_cents()
+    test_payments_store_cents_and_sum_in_sql()
+    test_new_databases_use_cents_layout()
+    test_migration_converts_real_amounts()
+    print("\n🎉 ¡Todas las pruebas de montos pasaron!")
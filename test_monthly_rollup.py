@@ -0,0 +1,122 @@
+"""
+Test de los totales mensuales de pagos (payments_monthly_rollup) y su gráfica
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+from datetime import datetime
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+from database.maintenance import main as maintenance_main
+from models.data_models import Money
+from utils.date_utils import DateUtils
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def create_test_db(tmp):
+    db_manager = DatabaseManager(os.path.join(tmp, "rollup.db"))
+    ana = db_manager.add_client("Ana", "Calle Uno 100")
+    luis = db_manager.add_client("Luis", "Calle Dos 200")
+    db_manager.add_payments_bulk([
+        (ana, "100.10", 'pagado', '', '2024-01-05 10:00:00'),
+        (luis, "50.05", 'pagado', '', '2024-01-20 10:00:00'),
+        (ana, "75.00", 'pendiente', '', '2024-01-25 10:00:00'),
+        (luis, "20.00", 'pagado', '', '2024-03-01 00:00:00'),
+    ])
+    return db_manager
+
+def test_triggers_keep_rollup_consistent():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            totals = db_manager.get_monthly_payment_totals('2024-01', '2024-12')
+            assert [row['month'] for row in totals] == ['2024-01', '2024-03']
+            assert totals[0] == {'month': '2024-01', 'payment_count': 2, 'total_amount': Money(15015),
+                                 'pending_count': 1, 'pending_amount': Money(7500)}
+
+            conn = db_manager.get_connection()
+            conn.execute("UPDATE payments SET status = 'pagado' WHERE id = 3")
+            conn.execute("UPDATE payments SET payment_date = '2024-02-10 10:00:00' WHERE id = 2")
+            conn.execute("UPDATE payments SET amount_cents = 2500 WHERE id = 4")
+            conn.execute("DELETE FROM payments WHERE id = 1")
+            conn.commit()
+
+            totals = {row['month']: row for row in db_manager.get_monthly_payment_totals('2024-01', '2024-03')}
+            assert totals['2024-01']['total_amount'] == Money(7500)
+            assert totals['2024-01']['pending_count'] == 0
+            assert totals['2024-02']['total_amount'] == Money(5005)
+            assert totals['2024-03']['total_amount'] == Money(2500)
+            assert db_manager.get_monthly_payment_totals('2023-01', '2023-12') == []
+            assert db_manager.check_payments_rollup() == []
+            print("✅ Los triggers mantienen los totales mensuales")
+        finally:
+            db_manager.close()
+
+def test_checker_detects_and_rebuild_fixes_drift():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        db_path = db_manager.db_path
+        conn = db_manager.get_connection()
+        conn.execute("UPDATE payments_monthly_rollup SET amount_cents = 1 WHERE month = 202401")
+        conn.execute("DELETE FROM payments_monthly_rollup WHERE month = 202403")
+        conn.commit()
+        drift = db_manager.check_payments_rollup()
+        assert {(item['period'], item['field']) for item in drift} == {
+            ('2024-01 pagado', 'amount_cents'), ('2024-01 pendiente', 'amount_cents'),
+            ('2024-03 pagado', 'payment_count'), ('2024-03 pagado', 'amount_cents'),
+        }
+        db_manager.close()
+
+        assert maintenance_main(['check-rollup', '--db', db_path]) == 1
+        assert maintenance_main(['rebuild-rollup', '--db', db_path]) == 0
+        assert maintenance_main(['check-rollup', '--db', db_path]) == 0
+        print("✅ check-rollup detecta diferencias y rebuild-rollup las corrige")
+
+def test_last_n_months_spans_years():
+    months = DateUtils.get_last_n_months(120)
+    # El mes actual es el de SQLite (UTC), el mismo que usan el rollup y las estadísticas
+    sqlite_month = sqlite3.connect(':memory:').execute("SELECT strftime('%Y-%m', 'now')").fetchone()[0]
+    assert len(months) == 120 and months[-1] in (sqlite_month, datetime.utcnow().strftime('%Y-%m'))
+    keys = [DateUtils.parse_month_key(month) for month in months]
+    # Meses consecutivos y sin repetir, también al cruzar varios años
+    assert all(DateUtils.format_month_key(key) == month for key, month in zip(keys, months))
+    assert len(set(months)) == 120 and keys == sorted(keys)
+    assert all(b - a in (1, 89) for a, b in zip(keys, keys[1:]))
+    print("✅ get_last_n_months funciona con más de 12 meses")
+
+def test_monthly_payment_data_fills_missing_months():
+    from utils.helpers import ChartWidget
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "chart.db"))
+        controller = AppController(db_manager)
+        try:
+            client_id = db_manager.add_client("Ana", "Calle Uno 100")
+            db_manager.add_payment(client_id, "10.25")
+            data = controller.get_monthly_payment_data(120)
+            assert len(data) == 120
+            assert data[-1]['total_amount'] == Money(1025) and data[-1]['payment_count'] == 1
+            assert all(item['total_amount'] == Money(0) for item in data[:-1])
+
+            chart = ChartWidget()
+            chart.plot_payments_by_month(data)
+            chart.plot_payments_by_month(data[-12:])
+            print("✅ Datos mensuales completos y gráfica de 10 años")
+        finally:
+            controller.thread_pool.waitForDone()
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_triggers_keep_rollup_consistent()
+    test_checker_detects_and_rebuild_fixes_drift()
+    test_last_n_months_spans_years()
+    test_monthly_payment_data_fills_missing_months()
+    print("\n🎉 ¡Todos los tests de totales mensuales pasaron!")
@@ -0,0 +1,122 @@
+"""
+Test de la paginación por clave (keyset) de clientes, pagos y consumos
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from database.database_manager import DatabaseManager
+
+def collect_pages(fetch_page, page_size):
+    """Recorre todas las páginas y retorna las filas y el tamaño de cada página"""
+    rows, sizes, token = [], [], None
+    while True:
+        page, token = fetch_page(token, page_size)
+        rows.extend(page)
+        sizes.append(len(page))
+        if token is None:
+            return rows, sizes
+
+def test_client_pages_follow_name_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "pages.db"))
+        try:
+            # Nombres repetidos: el id desempata
+            db_manager.add_clients_bulk((f"Cliente {i % 7}", f"Calle {i}") for i in range(45))
+            rows, sizes = collect_pages(db_manager.get_clients_page, 10)
+            assert sizes == [10, 10, 10, 10, 5]
+            assert [(r['name'], r['id']) for r in rows] == \
+                sorted((r['name'], r['id']) for r in db_manager.get_all_clients())
+
+            # Una página exacta no deja un token hacia una página vacía
+            _, sizes = collect_pages(db_manager.get_clients_page, 15)
+            assert sizes == [15, 15, 15]
+            print("✅ Las páginas de clientes siguen el orden por nombre")
+        finally:
+            db_manager.close()
+
+def test_history_pages_handle_equal_dates():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "pages.db"))
+        try:
+            client_id = db_manager.add_client("Ana", "Calle Uno")
+            other_id = db_manager.add_client("Luis", "Calle Dos")
+            # Varios pagos por fecha para que los cortes de página caigan en empates
+            db_manager.add_payments_bulk(
+                (client_id, 100.0 + i, 'pagado', '', f"2024-{i // 4 % 12 + 1:02d}-01 10:00:00")
+                for i in range(50))
+            db_manager.add_payments_bulk((other_id, 1.0) for _ in range(5))
+            db_manager.add_consumption_bulk(
+                (client_id, 'normal', '', f"2023-{i // 3 % 12 + 1:02d}-15 08:00:00")
+                for i in range(23))
+
+            payments, sizes = collect_pages(
+                lambda token, size: db_manager.get_client_payments_page(client_id, token, size), 7)
+            assert sizes == [7] * 7 + [1]
+            assert len({p['id'] for p in payments}) == 50
+            assert [(p['payment_date'], -p['id']) for p in payments] == \
+                sorted(((p['payment_date'], -p['id']) for p in payments), reverse=True)
+            assert {p['client_id'] for p in payments} == {client_id}
+
+            consumption, _ = collect_pages(
+                lambda token, size: db_manager.get_client_consumption_page(client_id, token, size), 4)
+            assert sorted(c['id'] for c in consumption) == \
+                sorted(c['id'] for c in db_manager.get_client_consumption(client_id))
+            print("✅ Las páginas de historial no repiten ni pierden filas con fechas iguales")
+        finally:
+            db_manager.close()
+
+def test_profile_dialog_loads_pages_on_scroll():
+    from PyQt5.QtWidgets import QApplication, QTabWidget
+    from controllers.app_controller import AppController
+    from database.database_manager import PAGE_SIZE
+    from ui.client_dialogs import ClientProfileDialog
+    from test_async_queries import wait_until_idle
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "pages.db"))
+        controller = AppController(db_manager)
+        try:
+            client_id = db_manager.add_client("Ana", "Calle Uno")
+            db_manager.add_payments_bulk(
+                (client_id, 10.0, 'pagado', '', f"20{i // 12 + 10:02d}-{i % 12 + 1:02d}-05 09:00:00")
+                for i in range(PAGE_SIZE * 2 + 30))
+            db_manager.add_water_consumption(client_id)
+
+            dialog = ClientProfileDialog(client_id, None, controller)
+            dialog.show()
+            wait_until_idle(controller)
+            app.processEvents()
+            wait_until_idle(controller)
+            assert dialog.payments_table.rowCount() == PAGE_SIZE
+            assert dialog.consumption_table.rowCount() == 1
+            assert dialog.payments_table.item(0, 2).text() == "2029-02-05 09:00:00"
+
+            # Desplazarse hasta el final pide las páginas siguientes
+            dialog.findChild(QTabWidget).setCurrentIndex(1)
+            app.processEvents()
+            for expected in (PAGE_SIZE * 2, PAGE_SIZE * 2 + 30):
+                scroll_bar = dialog.payments_table.verticalScrollBar()
+                scroll_bar.setValue(scroll_bar.maximum())
+                wait_until_idle(controller)
+                app.processEvents()
+                assert dialog.payments_table.rowCount() == expected
+            assert dialog.next_pages['payments'] is None
+            assert dialog.payments_table.item(PAGE_SIZE * 2 + 29, 2).text() == "2010-01-05 09:00:00"
+            dialog.reject()
+            print("✅ El perfil carga más pagos al desplazarse")
+        finally:
+            controller.thread_pool.waitForDone()
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_client_pages_follow_name_order()
+    test_history_pages_handle_equal_dates()
+    test_profile_dialog_loads_pages_on_scroll()
+    print("\n🎉 ¡Todas las pruebas de paginación pasaron!")
@@ -0,0 +1,189 @@
+"""
+Test de la caché de consultas (QueryCache) y su invalidación por señales del controlador
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from controllers.app_controller import AppController
+from database.database_manager import DatabaseManager
+from utils.query_cache import QueryCache, estimate_size
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def counting_loader(value):
+    calls = []
+
+    def load():
+        calls.append(value)
+        return value
+    return load, calls
+
+def test_lru_ttl_and_memory_cap():
+    clock = FakeClock()
+    cache = QueryCache(max_entries=2, max_bytes=10_000, ttl=5, clock=clock)
+    load, calls = counting_loader([1, 2, 3])
+    assert cache.get_or_load('a', load) == [1, 2, 3]
+    assert cache.get_or_load('a', load) == [1, 2, 3]
+    assert len(calls) == 1
+
+    # LRU: 'a' se usó después de 'b', así que al agregar 'c' sale 'b'
+    cache.get_or_load('b', lambda: 'b')
+    cache.get_or_load('a', load)
+    cache.get_or_load('c', lambda: 'c')
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+
+    # TTL
+    clock.now = 10
+    assert 'a' not in cache
+    cache.get_or_load('a', load)
+    assert len(calls) == 2
+
+    # Un valor más grande que el límite se sirve pero no se guarda
+    big = [str(i) * 50 for i in range(200)]
+    assert estimate_size(big) > 10_000
+    assert cache.get_or_load('big', lambda: big) is big
+    assert 'big' not in cache
+
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 5
+    assert stats['evictions'] == 1 and stats['expirations'] == 1
+    assert stats['entries'] == len(cache) and stats['bytes'] > 0
+    print("✅ Desalojo LRU, expiración por TTL y límite de memoria")
+
+def test_tag_invalidation_and_errors():
+    cache = QueryCache()
+    cache.get_or_load(('client_payments', 1), lambda: [1], [('client', 1)])
+    cache.get_or_load(('client_payments', 2), lambda: [2], [('client', 2)])
+    cache.get_or_load(('statistics',), lambda: {}, ['statistics'])
+    assert cache.invalidate(('client', 1)) == 1
+    assert ('client_payments', 2) in cache and ('statistics',) in cache
+
+    def failing():
+        raise RuntimeError("sin conexión")
+    try:
+        cache.get_or_load('x', failing, ['statistics'])
+    except RuntimeError:
+        pass
+    assert 'x' not in cache
+
+    # Una carga en curso cuando se invalida su etiqueta no se guarda
+    def invalidated_while_loading():
+        cache.invalidate('clients')
+        return 'viejo'
+    assert cache.get_or_load('clients', invalidated_while_loading, ['clients']) == 'viejo'
+    assert 'clients' not in cache
+
+    def cleared_while_loading():
+        cache.clear()
+        return 'viejo'
+    assert cache.get_or_load('nuevo', cleared_while_loading, ['nueva']) == 'viejo'
+    assert 'nuevo' not in cache and len(cache) == 0
+
+    # replace solo cambia la entrada si todavía guarda el valor esperado
+    old = cache.get_or_load(('statistics',), lambda: {'total_clients': 1}, ['statistics'])
+    assert cache.replace(('statistics',), old, {'total_clients': 2})
+    assert not cache.replace(('statistics',), old, {'total_clients': 3})
+    assert cache.get_or_load(('statistics',), dict, ['statistics']) == {'total_clients': 2}
+    cache.invalidate('statistics')
+    assert not cache.replace(('statistics',), old, {}) and len(cache) == 0
+    print("✅ Invalidación por etiquetas, sin guardar errores ni cargas obsoletas")
+
+def wait_for_workers(controller):
+    """Espera las consultas en segundo plano y entrega sus resultados"""
+    controller.thread_pool.waitForDone()
+    app.processEvents()
+
+def test_controller_signals_invalidate_affected_entries():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "cache.db"))
+        controller = AppController(db_manager)
+        try:
+            ana, _ = controller.add_client("Ana García", "Calle Uno 100")
+            luis, _ = controller.add_client("Luis Pérez", "Calle Dos 200")
+            payment_id, _ = controller.add_payment(ana, "100.00", 'pendiente')
+
+            controller.load_statistics_async()  # Como el dashboard: las escrituras la releen
+            wait_for_workers(controller)
+            controller.get_clients_with_status()
+            controller.get_client_payments(ana)
+            controller.get_client_payments(luis)
+            controller.get_client(luis)
+            before = controller.get_cache_stats()
+            controller.get_statistics()
+            controller.get_client_payments(ana)
+            assert controller.get_cache_stats()['hits'] == before['hits'] + 2
+
+            # Un pago solo descarta las entradas del cliente: la lista completa
+            # se corrige por fila y las estadísticas se descartan y se releen
+            assert controller.update_payment_status(payment_id, 'pagado')[0]
+            wait_for_workers(controller)
+            cache = controller.query_cache
+            assert ('client_payments', luis) in cache and ('client', luis) in cache
+            assert ('client_payments', ana) not in cache
+            assert ('statistics',) in cache and ('clients_with_status',) in cache
+            assert controller.get_client_payments(ana)[0]['status'] == 'pagado'
+            assert controller.get_statistics()['clients_with_debt'] == 0
+            clients = controller.get_clients_with_status()
+            assert [client.payment_status for client in clients if client.id == ana] == ['pagado']
+            assert controller.get_clients_with_status() is clients
+            assert controller.update_payment_status(9999, 'pagado')[0] is False
+
+            controller.add_water_consumption(luis, 'exceso')
+            wait_for_workers(controller)
+            assert ('client', luis) not in cache and ('client_payments', ana) in cache
+            assert controller.get_statistics()['excess_consumption'] == 1
+
+            controller.update_client(luis, "Luis Pérez", "Calle Tres 300", 'activo')
+            assert controller.get_client(luis)['address'] == "Calle Tres 300"
+
+            # Las inserciones masivas vacían toda la caché
+            controller.add_payments_bulk([(luis, "50.00")])
+            assert len(cache) == 0
+            assert controller.get_statistics()['total_clients'] == 2
+            print("✅ Las señales del controlador invalidan solo lo afectado")
+        finally:
+            controller.thread_pool.waitForDone()
+            db_manager.close()
+
+def test_synchronous_statistics_after_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "sync.db"))
+        controller = AppController(db_manager)
+        try:
+            ana, _ = controller.add_client("Ana García", "Calle Uno 100")
+            assert controller.get_statistics()['clients_with_debt'] == 0
+
+            # Sin cargas en segundo plano, la lectura directa no queda vieja
+            payment_id, _ = controller.add_payment(ana, "100.00", 'pendiente')
+            assert controller.get_statistics() == db_manager.get_statistics()
+            assert controller.get_statistics()['clients_with_debt'] == 1
+            controller.update_payment_status(payment_id, 'pagado')
+            assert controller.get_statistics()['payments_this_month'] == 1
+            controller.add_water_consumption(ana, 'exceso')
+            assert controller.get_statistics() == db_manager.get_statistics()
+            assert controller.get_statistics()['excess_consumption'] == 1
+            print("✅ get_statistics no queda vieja tras pagos y consumos")
+        finally:
+            controller.thread_pool.waitForDone()
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_lru_ttl_and_memory_cap()
+    test_tag_invalidation_and_errors()
+    test_controller_signals_invalidate_affected_entries()
+    test_synchronous_statistics_after_writes()
+    print("\n🎉 ¡Todos los tests de la caché de consultas pasaron!")
@@ -0,0 +1,126 @@
+"""
+Test de planes de consulta (EXPLAIN QUERY PLAN) para las consultas frecuentes.
+Falla si alguna consulta vuelve a recorrer completa una tabla grande.
+"""
+
+import sys
+import os
+import re
+import tempfile
+from datetime import date
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+# Tablas que crecen sin límite y nunca deben recorrerse completas
+LARGE_TABLES = ('payments', 'water_consumption')
+
+def capture_queries(db_manager, call):
+    """Ejecuta una llamada y retorna las consultas SQL que realizó"""
+    statements = []
+    conn = db_manager.get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+    return [s for s in statements
+            if s.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH'))]
+
+def query_plan(db_manager, sql):
+    """Obtiene el plan de ejecución de una consulta como lista de textos"""
+    conn = db_manager.get_connection()
+    # Versiones anteriores de Python no expanden los parámetros en el trace
+    params = [None] * sql.count('?')
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+def full_scans(plan):
+    """Retorna los pasos del plan que recorren completa una tabla grande"""
+    pattern = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+    scans = []
+    for step in plan:
+        match = pattern.match(step.strip())
+        if match and match.group(1) in LARGE_TABLES:
+            scans.append(step)
+    return scans
+
+def create_test_db(tmp):
+    db_manager = DatabaseManager(os.path.join(tmp, "plans.db"))
+    for i in range(20):
+        client_id = db_manager.add_client(f"Cliente {i}", f"Calle {i} #123")
+        db_manager.add_payment(client_id, 100.0, 'pagado' if i % 2 else 'pendiente')
+        db_manager.add_water_consumption(client_id, 'exceso' if i % 3 else 'normal')
+    return db_manager
+
+def check_calls(calls, require_search=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            for name, call in calls(db_manager):
+                queries = capture_queries(db_manager, call)
+                assert queries, f"{name} no ejecutó consultas"
+                for sql in queries:
+                    plan = query_plan(db_manager, sql)
+                    scans = full_scans(plan)
+                    assert not scans, f"{name} recorre la tabla completa: {scans}\n{sql}"
+                    if require_search and any(t in sql for t in LARGE_TABLES):
+                        assert any(step.startswith('SEARCH') for step in plan), \
+                            f"{name} no usa búsqueda por índice: {plan}"
+                        assert not any('TEMP B-TREE FOR ORDER BY' in step for step in plan), \
+                            f"{name} ordena en memoria: {plan}"
+                print(f"✅ {name}: sin recorridos completos")
+        finally:
+            db_manager.close()
+
+def test_per_client_queries_use_indexes():
+    check_calls(lambda db: [
+        ('get_client_payments', lambda: db.get_client_payments(1)),
+        ('get_client_consumption', lambda: db.get_client_consumption(1)),
+        ('get_client_payments_page', lambda: db.get_client_payments_page(1, ('2024-03-15 10:00:00', 1))),
+        ('get_client_consumption_page', lambda: db.get_client_consumption_page(1, ('2024-03-15 10:00:00', 1))),
+    ], require_search=True)
+
+def test_delete_client_payment_check_uses_index():
+    check_calls(lambda db: [
+        ('delete_client', lambda: db.delete_client(1)),
+    ])
+
+def test_dashboard_queries_avoid_table_scans():
+    check_calls(lambda db: [
+        ('get_clients_with_payment_status', db.get_clients_with_payment_status),
+    ])
+
+def test_date_range_queries_use_indexes():
+    check_calls(lambda db: [
+        ('get_payments_by_date', lambda: db.get_payments_by_date('2024-03-15')),
+        ('get_payments_by_month', lambda: db.get_payments_by_month(2024, 3)),
+        ('get_payments_by_week', lambda: db.get_payments_by_week(date(2024, 3, 13))),
+        ('get_payment_calendar', lambda: db.get_payment_calendar(2024, 3)),
+        ('get_payments_between', lambda: db.get_payments_between('2024-01-01', '2024-02-01')),
+        ('get_statistics', db.get_statistics),
+    ], require_search=True)
+
+def test_indexes_are_migrated():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            conn = db_manager.get_connection()
+            names = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")}
+            for index in ('idx_payments_client_date', 'idx_consumption_client_date',
+                          'idx_payments_status_date'):
+                assert index in names, f"Falta el índice {index}"
+            assert db_manager.get_schema_version() >= 1
+            print("✅ Índices creados por migración")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_per_client_queries_use_indexes()
+    test_delete_client_payment_check_uses_index()
+    test_dashboard_queries_avoid_table_scans()
+    test_date_range_queries_use_indexes()
+    test_indexes_are_migrated()
+    print("\n🎉 ¡Todos los planes de consulta usan índices!")
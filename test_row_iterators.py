@@ -0,0 +1,72 @@
+"""
+Test de los iteradores de filas en streaming de DatabaseManager
+"""
+
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+from models.data_models import Client, Payment
+
+def create_test_db(tmp):
+    db_manager = DatabaseManager(os.path.join(tmp, "iter.db"))
+    ids = db_manager.add_clients_bulk((f"Cliente {i}", f"Calle {i}") for i in range(25))
+    db_manager.add_payments_bulk(
+        (ids[i % 25], 10.0 + i, 'pagado' if i % 3 else 'pendiente', f"nota {i}",
+         f"2024-{i % 12 + 1:02d}-10 12:00:00")
+        for i in range(120))
+    return db_manager
+
+def test_formats_match_query_methods():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            expected = {c['id']: c for c in db_manager.get_all_clients()}
+            as_dicts = list(db_manager.iter_clients(batch_size=7))
+            assert [c['id'] for c in as_dicts] == sorted(expected)
+            for client in as_dicts:
+                assert client == {key: expected[client['id']][key] for key in client}
+
+            as_tuples = list(db_manager.iter_clients('tuple'))
+            as_models = list(db_manager.iter_clients('model'))
+            assert all(isinstance(c, Client) for c in as_models)
+            assert [tuple(c.values()) for c in as_dicts] == as_tuples
+            assert [c.to_dict() for c in as_models] == as_dicts
+            print("✅ Los formatos dict, tuple y model coinciden")
+        finally:
+            db_manager.close()
+
+def test_payment_filters_and_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = create_test_db(tmp)
+        try:
+            payments = list(db_manager.iter_payments(row_format='model', batch_size=16))
+            assert len(payments) == 120 and all(isinstance(p, Payment) for p in payments)
+            dates = [p.payment_date for p in payments]
+            assert dates == sorted(dates)
+
+            march = list(db_manager.iter_payments(start='2024-03-01', end='2024-04-01'))
+            assert len(march) == 10
+            assert all(p['payment_date'].startswith('2024-03') for p in march)
+
+            client_payments = list(db_manager.iter_payments(client_id=1, row_format='tuple'))
+            assert sorted(p[0] for p in client_payments) == \
+                sorted(p['id'] for p in db_manager.get_client_payments(1))
+
+            try:
+                list(db_manager.iter_payments(row_format='xml'))
+                assert False, "Debió rechazar el formato"
+            except ValueError:
+                pass
+            print("✅ iter_payments filtra por cliente y fecha en orden cronológico")
+        finally:
+            db_manager.close()
+
+if __name__ == "__main__":
+    test_formats_match_query_methods()
+    test_payment_filters_and_order()
+    print("\n🎉 ¡Todos los tests de iteradores pasaron!")
@@ -0,0 +1,81 @@
+"""
+Test del índice de búsqueda de clientes en memoria
+"""
+
+import sys
+import os
+import random
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.search_index import ClientSearchIndex, fold_text
+
+NAMES = ["José Peña", "María Núñez", "Ángel Ruiz", "Lucía Gómez", "Raúl Ortiz", "Ana López"]
+STREETS = ["Av. Juárez", "Calle Hidalgo", "Privada Álamos", "Callejón del Sol"]
+
+def make_clients(count, seed=7):
+    rng = random.Random(seed)
+    return [(i, f"{rng.choice(NAMES)} {i}", f"{rng.choice(STREETS)} #{rng.randint(1, 999)}")
+            for i in range(1, count + 1)]
+
+def brute_force(clients, term):
+    query = fold_text(term).strip()
+    return {client_id for client_id, name, address in clients
+            if query in fold_text(name) or query in fold_text(address) or query in str(client_id)}
+
+def test_fold_text():
+    assert fold_text("José PEÑA") == "jose pena"
+    assert fold_text("Ángel Núñez Álamos") == "angel nunez alamos"
+    assert fold_text(None) == ""
+    print("✅ Normalización sin acentos ni mayúsculas")
+
+def test_search_matches_full_scan_while_typing():
+    clients = make_clients(2000)
+    index = ClientSearchIndex()
+    index.rebuild(clients)
+    assert len(index) == 2000
+
+    for word in ("juarez", "Peña 1", "calle h", "NUÑEZ", "#12", "17", "zzz"):
+        for end in range(1, len(word) + 1):
+            term = word[:end]
+            assert index.search(term) == brute_force(clients, term), term
+        # Borrar caracteres no debe reutilizar un resultado más estrecho
+        for end in range(len(word) - 1, 0, -1):
+            term = word[:end]
+            assert index.search(term) == brute_force(clients, term), term
+    assert index.search("   ") == set(range(1, 2001))
+    print("✅ Las búsquedas coinciden con un recorrido completo")
+
+def test_incremental_updates():
+    clients = make_clients(50)
+    index = ClientSearchIndex()
+    index.rebuild(clients)
+
+    assert 51 not in index.search("zacatecas")
+    index.add(51, "Nuevo Cliente", "Calle Zacatecas 1")
+    assert index.search("zacatecas") == {51}
+
+    index.update(51, "Nuevo Cliente", "Calle Morelos 2")
+    assert index.search("zacatecas") == set()
+    assert index.search("morelos") == {51}
+
+    index.remove(51)
+    assert index.search("morelos") == set() and 51 not in index
+
+    # Muchos cambios compactan las listas sin alterar los resultados
+    current = dict((client_id, (name, address)) for client_id, name, address in clients)
+    for step in range(3000):
+        client_id = step % 50 + 1
+        current[client_id] = (f"Cliente {step}", f"Calle {step % 7}")
+        index.update(client_id, *current[client_id])
+    expected = [(client_id, name, address) for client_id, (name, address) in current.items()]
+    for term in ("cliente 29", "calle 3", "2999"):
+        assert index.search(term) == brute_force(expected, term)
+    print("✅ Altas, cambios y bajas sin reconstruir el índice")
+
+if __name__ == "__main__":
+    test_fold_text()
+    test_search_matches_full_scan_while_typing()
+    test_incremental_updates()
+    print("\n🎉 ¡Todos los tests del índice de búsqueda pasaron!")
@@ -3,24 +3,25 @@ Sistema de Gestión de Pago de Agua
 Módulo: Diálogos para Gestión de Clientes
 """
 
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
+from PyQt5.QtWidgets import (QWidget, QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                             QLabel, QLineEdit, QPushButton, QComboBox, 
                             QTextEdit, QMessageBox, QGroupBox, QTabWidget,
                             QTableWidget, QTableWidgetItem, QHeaderView,
                             QSpinBox, QDoubleSpinBox, QDateEdit, QCheckBox)
 from PyQt5.QtCore import Qt, QDate, pyqtSignal
 from PyQt5.QtGui import QFont
-from database.database_manager import DatabaseManager
+from models.data_models import Money
+from controllers.app_controller import AppController
 from styles.app_styles import MAIN_STYLE
 
 class ClientDialog(QDialog):
     """Diálogo para agregar/editar clientes"""
     client_saved = pyqtSignal()
     
-    def __init__(self, client_id=None, parent=None):
+    def __init__(self, client_id=None, parent=None, controller=None):
         super().__init__(parent)
         self.client_id = client_id
-        self.db_manager = DatabaseManager()
+        self.controller = controller or AppController()
         self.is_edit_mode = client_id is not None
         self.init_ui()
         self.setStyleSheet(MAIN_STYLE)
@@ -88,7 +89,7 @@ class ClientDialog(QDialog):
     def load_client_data(self):
         """Carga los datos del cliente para edición"""
         try:
-            client = self.db_manager.get_client(self.client_id)
+            client = self.controller.get_client(self.client_id)
             if client:
                 self.id_label.setText(str(client['id']))
                 self.name_input.setText(client['name'])
@@ -125,34 +126,48 @@ class ClientDialog(QDialog):
         try:
             if self.is_edit_mode:
                 # Actualizar cliente existente
-                success = self.db_manager.update_client(self.client_id, name, address, status)
+                success, message = self.controller.update_client(self.client_id, name, address, status)
                 if success:
                     QMessageBox.information(self, "Éxito", "Cliente actualizado correctamente")
                     self.client_saved.emit()
                     self.accept()
                 else:
-                    QMessageBox.critical(self, "Error", "No se pudo actualizar el cliente")
+                    QMessageBox.critical(self, "Error", message)
             else:
                 # Agregar nuevo cliente
-                client_id = self.db_manager.add_client(name, address)
+                client_id, message = self.controller.add_client(name, address)
                 if client_id:
                     QMessageBox.information(self, "Éxito", 
                                           f"Cliente agregado correctamente con ID: {client_id}")
                     self.client_saved.emit()
                     self.accept()
                 else:
-                    QMessageBox.critical(self, "Error", "No se pudo agregar el cliente")
+                    QMessageBox.critical(self, "Error", message)
         
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al guardar: {str(e)}")
 
 class ClientProfileDialog(QDialog):
-    """Diálogo para mostrar el perfil completo del cliente"""
+    """Diálogo para mostrar el perfil completo del cliente
     
-    def __init__(self, client_id, parent=None):
+    Los historiales de pagos y consumo se cargan por páginas: la siguiente
+    se pide cuando el usuario se acerca al final de la tabla.
+    """
+    
+    # Filas antes del final de la tabla a partir de las cuales se pide otra página
+    PREFETCH_ROWS = 20
+    
+    def __init__(self, client_id, parent=None, controller=None):
         super().__init__(parent)
         self.client_id = client_id
-        self.db_manager = DatabaseManager()
+        self.controller = controller or AppController()
+        # Clave propia para que cada diálogo reciba solo sus resultados
+        self.query_key = f"client_profile:{id(self)}"
+        # Token de la siguiente página de cada historial y páginas en curso
+        self.next_pages = {'payments': None, 'consumption': None}
+        self.pages_loading = set()
+        self.controller.query_finished.connect(self.on_query_finished)
+        self.controller.query_failed.connect(self.on_query_failed)
         self.init_ui()
         self.setStyleSheet(MAIN_STYLE)
         self.load_client_data()
@@ -253,6 +268,9 @@ class ClientProfileDialog(QDialog):
         self.payments_table.setAlternatingRowColors(True)
         self.payments_table.setSelectionBehavior(QTableWidget.SelectRows)
         
+        self.payments_table.verticalScrollBar().valueChanged.connect(
+            lambda _value: self.load_more_if_needed('payments'))
+        
         layout.addWidget(QLabel("Historial de Pagos"))
         layout.addWidget(self.payments_table)
         
@@ -279,6 +297,9 @@ class ClientProfileDialog(QDialog):
         self.consumption_table.setAlternatingRowColors(True)
         self.consumption_table.setSelectionBehavior(QTableWidget.SelectRows)
         
+        self.consumption_table.verticalScrollBar().valueChanged.connect(
+            lambda _value: self.load_more_if_needed('consumption'))
+        
         layout.addWidget(QLabel("Historial de Consumo"))
         layout.addWidget(self.consumption_table)
         
@@ -286,37 +307,92 @@ class ClientProfileDialog(QDialog):
         tabs.addTab(consumption_tab, "Consumo")
     
     def load_client_data(self):
-        """Carga todos los datos del cliente"""
-        try:
-            # Cargar información básica
-            client = self.db_manager.get_client(self.client_id)
-            if client:
-                self.id_label.setText(str(client['id']))
-                self.name_label.setText(client['name'])
-                self.address_label.setText(client['address'])
-                self.status_label.setText(client['status'].title())
-                self.created_label.setText(client['created_at'][:19] if client['created_at'] else 'N/A')
-                
-                # Actualizar título de la ventana
-                self.setWindowTitle(f"Perfil del Cliente - {client['name']}")
-            
-            # Cargar pagos
-            self.load_payments()
-            
-            # Cargar consumo
-            self.load_consumption()
+        """Solicita los datos del cliente y la primera página de sus historiales (en segundo plano)"""
+        self.setWindowTitle("Perfil del Cliente - Cargando...")
+        for kind in self.next_pages:
+            self.controller.cancel_query(f"{self.query_key}:{kind}")
+        self.pages_loading.clear()
+        self.controller.run_async(self.query_key, self.controller.get_client_profile, self.client_id)
+    
+    def history_table(self, kind):
+        return self.payments_table if kind == 'payments' else self.consumption_table
+    
+    def load_more_if_needed(self, kind):
+        """Pide la siguiente página si la tabla está cerca del final (o no llena la vista)"""
+        if self.next_pages[kind] is None or kind in self.pages_loading:
+            return
+        
+        # rowAt retorna -1 si la última fila queda por encima del borde inferior
+        table = self.history_table(kind)
+        last_visible = table.rowAt(table.viewport().height() - 1)
+        if 0 <= last_visible < table.rowCount() - self.PREFETCH_ROWS:
+            return
+        
+        self.pages_loading.add(kind)
+        fetch_page = (self.controller.get_client_payments_page if kind == 'payments'
+                      else self.controller.get_client_consumption_page)
+        self.controller.run_async(f"{self.query_key}:{kind}", fetch_page,
+                                  self.client_id, self.next_pages[kind])
+    
+    def on_query_finished(self, key, result):
+        """Muestra los datos del cliente o agrega una página de historial"""
+        if key == self.query_key:
+            self.show_profile(result)
+            return
+        
+        for kind in self.next_pages:
+            if key == f"{self.query_key}:{kind}":
+                rows, self.next_pages[kind] = result
+                self.pages_loading.discard(kind)
+                if kind == 'payments':
+                    self.show_payments(rows, append=True)
+                else:
+                    self.show_consumption(rows, append=True)
+                self.load_more_if_needed(kind)
+                return
+    
+    def show_profile(self, profile):
+        """Muestra la información del cliente y la primera página de sus historiales"""
+        client = profile['client']
+        if client:
+            self.id_label.setText(str(client['id']))
+            self.name_label.setText(client['name'])
+            self.address_label.setText(client['address'])
+            self.status_label.setText(client['status'].title())
+            self.created_label.setText(client['created_at'][:19] if client['created_at'] else 'N/A')
             
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al cargar datos: {str(e)}")
+            # Actualizar título de la ventana
+            self.setWindowTitle(f"Perfil del Cliente - {client['name']}")
+        
+        self.next_pages['payments'] = profile['payments_next']
+        self.next_pages['consumption'] = profile['consumption_next']
+        self.show_payments(profile['payments'])
+        self.show_consumption(profile['consumption'])
+        for kind in self.next_pages:
+            self.load_more_if_needed(kind)
+    
+    def on_query_failed(self, key, message):
+        if key.startswith(self.query_key):
+            self.pages_loading.clear()
+            QMessageBox.critical(self, "Error", f"Error al cargar datos: {message}")
     
-    def load_payments(self):
-        """Carga el historial de pagos"""
+    def done(self, result):
+        """Cancela las consultas pendientes al cerrar el diálogo"""
+        self.controller.cancel_query(self.query_key)
+        for kind in self.next_pages:
+            self.controller.cancel_query(f"{self.query_key}:{kind}")
+        self.next_pages = dict.fromkeys(self.next_pages)
+        self.controller.query_finished.disconnect(self.on_query_finished)
+        self.controller.query_failed.disconnect(self.on_query_failed)
+        super().done(result)
+    
+    def show_payments(self, payments, append=False):
+        """Muestra el historial de pagos (append agrega una página al final)"""
         try:
-            payments = self.db_manager.get_client_payments(self.client_id)
-            
-            self.payments_table.setRowCount(len(payments))
+            first_row = self.payments_table.rowCount() if append else 0
+            self.payments_table.setRowCount(first_row + len(payments))
             
-            for row, payment in enumerate(payments):
+            for row, payment in enumerate(payments, start=first_row):
                 # ID
                 id_item = QTableWidgetItem(str(payment['id']))
                 id_item.setTextAlignment(Qt.AlignCenter)
@@ -346,14 +422,13 @@ class ClientProfileDialog(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "Advertencia", f"Error al cargar pagos: {str(e)}")
     
-    def load_consumption(self):
-        """Carga el historial de consumo"""
+    def show_consumption(self, consumption, append=False):
+        """Muestra el historial de consumo (append agrega una página al final)"""
         try:
-            consumption = self.db_manager.get_client_consumption(self.client_id)
-            
-            self.consumption_table.setRowCount(len(consumption))
+            first_row = self.consumption_table.rowCount() if append else 0
+            self.consumption_table.setRowCount(first_row + len(consumption))
             
-            for row, record in enumerate(consumption):
+            for row, record in enumerate(consumption, start=first_row):
                 # ID
                 id_item = QTableWidgetItem(str(record['id']))
                 id_item.setTextAlignment(Qt.AlignCenter)
@@ -380,30 +455,30 @@ class ClientProfileDialog(QDialog):
     
     def edit_client(self):
         """Abre el diálogo de edición del cliente"""
-        dialog = ClientDialog(self.client_id, self)
+        dialog = ClientDialog(self.client_id, self, self.controller)
         dialog.client_saved.connect(self.load_client_data)
         dialog.exec_()
     
     def add_payment(self):
         """Abre el diálogo para agregar un pago"""
-        dialog = PaymentDialog(self.client_id, self)
-        dialog.payment_saved.connect(self.load_payments)
+        dialog = PaymentDialog(self.client_id, self, self.controller)
+        dialog.payment_saved.connect(self.load_client_data)
         dialog.exec_()
     
     def add_consumption(self):
         """Abre el diálogo para registrar consumo"""
-        dialog = ConsumptionDialog(self.client_id, self)
-        dialog.consumption_saved.connect(self.load_consumption)
+        dialog = ConsumptionDialog(self.client_id, self, self.controller)
+        dialog.consumption_saved.connect(self.load_client_data)
         dialog.exec_()
 
 class PaymentDialog(QDialog):
     """Diálogo para registrar pagos"""
     payment_saved = pyqtSignal()
     
-    def __init__(self, client_id, parent=None):
+    def __init__(self, client_id, parent=None, controller=None):
         super().__init__(parent)
         self.client_id = client_id
-        self.db_manager = DatabaseManager()
+        self.controller = controller or AppController()
         self.init_ui()
         self.setStyleSheet(MAIN_STYLE)
     
@@ -458,22 +533,22 @@ class PaymentDialog(QDialog):
     
     def save_payment(self):
         """Guarda el pago en la base de datos"""
-        amount = self.amount_input.value()
+        amount = Money.from_value(self.amount_input.value())
         status = self.status_combo.currentText()
         notes = self.notes_input.toPlainText().strip()
         
-        if amount <= 0:
+        if amount.cents <= 0:
             QMessageBox.warning(self, "Error", "El monto debe ser mayor a cero")
             return
         
         try:
-            payment_id = self.db_manager.add_payment(self.client_id, amount, status, notes)
+            payment_id, message = self.controller.add_payment(self.client_id, amount, status, notes)
             if payment_id:
                 QMessageBox.information(self, "Éxito", "Pago registrado correctamente")
                 self.payment_saved.emit()
                 self.accept()
             else:
-                QMessageBox.critical(self, "Error", "No se pudo registrar el pago")
+                QMessageBox.critical(self, "Error", message)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al guardar: {str(e)}")
 
@@ -481,10 +556,10 @@ class ConsumptionDialog(QDialog):
     """Diálogo para registrar consumo de agua"""
     consumption_saved = pyqtSignal()
     
-    def __init__(self, client_id, parent=None):
+    def __init__(self, client_id, parent=None, controller=None):
         super().__init__(parent)
         self.client_id = client_id
-        self.db_manager = DatabaseManager()
+        self.controller = controller or AppController()
         self.init_ui()
         self.setStyleSheet(MAIN_STYLE)
     
@@ -536,7 +611,7 @@ class ConsumptionDialog(QDialog):
         notes = self.notes_input.toPlainText().strip()
         
         try:
-            consumption_id = self.db_manager.add_water_consumption(
+            consumption_id, message = self.controller.add_water_consumption(
                 self.client_id, consumption_type, notes
             )
             if consumption_id:
@@ -544,6 +619,6 @@ class ConsumptionDialog(QDialog):
                 self.consumption_saved.emit()
                 self.accept()
             else:
-                QMessageBox.critical(self, "Error", "No se pudo registrar el consumo")
+                QMessageBox.critical(self, "Error", message)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al guardar: {str(e)}")
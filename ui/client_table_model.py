@@ -0,0 +1,315 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Modelo de Tabla de Clientes
+"""
+
+from array import array
+from bisect import bisect
+from typing import Dict, Iterable, List, Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from models.data_models import ClientWithStatus, ClientStatusTable, CLIENT_STATUS_FILTERS
+from utils.search_index import ClientSearchIndex
+
+class ClientTableModel(QAbstractTableModel):
+    """Modelo virtual de la tabla de clientes del dashboard
+
+    Guarda los datos por columnas (un arreglo por campo) y la vista solo
+    pide el texto de las filas visibles. Filtrar y ordenar reordenan una
+    lista de índices; nunca se crean objetos por celda. La búsqueda usa un
+    ClientSearchIndex: el del controlador (que lo mantiene al día) o uno
+    propio que se reconstruye en cada carga. update_client y remove_client
+    cambian una sola fila sin recargar la tabla.
+    """
+
+    HEADERS = ["ID", "Nombre", "Dirección", "Estado", "Estado de Pago"]
+    CENTERED_COLUMNS = (0, 3, 4)
+
+    def __init__(self, parent=None, search_index: Optional[ClientSearchIndex] = None):
+        super().__init__(parent)
+        self._owns_index = search_index is None
+        self.search_index = search_index if search_index is not None else ClientSearchIndex()
+        self._ids = array('q')
+        self._names: List[str] = []
+        self._addresses: List[str] = []
+        self._statuses: List[str] = []
+        self._payment_statuses: List[str] = []
+        self._consumption_statuses: List[str] = []
+        self._labels: List[str] = []
+        self._positions: Dict[int, int] = {}
+        self._sort_keys: Dict[int, list] = {}
+        # Posiciones de clientes eliminados (sus columnas se limpian en la siguiente carga)
+        self._removed = set()
+
+        # Índices (posiciones en las columnas) de las filas visibles, en orden
+        self._visible: List[int] = []
+        self._search_text = ""
+        self._status_filter = "Todos"
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    # Carga de datos
+    def set_clients(self, clients: Iterable[ClientWithStatus]):
+        """Reemplaza los datos conservando el filtro y el orden actuales
+
+        Con un ClientStatusTable se copian sus columnas directamente.
+        """
+        if not isinstance(clients, ClientStatusTable):
+            clients = ClientStatusTable(clients)
+
+        self.beginResetModel()
+        self._ids = array('q', clients.ids)
+        self._names = list(clients.names)
+        self._addresses = list(clients.addresses)
+        self._payment_statuses = clients.status_column('payment_status')
+        self._consumption_statuses = clients.status_column('consumption_status')
+        self._sort_keys = {}
+
+        # Los textos repetidos (estado, etiqueta) se comparten entre filas
+        titles = {}
+        self._statuses = [titles.get(status) or titles.setdefault(status, status.title())
+                          for status in clients.status_column('status')]
+        labels: Dict[tuple, str] = {}
+        for state in zip(self._payment_statuses, self._consumption_statuses):
+            if state not in labels:
+                client = ClientWithStatus(0, "", "", "", *state)
+                labels[state] = f"{client.get_status_icon()} {client.get_status_text()}"
+        self._labels = [labels[state] for state in zip(self._payment_statuses, self._consumption_statuses)]
+
+        self._positions = {client_id: position for position, client_id in enumerate(self._ids)}
+        self._removed = set()
+        if self._owns_index:
+            self.search_index.rebuild(zip(self._ids, self._names, self._addresses))
+        self._visible = self._filtered_rows()
+        self._sort_visible()
+        self.endResetModel()
+
+    def set_filter(self, search_text: str = "", status_filter: str = "Todos"):
+        """Aplica la búsqueda y el filtro de estado sin recargar los datos"""
+        self.beginResetModel()
+        self._search_text = search_text
+        self._status_filter = status_filter
+        self._visible = self._filtered_rows()
+        self._sort_visible()
+        self.endResetModel()
+
+    def _filtered_rows(self) -> List[int]:
+        rows = range(len(self._ids))
+        if self._removed:
+            rows = [i for i in rows if i not in self._removed]
+        if self._search_text.strip():
+            # Solo se recorren las filas que encontró el índice
+            positions = self._positions
+            rows = sorted(positions[client_id] for client_id in self.search_index.search(self._search_text)
+                          if client_id in positions)
+
+        if self._status_filter in CLIENT_STATUS_FILTERS:
+            field, value = CLIENT_STATUS_FILTERS[self._status_filter]
+            column = self._payment_statuses if field == 'payment_status' else self._consumption_statuses
+            rows = [i for i in rows if column[i] == value]
+        return list(rows)
+
+    def _matches_filter(self, position: int) -> bool:
+        """Indica si una fila pasa la búsqueda y el filtro actuales (mismas reglas que _filtered_rows)"""
+        if self._search_text.strip() and self._ids[position] not in self.search_index.search(self._search_text):
+            return False
+        if self._status_filter in CLIENT_STATUS_FILTERS:
+            field, value = CLIENT_STATUS_FILTERS[self._status_filter]
+            column = self._payment_statuses if field == 'payment_status' else self._consumption_statuses
+            return column[position] == value
+        return True
+
+    # Actualizaciones por fila
+    def update_client(self, client: ClientWithStatus):
+        """Agrega o actualiza un cliente sin recargar la tabla
+
+        La fila se mueve a su lugar según el orden y el filtro actuales. Sin
+        columna de orden un cliente nuevo aparece al final (la siguiente
+        carga completa lo ubica por nombre).
+        """
+        position = self._positions.get(client.id)
+        is_new = position is None
+        if is_new:
+            position = len(self._ids)
+            self._positions[client.id] = position
+            self._ids.append(client.id)
+            for column in (self._names, self._addresses, self._statuses, self._payment_statuses,
+                           self._consumption_statuses, self._labels):
+                column.append("")
+
+        self._names[position] = client.name
+        self._addresses[position] = client.address
+        self._statuses[position] = client.status.title()
+        self._payment_statuses[position] = client.payment_status
+        self._consumption_statuses[position] = client.consumption_status
+        self._labels[position] = f"{client.get_status_icon()} {client.get_status_text()}"
+        for column, text in ((1, client.name), (2, client.address)):
+            keys = self._sort_keys.get(column)
+            if keys is not None:
+                if is_new:
+                    keys.append(text.lower())
+                else:
+                    keys[position] = text.lower()
+        if self._owns_index:
+            if is_new:
+                self.search_index.add(client.id, client.name, client.address)
+            else:
+                self.search_index.update(client.id, client.name, client.address)
+
+        old_row = None if is_new else self._visible_row(position)
+        if old_row is not None:
+            del self._visible[old_row]
+        new_row = self._insertion_row(position) if self._matches_filter(position) else None
+
+        if old_row is None and new_row is None:
+            return
+        if old_row is None:
+            self.beginInsertRows(QModelIndex(), new_row, new_row)
+            self._visible.insert(new_row, position)
+            self.endInsertRows()
+        elif new_row is None:
+            self._visible.insert(old_row, position)
+            self.beginRemoveRows(QModelIndex(), old_row, old_row)
+            del self._visible[old_row]
+            self.endRemoveRows()
+        elif new_row == old_row:
+            self._visible.insert(old_row, position)
+            self.dataChanged.emit(self.index(old_row, 0), self.index(old_row, len(self.HEADERS) - 1))
+        else:
+            # Mover (y no quitar e insertar) conserva la selección
+            self._visible.insert(old_row, position)
+            destination = new_row + 1 if new_row > old_row else new_row
+            self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), destination)
+            del self._visible[old_row]
+            self._visible.insert(new_row, position)
+            self.endMoveRows()
+            self.dataChanged.emit(self.index(new_row, 0), self.index(new_row, len(self.HEADERS) - 1))
+
+    def remove_client(self, client_id: int):
+        """Quita un cliente sin recargar la tabla"""
+        position = self._positions.pop(client_id, None)
+        if position is None:
+            return
+        self._removed.add(position)
+        if self._owns_index:
+            self.search_index.remove(client_id)
+        row = self._visible_row(position)
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._visible[row]
+            self.endRemoveRows()
+
+    def _visible_row(self, position: int) -> Optional[int]:
+        try:
+            return self._visible.index(position)
+        except ValueError:
+            return None
+
+    def _insertion_row(self, position: int) -> int:
+        """Fila donde va una posición para mantener el orden actual de _visible"""
+        if not 0 <= self._sort_column < len(self.HEADERS):
+            return bisect(self._visible, position)
+        keys = self._column_sort_keys(self._sort_column)
+        key = keys[position]
+        descending = self._sort_order == Qt.DescendingOrder
+        low, high = 0, len(self._visible)
+        while low < high:
+            middle = (low + high) // 2
+            other = keys[self._visible[middle]]
+            if (other < key) if descending else (key < other):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    # Ordenamiento
+    def _column_sort_keys(self, column: int) -> list:
+        """Claves de orden de una columna (calculadas una vez por carga)"""
+        if column not in self._sort_keys:
+            if column == 0:
+                keys = self._ids
+            elif column == 1:
+                keys = [name.lower() for name in self._names]
+            elif column == 2:
+                keys = [address.lower() for address in self._addresses]
+            elif column == 3:
+                keys = self._statuses
+            else:
+                keys = self._labels
+            self._sort_keys[column] = keys
+        return self._sort_keys[column]
+
+    def _sort_visible(self):
+        # Sin columna de orden se conserva el orden de carga (por nombre)
+        if 0 <= self._sort_column < len(self.HEADERS):
+            keys = self._column_sort_keys(self._sort_column)
+            self._visible.sort(key=keys.__getitem__,
+                               reverse=self._sort_order == Qt.DescendingOrder)
+        else:
+            self._visible.sort()
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """Ordena las filas visibles conservando la selección"""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        tracked = [(self._visible[index.row()], index.column()) for index in persistent]
+
+        self._sort_column = column
+        self._sort_order = order
+        self._sort_visible()
+
+        if persistent:
+            positions = {source: row for row, source in enumerate(self._visible)}
+            self.changePersistentIndexList(
+                persistent, [self.index(positions[source], col) for source, col in tracked]
+            )
+        self.layoutChanged.emit()
+
+    # Interfaz de QAbstractTableModel
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        column = index.column()
+        if role == Qt.DisplayRole:
+            source = self._visible[index.row()]
+            if column == 0:
+                return str(self._ids[source])
+            if column == 1:
+                return self._names[source]
+            if column == 2:
+                return self._addresses[source]
+            if column == 3:
+                return self._statuses[source]
+            return self._labels[source]
+        if role == Qt.TextAlignmentRole and column in self.CENTERED_COLUMNS:
+            return Qt.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    # Consultas por fila
+    def client_id(self, row: int) -> Optional[int]:
+        """ID del cliente mostrado en una fila"""
+        if 0 <= row < len(self._visible):
+            return self._ids[self._visible[row]]
+        return None
+
+    def client_name(self, row: int) -> Optional[str]:
+        """Nombre del cliente mostrado en una fila"""
+        if 0 <= row < len(self._visible):
+            return self._names[self._visible[row]]
+        return None
+
+    def total_count(self) -> int:
+        """Total de clientes cargados (sin filtrar)"""
+        return len(self._positions)
@@ -6,19 +6,23 @@ Módulo: Ventana Principal (Dashboard)
 import sys
 from datetime import datetime
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+                            QLabel, QPushButton, QTableView, QAbstractItemView,
                             QLineEdit, QComboBox, QFrame, QSplitter, QListWidget,
                             QStackedWidget, QCalendarWidget, QTextEdit, QGroupBox,
                             QMessageBox, QHeaderView, QApplication)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-from PyQt5.QtGui import QFont, QIcon
+from PyQt5.QtCore import Qt, QTimer, QDate, pyqtSignal
+from PyQt5.QtGui import QFont, QIcon, QColor, QTextCharFormat
 from database.database_manager import DatabaseManager
 from models.data_models import ClientWithStatus
 from styles.app_styles import MAIN_STYLE, DASHBOARD_STYLE, COLORS
 from controllers.app_controller import AppController
 from ui.client_dialogs import ClientDialog, ClientProfileDialog
+from ui.client_table_model import ClientTableModel
 from utils.helpers import ChartWidget
 
+# Espera (ms) tras la última tecla antes de filtrar la tabla
+SEARCH_DEBOUNCE_MS = 200
+
 class StatsCard(QFrame):
     """Widget personalizado para mostrar estadísticas"""
     def __init__(self, title, value, color=None):
@@ -46,40 +50,111 @@ class StatsCard(QFrame):
         layout.addWidget(value_label)
         layout.addWidget(title_label)
         self.setLayout(layout)
+
+class MainWindow(QMainWindow):
+    def __init__(self, controller=None, watch_changes: bool = True):
+        super().__init__()
+        self.controller = controller or AppController()
+        self.current_clients = []
+        self.selected_date = None
+        self.init_ui()
+        self.setStyleSheet(MAIN_STYLE + DASHBOARD_STYLE)
+        self.connect_signals()
+        self.load_data()
+        
+        # Recargar solo cuando otra estación o proceso confirma cambios
+        # (watch_changes=False para una sola estación, sin revisiones periódicas)
+        self.change_watcher = self.controller.watch_changes() if watch_changes else None
     
     def connect_signals(self):
         """Conecta las señales del controlador"""
+        # Cada alta o cambio actualiza solo la fila afectada; las cargas
+        # masivas (data_updated) y el botón Actualizar recargan todo
         self.controller.data_updated.connect(self.load_data)
         self.controller.client_added.connect(self.on_client_added)
         self.controller.client_updated.connect(self.on_client_updated)
         self.controller.client_deleted.connect(self.on_client_deleted)
+        self.controller.payment_added.connect(self.on_payments_changed)
+        self.controller.payment_updated.connect(self.on_payments_changed)
+        self.controller.consumption_added.connect(self.on_consumption_added)
+        self.controller.external_change.connect(self.on_external_change)
+        
+        # Resultados de las consultas en segundo plano
+        self.controller.query_finished.connect(self.on_query_finished)
+        self.controller.query_failed.connect(self.on_query_failed)
+        self.controller.loading_changed.connect(self.on_loading_changed)
+    
+    def on_query_finished(self, key, result):
+        """Muestra el resultado de una consulta en segundo plano"""
+        if key == 'clients':
+            self.current_clients = result
+            self.update_clients_table()
+        elif key == 'statistics':
+            self.show_statistics(result)
+        elif key == 'payments_by_date':
+            self.show_date_payments(result)
+        elif key == 'payment_calendar':
+            self.mark_calendar_days(result)
+        elif key.startswith('client_row:') and result is not None:
+            self.clients_model.update_client(result)
+    
+    def on_query_failed(self, key, message):
+        """Informa el error de una consulta en segundo plano"""
+        if key == 'clients':
+            QMessageBox.critical(self, "Error", f"Error al cargar datos: {message}")
+        else:
+            self.statusBar().showMessage(f"Error al cargar datos: {message}", 5000)
+    
+    def on_loading_changed(self, loading):
+        """Muestra el indicador de carga mientras hay consultas en curso"""
+        self.loading_label.setVisible(loading)
     
     def on_client_added(self, client_id):
         """Maneja la adición de un nuevo cliente"""
+        self.refresh_client_row(client_id)
         self.statusBar().showMessage(f"Cliente agregado con ID: {client_id}", 3000)
     
     def on_client_updated(self, client_id):
         """Maneja la actualización de un cliente"""
+        self.refresh_client_row(client_id)
         self.statusBar().showMessage(f"Cliente {client_id} actualizado", 3000)
     
     def on_client_deleted(self, client_id):
         """Maneja la eliminación de un cliente"""
+        self.clients_model.remove_client(client_id)
         self.statusBar().showMessage(f"Cliente {client_id} eliminado", 3000)
-
-class MainWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.controller = AppController()
-        self.current_clients = []
-        self.init_ui()
-        self.setStyleSheet(MAIN_STYLE + DASHBOARD_STYLE)
-        self.connect_signals()
+    
+    def on_payments_changed(self, payment_id, client_id):
+        """Actualiza la fila del cliente y las vistas de pagos por fecha"""
+        self.refresh_client_row(client_id)
+        self.controller.load_payment_calendar_async(self.calendar.yearShown(), self.calendar.monthShown())
+        if self.selected_date is not None:
+            self.controller.load_payments_by_date_async(self.selected_date.toString("yyyy-MM-dd"))
+    
+    def on_consumption_added(self, consumption_id, client_id):
+        """Actualiza la fila del cliente y las marcas de exceso del calendario"""
+        self.refresh_client_row(client_id)
+        self.controller.load_payment_calendar_async(self.calendar.yearShown(), self.calendar.monthShown())
+    
+    def refresh_client_row(self, client_id):
+        """Vuelve a leer (en segundo plano) solo la fila de un cliente"""
+        if self.controller.is_loading('clients'):
+            # La carga completa en curso pudo leer la fila antes del cambio
+            self.controller.load_clients_async()
+        else:
+            self.controller.run_async(f"client_row:{client_id}", self.controller.get_client_with_status, client_id)
+    
+    def on_external_change(self):
+        """Recarga lo que se muestra cuando otra estación modificó la base de datos"""
         self.load_data()
-        
-        # Timer para actualizar estadísticas cada 30 segundos
-        self.stats_timer = QTimer()
-        self.stats_timer.timeout.connect(self.update_statistics)
-        self.stats_timer.start(30000)  # 30 segundos
+        if self.selected_date is not None:
+            self.controller.load_payments_by_date_async(self.selected_date.toString("yyyy-MM-dd"))
+        self.statusBar().showMessage("Datos actualizados desde otra estación", 3000)
+    
+    def closeEvent(self, event):
+        if self.change_watcher is not None:
+            self.change_watcher.stop()
+        super().closeEvent(event)
     
     def init_ui(self):
         """Inicializa la interfaz de usuario"""
@@ -107,6 +182,9 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(splitter)
         
         # Barra de estado
+        self.loading_label = QLabel("⏳ Cargando datos...")
+        self.loading_label.setVisible(False)
+        self.statusBar().addPermanentWidget(self.loading_label)
         self.statusBar().showMessage("Sistema iniciado correctamente")
     
     def create_sidebar(self):
@@ -143,8 +221,9 @@ class MainWindow(QMainWindow):
         for item in menu_items:
             self.menu_list.addItem(item)
         
-        self.menu_list.currentRowChanged.connect(self.change_page)
+        # Seleccionar antes de conectar: las páginas aún no existen
         self.menu_list.setCurrentRow(0)  # Seleccionar Dashboard por defecto
+        self.menu_list.currentRowChanged.connect(self.change_page)
         
         layout.addWidget(title_label)
         layout.addWidget(self.menu_list)
@@ -199,7 +278,12 @@ class MainWindow(QMainWindow):
         search_label = QLabel("Buscar:")
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Nombre, dirección o ID...")
-        self.search_input.textChanged.connect(self.filter_clients)
+        # Filtrar cuando el usuario deja de escribir, no en cada tecla
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_clients)
+        self.search_input.textChanged.connect(lambda _text: self.search_timer.start())
         
         filter_label = QLabel("Filtrar:")
         self.filter_combo = QComboBox()
@@ -221,21 +305,23 @@ class MainWindow(QMainWindow):
         filters_layout.addStretch()
         filters_layout.addWidget(refresh_button)
         
-        # Tabla de clientes
-        self.clients_table = QTableWidget()
-        self.clients_table.setColumnCount(5)
-        self.clients_table.setHorizontalHeaderLabels([
-            "ID", "Nombre", "Dirección", "Estado", "Estado de Pago"
-        ])
+        # Tabla de clientes (modelo virtual: solo se dibujan las filas visibles)
+        self.clients_model = ClientTableModel(self, self.controller.search_index)
+        self.clients_table = QTableView()
+        self.clients_table.setModel(self.clients_model)
         
         # Configurar tabla
         header = self.clients_table.horizontalHeader()
         header.setStretchLastSection(True)
         header.setSectionResizeMode(1, QHeaderView.Stretch)
         header.setSectionResizeMode(2, QHeaderView.Stretch)
+        # Sin indicador de orden se conserva el orden por nombre de la consulta
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        self.clients_table.setSortingEnabled(True)
         
         self.clients_table.setAlternatingRowColors(True)
-        self.clients_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.clients_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.clients_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.clients_table.doubleClicked.connect(self.open_client_profile)
         
         # Agregar elementos al layout
@@ -298,6 +384,7 @@ class MainWindow(QMainWindow):
         # Calendario
         self.calendar = QCalendarWidget()
         self.calendar.clicked.connect(self.show_payments_by_date)
+        self.calendar.currentPageChanged.connect(self.controller.load_payment_calendar_async)
         
         # Panel de detalles del día seleccionado
         details_group = QGroupBox("Pagos del día seleccionado")
@@ -392,57 +479,26 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage(f"Navegando en: {pages[index]}")
     
     def load_data(self):
-        """Carga los datos desde la base de datos"""
-        try:
-            # Cargar clientes con estado
-            self.current_clients = self.controller.get_clients_with_status()
-            
-            # Actualizar tabla
-            self.update_clients_table()
-            
-            # Actualizar estadísticas
-            self.update_statistics()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al cargar datos: {str(e)}")
+        """Carga los datos desde la base de datos (en segundo plano)"""
+        # Los resultados llegan por on_query_finished
+        self.controller.load_clients_async()
+        self.update_statistics()
+        self.controller.load_payment_calendar_async(self.calendar.yearShown(), self.calendar.monthShown())
     
     def update_clients_table(self, clients=None):
         """Actualiza la tabla de clientes"""
         if clients is None:
             clients = self.current_clients
         
-        self.clients_table.setRowCount(len(clients))
-        
-        for row, client in enumerate(clients):
-            # ID
-            id_item = QTableWidgetItem(str(client.id))
-            id_item.setTextAlignment(Qt.AlignCenter)
-            self.clients_table.setItem(row, 0, id_item)
-            
-            # Nombre
-            name_item = QTableWidgetItem(client.name)
-            self.clients_table.setItem(row, 1, name_item)
-            
-            # Dirección
-            address_item = QTableWidgetItem(client.address)
-            self.clients_table.setItem(row, 2, address_item)
-            
-            # Estado
-            status_item = QTableWidgetItem(client.status.title())
-            status_item.setTextAlignment(Qt.AlignCenter)
-            self.clients_table.setItem(row, 3, status_item)
-            
-            # Estado de pago con ícono
-            payment_status = f"{client.get_status_icon()} {client.get_status_text()}"
-            payment_item = QTableWidgetItem(payment_status)
-            payment_item.setTextAlignment(Qt.AlignCenter)
-            self.clients_table.setItem(row, 4, payment_item)
+        self.clients_model.set_clients(clients)
     
     def update_statistics(self):
+        """Solicita las estadísticas del dashboard (en segundo plano)"""
+        self.controller.load_statistics_async()
+    
+    def show_statistics(self, stats):
         """Actualiza las estadísticas del dashboard"""
         try:
-            stats = self.controller.get_statistics()
-            
             # Actualizar cards de estadísticas
             self.total_clients_card.findChild(QLabel, "stat-number").setText(str(stats['total_clients']))
             self.debt_clients_card.findChild(QLabel, "stat-number").setText(str(stats['clients_with_debt']))
@@ -457,67 +513,82 @@ class MainWindow(QMainWindow):
         search_text = self.search_input.text()
         filter_option = self.filter_combo.currentText()
         
-        # Aplicar filtros usando el controlador
-        filtered_clients = self.controller.filter_clients_by_search(self.current_clients, search_text)
-        filtered_clients = self.controller.filter_clients_by_status(filtered_clients, filter_option)
-        
-        self.update_clients_table(filtered_clients)
+        # El modelo filtra sobre sus columnas sin recrear la tabla
+        self.clients_model.set_filter(search_text, filter_option)
     
     def show_payments_by_date(self, date):
-        """Muestra los pagos de una fecha específica"""
-        try:
-            date_str = date.toString("yyyy-MM-dd")
-            payments = self.controller.get_payments_by_date(date_str)
-            
-            if payments:
-                text = f"Pagos del {date.toString('dd/MM/yyyy')}:\\n\\n"
-                for payment in payments:
-                    status_icon = "✅" if payment['status'] == 'pagado' else "❌"
-                    text += f"{status_icon} {payment['name']} - ${payment['amount']:.2f}\\n"
-                    text += f"   📍 {payment['address']}\\n\\n"
-            else:
-                text = f"No hay pagos registrados para el {date.toString('dd/MM/yyyy')}"
-            
-            self.date_payments_text.setPlainText(text)
-            
-        except Exception as e:
-            self.date_payments_text.setPlainText(f"Error al cargar pagos: {str(e)}")
+        """Solicita los pagos de una fecha específica (en segundo plano)"""
+        self.selected_date = date
+        self.date_payments_text.setPlainText("⏳ Cargando pagos...")
+        self.controller.load_payments_by_date_async(date.toString("yyyy-MM-dd"))
+    
+    def mark_calendar_days(self, days):
+        """Resalta en el calendario los días con pagos (rojo si hay pendientes)"""
+        # Una fecha nula borra los formatos del mes anterior
+        self.calendar.setDateTextFormat(QDate(), QTextCharFormat())
+        year, month = self.calendar.yearShown(), self.calendar.monthShown()
+        for day, counts in days.items():
+            if not counts['paid'] and not counts['pending']:
+                continue
+            text_format = QTextCharFormat()
+            text_format.setFontWeight(QFont.Bold)
+            color = COLORS['danger'] if counts['pending'] else COLORS['secondary']
+            text_format.setForeground(QColor(color))
+            tooltip = f"{counts['paid']} pagado(s), {counts['pending']} pendiente(s)"
+            if counts['excess']:
+                tooltip += f", {counts['excess']} exceso(s) de consumo"
+            text_format.setToolTip(tooltip)
+            self.calendar.setDateTextFormat(QDate(year, month, day), text_format)
+    
+    def show_date_payments(self, payments):
+        """Muestra los pagos de la fecha seleccionada"""
+        date_label = self.selected_date.toString('dd/MM/yyyy')
+        if payments:
+            text = f"Pagos del {date_label}:\n\n"
+            for payment in payments:
+                status_icon = "✅" if payment['status'] == 'pagado' else "❌"
+                text += f"{status_icon} {payment['name']} - ${payment['amount']:.2f}\n"
+                text += f"   📍 {payment['address']}\n\n"
+        else:
+            text = f"No hay pagos registrados para el {date_label}"
+        
+        self.date_payments_text.setPlainText(text)
+    
+    def selected_client_id(self):
+        """ID del cliente seleccionado en la tabla, o None"""
+        return self.clients_model.client_id(self.clients_table.currentIndex().row())
     
     def open_client_profile(self):
         """Abre el perfil del cliente seleccionado"""
-        current_row = self.clients_table.currentRow()
-        if current_row >= 0:
-            client_id = int(self.clients_table.item(current_row, 0).text())
-            dialog = ClientProfileDialog(client_id, self)
+        client_id = self.selected_client_id()
+        if client_id is not None:
+            dialog = ClientProfileDialog(client_id, self, self.controller)
             dialog.exec_()
     
     def add_new_client(self):
         """Abre el diálogo para agregar un nuevo cliente"""
-        dialog = ClientDialog(parent=self)
-        dialog.client_saved.connect(self.load_data)
+        dialog = ClientDialog(parent=self, controller=self.controller)
         dialog.exec_()
     
     def edit_selected_client(self):
         """Edita el cliente seleccionado"""
-        current_row = self.clients_table.currentRow()
-        if current_row >= 0:
-            client_id = int(self.clients_table.item(current_row, 0).text())
-            dialog = ClientDialog(client_id, self)
-            dialog.client_saved.connect(self.load_data)
+        client_id = self.selected_client_id()
+        if client_id is not None:
+            dialog = ClientDialog(client_id, self, self.controller)
             dialog.exec_()
         else:
             QMessageBox.information(self, "Selección", "Por favor seleccione un cliente para editar")
     
     def delete_selected_client(self):
         """Elimina el cliente seleccionado"""
-        current_row = self.clients_table.currentRow()
-        if current_row >= 0:
-            client_id = int(self.clients_table.item(current_row, 0).text())
-            client_name = self.clients_table.item(current_row, 1).text()
+        current_row = self.clients_table.currentIndex().row()
+        client_id = self.clients_model.client_id(current_row)
+        if client_id is not None:
+            client_name = self.clients_model.client_name(current_row)
             
             reply = QMessageBox.question(
                 self, "Confirmar Eliminación",
-                f"¿Está seguro de que desea eliminar al cliente:\\n{client_name}?\\n\\n"
+                f"¿Está seguro de que desea eliminar al cliente:\n{client_name}?\n\n"
                 "Esta acción no se puede deshacer.",
                 QMessageBox.Yes | QMessageBox.No,
                 QMessageBox.No
@@ -0,0 +1,83 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Detección de Cambios Externos en la Base de Datos
+"""
+
+import os
+from typing import Optional, Tuple
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# Intervalo entre revisiones (ms); cada revisión es un PRAGMA sin E/S de disco
+CHANGE_POLL_INTERVAL_MS = 1000
+
+# Identidad y fecha de modificación de un archivo: (inodo, mtime en ns, tamaño)
+FileState = Optional[Tuple[int, int, int]]
+
+def get_file_state(path: str) -> FileState:
+    """Retorna (inodo, mtime en ns, tamaño) de un archivo, o None si no existe"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+class DatabaseChangeWatcher(QObject):
+    """Avisa cuando otra conexión confirma cambios en la base de datos
+
+    Revisa PRAGMA data_version con la conexión del hilo de la interfaz: las
+    escrituras propias (que ya emiten las señales del controlador) no lo
+    cambian, y las de otras estaciones o procesos sí. Es la única sentencia
+    que corre en el hilo de la interfaz: lee un contador en memoria
+    compartida, sin tocar tablas. Solo si el PRAGMA falla se comparan la
+    fecha de modificación del archivo y del WAL.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, db_manager, interval_ms: int = CHANGE_POLL_INTERVAL_MS,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.check)
+        self._data_version: Optional[int] = None
+        self._files: Tuple[FileState, FileState] = (None, None)
+        self.checks = 0
+        self.changes = 0
+
+    def _snapshot(self) -> Tuple[Optional[int], Tuple[FileState, FileState]]:
+        data_version = self.db_manager.get_data_version()
+        if data_version is not None:
+            return data_version, (None, None)  # Sin llamadas a os.stat
+        db_path = self.db_manager.db_path
+        return None, (get_file_state(db_path), get_file_state(db_path + '-wal'))
+
+    def start(self):
+        """Toma el estado actual como referencia y empieza a revisar"""
+        self._data_version, self._files = self._snapshot()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def is_active(self) -> bool:
+        return self.timer.isActive()
+
+    def check(self) -> bool:
+        """Revisa si hubo cambios externos; emite changed y retorna True si los hubo"""
+        self.checks += 1
+        data_version, files = self._snapshot()
+        previous_version, previous_files = self._data_version, self._files
+        self._data_version, self._files = data_version, files
+
+        if data_version is not None and previous_version is not None:
+            changed = data_version != previous_version
+        else:
+            # Al pasar de un modo a otro se asume un cambio (a lo sumo una recarga de más)
+            changed = files != previous_files
+
+        if changed:
+            self.changes += 1
+            self.changed.emit()
+        return changed
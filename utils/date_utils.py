@@ -0,0 +1,94 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Utilidades de Fechas
+"""
+
+from datetime import date, datetime, timedelta
+from typing import List
+
+class DateUtils:
+    """Utilidades para manejo de fechas"""
+    
+    @staticmethod
+    def get_month_range(year: int, month: int) -> tuple:
+        """Obtiene el rango de fechas de un mes específico"""
+        start_date = datetime(year, month, 1)
+        if month == 12:
+            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
+        else:
+            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
+        
+        return start_date, end_date
+    
+    @staticmethod
+    def get_month_bounds(year: int, month: int) -> tuple:
+        """Obtiene el rango semiabierto [inicio, inicio del mes siguiente) de un mes"""
+        start_date, end_date = DateUtils.get_month_range(year, month)
+        return start_date, end_date + timedelta(days=1)
+    
+    @staticmethod
+    def get_week_bounds(date_obj: date) -> tuple:
+        """Obtiene el rango semiabierto [lunes, lunes siguiente) de una semana"""
+        monday = datetime(date_obj.year, date_obj.month, date_obj.day) - timedelta(days=date_obj.weekday())
+        return monday, monday + timedelta(days=7)
+    
+    @staticmethod
+    def get_day_bounds(date_obj: date) -> tuple:
+        """Obtiene el rango semiabierto [día, día siguiente) de una fecha"""
+        start_date = datetime(date_obj.year, date_obj.month, date_obj.day)
+        return start_date, start_date + timedelta(days=1)
+    
+    @staticmethod
+    def to_db_timestamp(value) -> str:
+        """Convierte una fecha al formato de texto de CURRENT_TIMESTAMP en SQLite"""
+        if isinstance(value, str):
+            return value
+        if not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    
+    @staticmethod
+    def to_day_key(date_obj: date) -> int:
+        """Convierte una fecha a la clave entera AAAAMMDD de la columna day"""
+        return date_obj.year * 10000 + date_obj.month * 100 + date_obj.day
+    
+    @staticmethod
+    def to_month_key(year: int, month: int) -> int:
+        """Convierte un mes a la clave entera AAAAMM de la columna year_month"""
+        return year * 100 + month
+    
+    @staticmethod
+    def parse_month_key(month: str) -> int:
+        """Convierte un mes 'YYYY-MM' a su clave entera AAAAMM"""
+        year, month_number = (int(part) for part in month.split('-'))
+        return DateUtils.to_month_key(year, month_number)
+    
+    @staticmethod
+    def format_month_key(month_key: int) -> str:
+        """Convierte una clave AAAAMM al texto 'YYYY-MM'"""
+        return f"{month_key // 100:04d}-{month_key % 100:02d}"
+    
+    @staticmethod
+    def format_date_spanish(date_obj: datetime) -> str:
+        """Formatea una fecha en español"""
+        months = [
+            "enero", "febrero", "marzo", "abril", "mayo", "junio",
+            "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"
+        ]
+        
+        day = date_obj.day
+        month = months[date_obj.month - 1]
+        year = date_obj.year
+        
+        return f"{day} de {month} de {year}"
+    
+    @staticmethod
+    def get_last_n_months(n: int) -> List[str]:
+        """Obtiene los últimos N meses en formato YYYY-MM"""
+        # UTC, igual que CURRENT_TIMESTAMP (clave del rollup) y get_statistics
+        current_date = datetime.utcnow()
+        # Meses contados desde el año 0, para retroceder más de un año
+        current = current_date.year * 12 + current_date.month - 1
+        
+        return [f"{index // 12:04d}-{index % 12 + 1:02d}"
+                for index in range(current - n + 1, current + 1)]
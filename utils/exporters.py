@@ -0,0 +1,345 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Exportación de Datos
+"""
+
+import csv
+import gzip
+import os
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence
+
+from models.data_models import Money
+
+# Dependencias opcionales para la exportación columnar: Parquet con pyarrow
+# o, en su defecto, archivos .npz de NumPy
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Filas leídas por cada fetchmany durante las exportaciones en streaming
+EXPORT_BATCH_SIZE = 5000
+
+# Filas por grupo (row group) en la exportación columnar
+COLUMNAR_BATCH_SIZE = 65536
+
+# Partición para registros sin fecha
+NO_DATE_PARTITION = 'sin_fecha'
+
+def columnar_format() -> Optional[str]:
+    """Formato columnar disponible: 'parquet', 'npz' o None si falta NumPy"""
+    if pq is not None:
+        return 'parquet'
+    if np is not None:
+        return 'npz'
+    return None
+
+def _column_kind(declared_type: str) -> str:
+    """Clasifica el tipo declarado en SQLite: int, float, timestamp o text"""
+    declared_type = (declared_type or '').upper()
+    if 'INT' in declared_type:
+        return 'int'
+    if any(name in declared_type for name in ('REAL', 'FLOA', 'DOUB')):
+        return 'float'
+    if 'TIMESTAMP' in declared_type or 'DATE' in declared_type:
+        return 'timestamp'
+    return 'text'
+
+def _to_datetime(value) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+class _ParquetPartition:
+    """Escribe una partición Parquet; cada lote es un row group"""
+
+    batches_per_file = None  # Sin límite: el archivo crece lote a lote
+
+    def __init__(self, path: str, columns: List[str], kinds: List[str]):
+        arrow_types = {'int': pa.int64(), 'float': pa.float64(),
+                       'timestamp': pa.timestamp('ms'), 'text': pa.string()}
+        self.kinds = kinds
+        self.schema = pa.schema([(name, arrow_types[kind]) for name, kind in zip(columns, kinds)])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='snappy')
+
+    def write(self, columns: List[list]):
+        arrays = []
+        for values, kind, field in zip(columns, self.kinds, self.schema):
+            if kind == 'timestamp':
+                values = [_to_datetime(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+class _NpzPartition:
+    """Escribe una partición .npz con un arreglo NumPy tipado por columna
+    
+    Un .npz no admite anexar datos, así que cada lote va a su propio archivo
+    (part-0.npz, part-1.npz, ...) y la memoria no crece con el tamaño del mes.
+    Los valores nulos de columnas enteras o de texto se guardan como 0 o ''
+    junto con un arreglo booleano "<columna>__null".
+    """
+
+    batches_per_file = 1
+
+    def __init__(self, path: str, columns: List[str], kinds: List[str]):
+        self.path = path
+        self.columns = columns
+        self.kinds = kinds
+        self.chunks: Dict[str, list] = {name: [] for name in columns}
+
+    def write(self, columns: List[list]):
+        for name, kind, values in zip(self.columns, self.kinds, columns):
+            if kind == 'timestamp':
+                array = np.array([_to_datetime(value) for value in values], dtype='datetime64[s]')
+            elif kind == 'float':
+                array = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+            else:
+                nulls = np.array([value is None for value in values])
+                default = 0 if kind == 'int' else ''
+                filled = [default if value is None else value for value in values]
+                array = np.array(filled, dtype=np.int64 if kind == 'int' else str)
+                self.chunks.setdefault(f'{name}__null', []).append(nulls)
+            self.chunks[name].append(array)
+
+    def close(self):
+        arrays = {name: np.concatenate(chunks) for name, chunks in self.chunks.items() if chunks}
+        # Las máscaras de nulos solo se guardan si la partición tiene nulos
+        arrays = {name: array for name, array in arrays.items()
+                  if not name.endswith('__null') or array.any()}
+        with open(self.path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+class DataExporter:
+    """Clase para exportar datos a diferentes formatos"""
+    
+    @staticmethod
+    def export_to_csv(data: List[Dict[str, Any]], filename: str) -> bool:
+        """Exporta datos a archivo CSV"""
+        try:
+            if not data:
+                return False
+            
+            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+                fieldnames = data[0].keys()
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                
+                writer.writeheader()
+                for row in data:
+                    writer.writerow(row)
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error al exportar CSV: {e}")
+            return False
+    
+    @staticmethod
+    def export_cursor_to_csv(cursor, filename: str, columns: Optional[Sequence[str]] = None,
+                             batch_size: int = EXPORT_BATCH_SIZE,
+                             compress: Optional[bool] = None) -> int:
+        """Exporta a CSV las filas de un cursor en streaming con memoria constante
+        
+        Lee el cursor con fetchmany(batch_size) y escribe cada bloque de
+        inmediato. columns selecciona y ordena las columnas a exportar;
+        compress genera gzip (por defecto, si el archivo termina en .gz).
+        Retorna el número de filas exportadas, o -1 si ocurre un error.
+        """
+        try:
+            names = [description[0] for description in cursor.description]
+            selected = list(columns) if columns else names
+            missing = [column for column in selected if column not in names]
+            if missing:
+                raise ValueError(f"Columnas inexistentes: {', '.join(missing)}")
+            positions = [names.index(column) for column in selected]
+            
+            if compress is None:
+                compress = filename.endswith('.gz')
+            opener = gzip.open if compress else open
+            
+            exported = 0
+            with opener(filename, 'wt', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(selected)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    if positions == list(range(len(names))):
+                        writer.writerows(rows)
+                    else:
+                        writer.writerows([row[i] for i in positions] for row in rows)
+                    exported += len(rows)
+            
+            return exported
+            
+        except Exception as e:
+            print(f"Error al exportar CSV: {e}")
+            return -1
+    
+    @staticmethod
+    def export_cursor_to_columnar(cursor, directory: str, column_types: Dict[str, str],
+                                  partition_column: Optional[str] = None,
+                                  file_format: Optional[str] = None,
+                                  batch_size: int = COLUMNAR_BATCH_SIZE) -> int:
+        """Exporta las filas de un cursor a archivos columnares tipados
+        
+        Escribe Parquet (pyarrow) o .npz (NumPy) en streaming, un lote de
+        batch_size filas por row group (o por archivo .npz). Con partition_column las filas se
+        particionan por mes al estilo Hive (directory/month=2024-03/part-0.parquet),
+        así los análisis pueden leer solo los meses y columnas necesarios; el
+        cursor debe venir ordenado por esa columna para mantener abierta una
+        sola partición a la vez. column_types son los tipos declarados en SQLite.
+        Retorna el número de filas exportadas, o -1 si ocurre un error.
+        """
+        partition = None
+        try:
+            file_format = file_format or columnar_format()
+            writers = {'parquet': _ParquetPartition, 'npz': _NpzPartition}
+            if file_format is None:
+                raise RuntimeError("Se requiere pyarrow o numpy para la exportación columnar")
+            if file_format not in writers:
+                raise ValueError(f"Formato columnar desconocido: {file_format}")
+            if (pq if file_format == 'parquet' else np) is None:
+                raise RuntimeError(f"Falta la dependencia para exportar a {file_format}")
+            
+            columns = [description[0] for description in cursor.description]
+            kinds = [_column_kind(column_types.get(column)) for column in columns]
+            date_index = columns.index(partition_column) if partition_column else None
+            os.makedirs(directory, exist_ok=True)
+            
+            parts: Dict[str, int] = {}
+            current = None
+            exported = 0
+            batches = 0
+            
+            def open_partition(month):
+                part_dir = os.path.join(directory, f'month={month}') if month else directory
+                os.makedirs(part_dir, exist_ok=True)
+                number = parts.get(month, 0)
+                parts[month] = number + 1
+                path = os.path.join(part_dir, f'part-{number}.{file_format}')
+                return writers[file_format](path, columns, kinds)
+            
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                
+                # Agrupar el lote en tramos contiguos del mismo mes
+                groups = []
+                for row in rows:
+                    month = None
+                    if date_index is not None:
+                        value = row[date_index]
+                        month = value[:7] if value else NO_DATE_PARTITION
+                    if not groups or groups[-1][0] != month:
+                        groups.append((month, []))
+                    groups[-1][1].append(row)
+                
+                for month, group in groups:
+                    if partition is None or month != current:
+                        if partition is not None:
+                            partition.close()
+                        partition = open_partition(month)
+                        current = month
+                        batches = 0
+                    partition.write([list(values) for values in zip(*group)])
+                    exported += len(group)
+                    batches += 1
+                    if partition.batches_per_file and batches >= partition.batches_per_file:
+                        partition.close()
+                        partition = None
+            
+            if partition is not None:
+                partition.close()
+                partition = None
+            return exported
+            
+        except Exception as e:
+            print(f"Error al exportar en formato columnar: {e}")
+            if partition is not None:
+                try:
+                    partition.close()
+                except Exception:
+                    pass
+            return -1
+    
+    @staticmethod
+    def render_client_report(client: Dict[str, Any], payments: List[Dict[str, Any]],
+                             consumption: List[Dict[str, Any]],
+                             generated_at: Optional[str] = None) -> str:
+        """Genera el texto del reporte de un cliente a partir de sus datos ya consultados"""
+        lines = ["REPORTE DE CLIENTE", "=" * 50, ""]
+        
+        # Información del cliente
+        lines += [
+            "INFORMACIÓN DEL CLIENTE",
+            "-" * 25,
+            f"ID: {client['id']}",
+            f"Nombre: {client['name']}",
+            f"Dirección: {client['address']}",
+            f"Estado: {client['status']}",
+            f"Fecha de registro: {client['created_at']}",
+            "",
+        ]
+        
+        # Historial de pagos
+        lines += ["HISTORIAL DE PAGOS", "-" * 20]
+        if payments:
+            # Suma exacta en centavos enteros (sin acumular errores de float)
+            total_pagado = Money(sum(p['amount_cents'] for p in payments if p['status'] == 'pagado'))
+            lines += [f"Total pagado: ${total_pagado}", f"Número de pagos: {len(payments)}", ""]
+            
+            for payment in payments:
+                estado = "✅" if payment['status'] == 'pagado' else "❌"
+                lines.append(f"{estado} ${payment['amount']:.2f} - {(payment['payment_date'] or '')[:10]}")
+                if payment['notes']:
+                    lines.append(f"   Notas: {payment['notes']}")
+        else:
+            lines.append("No hay pagos registrados")
+        
+        lines.append("")
+        
+        # Historial de consumo
+        lines += ["HISTORIAL DE CONSUMO", "-" * 22]
+        if consumption:
+            excesos = len([c for c in consumption if c['consumption_type'] == 'exceso'])
+            lines += [f"Registros de exceso: {excesos}", f"Total registros: {len(consumption)}", ""]
+            
+            for record in consumption:
+                icono = "💧" if record['consumption_type'] == 'exceso' else "✅"
+                lines.append(f"{icono} {record['consumption_type']} - {(record['consumption_date'] or '')[:10]}")
+                if record['notes']:
+                    lines.append(f"   Notas: {record['notes']}")
+        else:
+            lines.append("No hay registros de consumo")
+        
+        generated_at = generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        lines += ["", "=" * 50, f"Reporte generado: {generated_at}", ""]
+        return "\n".join(lines)
+    
+    @staticmethod
+    def export_client_report(db_manager, client_id: int, filename: str) -> bool:
+        """Exporta reporte completo de un cliente"""
+        try:
+            # Obtener datos del cliente
+            client = db_manager.get_client(client_id)
+            payments = db_manager.get_client_payments(client_id)
+            consumption = db_manager.get_client_consumption(client_id)
+            
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(DataExporter.render_client_report(client, payments, consumption))
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error al generar reporte: {e}")
+            return False
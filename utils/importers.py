@@ -0,0 +1,254 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Importación Masiva desde CSV
+
+Uso:
+    python -m utils.importers clients clientes.csv [--db RUTA] [--batch-size N] [--restart]
+    python -m utils.importers payments pagos.csv
+    python -m utils.importers consumption lecturas.csv
+
+Columnas esperadas (encabezado obligatorio):
+    clients:     name, address[, status]
+    payments:    client_id, amount[, status, notes, payment_date]
+    consumption: client_id[, consumption_type, notes, consumption_date]
+"""
+
+import argparse
+import csv
+import os
+import sys
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.data_models import Money
+from utils.validation import ValidationUtils
+
+# Formatos de fecha aceptados en los archivos de origen
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d', '%d/%m/%Y')
+
+def _parse_timestamp(value: str) -> Optional[str]:
+    """Normaliza una fecha al formato de CURRENT_TIMESTAMP; None si viene vacía"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            continue
+    raise ValueError(f"Fecha inválida: {value}")
+
+def _parse_client_id(value: str) -> int:
+    try:
+        return int((value or '').strip())
+    except ValueError:
+        raise ValueError(f"ID de cliente inválido: {value}")
+
+def _client_row(row: Dict[str, str]) -> Dict:
+    name = (row.get('name') or '').strip()
+    address = (row.get('address') or '').strip()
+    status = (row.get('status') or 'activo').strip()
+
+    for valid, message in (ValidationUtils.validate_client_name(name),
+                           ValidationUtils.validate_address(address)):
+        if not valid:
+            raise ValueError(message)
+    if status not in ['activo', 'inactivo']:
+        raise ValueError("Estado inválido")
+    return {'name': name, 'address': address, 'status': status}
+
+def _payment_row(row: Dict[str, str]) -> Dict:
+    try:
+        # Desde el texto del CSV, sin pasar por float
+        amount = Money.from_value(row.get('amount') or '')
+    except ValueError:
+        raise ValueError(f"Monto inválido: {row.get('amount')}")
+    valid, message = ValidationUtils.validate_amount(amount)
+    if not valid:
+        raise ValueError(message)
+
+    status = (row.get('status') or 'pagado').strip()
+    if status not in ['pagado', 'pendiente']:
+        raise ValueError("Estado de pago inválido")
+    return {
+        'client_id': _parse_client_id(row.get('client_id')),
+        'amount': amount,
+        'status': status,
+        'notes': (row.get('notes') or '').strip(),
+        'payment_date': _parse_timestamp(row.get('payment_date')),
+    }
+
+def _consumption_row(row: Dict[str, str]) -> Dict:
+    consumption_type = (row.get('consumption_type') or 'normal').strip()
+    if consumption_type not in ['normal', 'exceso']:
+        raise ValueError("Tipo de consumo inválido")
+    return {
+        'client_id': _parse_client_id(row.get('client_id')),
+        'consumption_type': consumption_type,
+        'notes': (row.get('notes') or '').strip(),
+        'consumption_date': _parse_timestamp(row.get('consumption_date')),
+    }
+
+# Tipo de importación: (conversión/validación de fila, método de inserción masiva)
+IMPORT_KINDS = {
+    'clients': (_client_row, 'add_clients_bulk'),
+    'payments': (_payment_row, 'add_payments_bulk'),
+    'consumption': (_consumption_row, 'add_consumption_bulk'),
+}
+
+class CsvImporter:
+    """Importa archivos CSV por lotes con memoria constante y avance reanudable"""
+
+    def __init__(self, db_manager, kind: str, source_path: str, batch_size: int = 1000,
+                 rejected_path: Optional[str] = None,
+                 progress: Optional[Callable[[Dict], None]] = None):
+        if kind not in IMPORT_KINDS:
+            raise ValueError(f"Tipo de importación desconocido: {kind}")
+        self.db_manager = db_manager
+        self.kind = kind
+        self.source_path = source_path
+        self.batch_size = batch_size
+        self.rejected_path = rejected_path or f"{os.path.splitext(source_path)[0]}.rechazados.csv"
+        self.progress = progress
+        # Identificador del punto de control: tipo y ruta absoluta del archivo
+        self.checkpoint_key = f"{kind}:{os.path.abspath(source_path)}"
+
+    def _validate_batch(self, batch: List[Tuple[int, Dict[str, str]]]) -> Tuple[List[Dict], List[Tuple]]:
+        """Valida un lote y lo separa en filas válidas y rechazadas"""
+        convert, _ = IMPORT_KINDS[self.kind]
+        valid, rejected = [], []
+        for line_number, raw in batch:
+            try:
+                valid.append((line_number, raw, convert(raw)))
+            except ValueError as e:
+                rejected.append((line_number, raw, str(e)))
+
+        # Verificar en una sola consulta que los clientes referenciados existan
+        if self.kind != 'clients' and valid:
+            existing = self.db_manager.get_existing_client_ids(row['client_id'] for _, _, row in valid)
+            missing = [item for item in valid if item[2]['client_id'] not in existing]
+            if missing:
+                valid = [item for item in valid if item[2]['client_id'] in existing]
+                rejected.extend((line, raw, "Cliente no encontrado") for line, raw, _ in missing)
+
+        return [row for _, _, row in valid], rejected
+
+    def _trim_rejected(self, skip: int):
+        """Descarta del archivo de rechazos las filas posteriores al punto de control
+        
+        Los rechazos se escriben antes de confirmar cada lote; si el proceso se
+        interrumpió antes del commit, ese lote se vuelve a procesar al reanudar.
+        """
+        if not os.path.exists(self.rejected_path):
+            return
+        last_line = skip + 1  # Las filas de datos empiezan en la línea 2
+        trimmed_path = f"{self.rejected_path}.tmp"
+        with open(self.rejected_path, newline='', encoding='utf-8') as current, \
+             open(trimmed_path, 'w', newline='', encoding='utf-8') as trimmed:
+            writer = csv.writer(trimmed)
+            for index, row in enumerate(csv.reader(current)):
+                if index == 0 or (row and row[0].isdigit() and int(row[0]) <= last_line):
+                    writer.writerow(row)
+        os.replace(trimmed_path, self.rejected_path)
+
+    def run(self, restart: bool = False) -> Dict:
+        """Ejecuta la importación y retorna un resumen del resultado"""
+        _, insert_method = IMPORT_KINDS[self.kind]
+        insert = getattr(self.db_manager, insert_method)
+
+        if restart:
+            self.db_manager.clear_import_checkpoint(self.checkpoint_key)
+        checkpoint = self.db_manager.get_import_checkpoint(self.checkpoint_key)
+        skip = checkpoint['rows_done'] if checkpoint else 0
+        result = {'processed': skip, 'inserted': 0, 'rejected': 0, 'resumed_from': skip,
+                  'already_completed': bool(checkpoint and checkpoint['completed'])}
+
+        if result['already_completed']:
+            return result
+
+        resume = bool(skip) and os.path.exists(self.rejected_path)
+        if resume:
+            self._trim_rejected(skip)
+
+        with open(self.source_path, newline='', encoding='utf-8-sig') as source, \
+             open(self.rejected_path, 'a' if resume else 'w', newline='', encoding='utf-8') as rejected_file:
+            reader = csv.DictReader(source)
+            rejected_writer = csv.writer(rejected_file)
+            if not resume:
+                rejected_writer.writerow(['line', 'error'] + list(reader.fieldnames or []))
+
+            # Línea 1 es el encabezado; las filas ya importadas se saltan sin guardarlas
+            rows = enumerate(reader, start=2)
+            for _ in islice(rows, skip):
+                pass
+
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+
+                valid, rejected = self._validate_batch(batch)
+                done = result['processed'] + len(batch)
+                # Los rechazos llegan al disco antes de confirmar el avance: una
+                # interrupción puede repetirlos (se recortan al reanudar), nunca perderlos
+                for line_number, raw, error in rejected:
+                    rejected_writer.writerow([line_number, error] + list(raw.values()))
+                rejected_file.flush()
+                os.fsync(rejected_file.fileno())
+
+                # Las filas y el avance se guardan en la misma transacción
+                with self.db_manager.transaction():
+                    ids = insert(valid, self.batch_size) if valid else []
+                    self.db_manager.save_import_checkpoint(self.checkpoint_key, self.kind, done)
+
+                result['processed'] = done
+                result['inserted'] += len(ids)
+                result['rejected'] += len(rejected)
+                if self.progress:
+                    self.progress(dict(result))
+
+        self.db_manager.save_import_checkpoint(self.checkpoint_key, self.kind,
+                                               result['processed'], completed=True)
+        return result
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importación masiva desde CSV")
+    parser.add_argument('kind', choices=sorted(IMPORT_KINDS))
+    parser.add_argument('source', help="Archivo CSV de origen")
+    parser.add_argument('--db', default="database/agua_system.db", help="Ruta de la base de datos")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--rejected', help="Archivo para las filas rechazadas")
+    parser.add_argument('--restart', action='store_true', help="Ignorar el avance guardado")
+    args = parser.parse_args(argv)
+
+    from database.database_manager import DatabaseManager
+
+    def show_progress(status):
+        print(f"\r⏳ {status['processed']:,} filas procesadas, "
+              f"{status['inserted']:,} importadas, {status['rejected']:,} rechazadas", end='', flush=True)
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        importer = CsvImporter(db_manager, args.kind, args.source, args.batch_size,
+                               args.rejected, show_progress)
+        result = importer.run(restart=args.restart)
+    finally:
+        db_manager.close()
+
+    print()
+    if result['already_completed']:
+        print("ℹ️  Este archivo ya fue importado; use --restart para importarlo de nuevo")
+        return 0
+    if result['resumed_from']:
+        print(f"↩️  Reanudado desde la fila {result['resumed_from']:,}")
+    print(f"✅ Importación terminada: {result['inserted']:,} filas importadas")
+    if result['rejected']:
+        print(f"⚠️  {result['rejected']:,} filas rechazadas en {importer.rejected_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
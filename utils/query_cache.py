@@ -0,0 +1,207 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Caché de Resultados de Consultas
+"""
+
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+# Límites por defecto de la caché del controlador
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_TTL_SECONDS = 60.0
+
+_ATOMIC_TYPES = (str, int, float, bool, type(None))
+
+def estimate_size(value: Any) -> int:
+    """Estima los bytes que ocupa un valor, recorriendo contenedores y atributos
+
+    Es una aproximación (cada objeto se cuenta una vez) suficiente para
+    aplicar el límite de memoria de la caché.
+    """
+    seen = set()
+    pending = [value]
+    total = 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool, array)) or item is None:
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            if all(type(element) in _ATOMIC_TYPES for element in item):
+                # Columnas de texto o números: se suman sin recorrer uno por uno
+                total += sum(map(sys.getsizeof, item))
+            else:
+                pending.extend(item)
+        else:
+            pending.extend(getattr(item, '__dict__', {}).values())
+            for slot in getattr(type(item), '__slots__', ()):
+                if hasattr(item, slot):
+                    pending.append(getattr(item, slot))
+    return total
+
+class _Entry:
+    __slots__ = ('value', 'tags', 'size', 'expires_at')
+
+    def __init__(self, value, tags, size, expires_at):
+        self.value = value
+        self.tags = tags
+        self.size = size
+        self.expires_at = expires_at
+
+class QueryCache:
+    """Caché de lectura (read-through) con desalojo LRU, TTL y límite de memoria
+
+    Cada entrada tiene etiquetas (por ejemplo 'clients' o ('client', 5));
+    invalidate(etiqueta) descarta solo las entradas que la llevan. Es segura
+    entre hilos: las cargas en segundo plano y las invalidaciones desde la
+    interfaz pueden ocurrir a la vez. Una carga que empezó antes de invalidar
+    alguna de sus etiquetas no se guarda, porque podría traer datos viejos.
+    Los valores se comparten con quien los pide: no deben modificarse.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES,
+                 ttl: Optional[float] = CACHE_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_tag: Dict[Hashable, set] = {}
+        self._tag_versions: Dict[Hashable, int] = {}
+        self._epoch = 0  # Aumenta con cada clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry: _Entry) -> bool:
+        return entry.expires_at is not None and self._clock() >= entry.expires_at
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], tags: Iterable[Hashable] = ()) -> Any:
+        """Retorna el valor guardado para key o lo carga con loader() y lo guarda
+
+        Si loader lanza una excepción no se guarda nada y la excepción se propaga.
+        """
+        tags = frozenset(tags)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            epoch = self._epoch
+            versions = {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+        value = loader()
+        size = estimate_size(value)
+
+        with self._lock:
+            if epoch != self._epoch or any(self._tag_versions.get(tag, 0) != version
+                                           for tag, version in versions.items()):
+                return value  # Se invalidó mientras se cargaba
+            if size > self.max_bytes:
+                return value  # No cabe: se sirve sin guardar
+            if key in self._entries:
+                self._remove(key)
+            expires_at = self._clock() + self.ttl if self.ttl is not None else None
+            self._entries[key] = _Entry(value, tags, size, expires_at)
+            self._bytes += size
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            self._evict()
+        return value
+
+    def replace(self, key: Hashable, old_value: Any, new_value: Any) -> bool:
+        """Cambia el valor de una entrada si aún guarda old_value
+
+        Conserva etiquetas y vencimiento. Retorna False (sin guardar nada) si
+        la entrada se descartó o se volvió a cargar mientras tanto.
+        """
+        size = estimate_size(new_value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.value is not old_value or self._expired(entry):
+                return False
+            entry.value = new_value
+            self._bytes += size - entry.size
+            entry.size = size
+            self._evict()
+        return True
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def _evict(self):
+        """Desaloja las entradas usadas hace más tiempo hasta respetar los límites"""
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, *tags: Hashable) -> int:
+        """Descarta las entradas con alguna de las etiquetas y retorna cuántas eran"""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+                for key in list(self._by_tag.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self):
+        """Descarta todas las entradas (por ejemplo tras una importación masiva)"""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para monitoreo: aciertos, fallos, desalojos y ocupación"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
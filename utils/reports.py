@@ -0,0 +1,152 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Generación Masiva de Reportes
+
+Uso:
+    python -m utils.reports reportes/ [--db RUTA] [--workers N] [--shard-size N]
+    python -m utils.reports reportes.zip --zip
+"""
+
+import argparse
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Agregar el directorio raíz al path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.exporters import DataExporter
+
+# Clientes enviados a cada proceso por tarea
+REPORT_SHARD_SIZE = 500
+
+def report_filename(client_id: int) -> str:
+    """Nombre del archivo de reporte de un cliente"""
+    return f"reporte_cliente_{client_id:06d}.txt"
+
+def _render_shard(shard: List[Tuple[Dict, List[Dict], List[Dict]]], generated_at: str,
+                  directory: Optional[str]):
+    """Genera los reportes de un bloque de clientes (se ejecuta en un proceso hijo)
+
+    Con directory escribe los archivos y retorna cuántos generó; sin él
+    retorna los pares (nombre, texto) para que el proceso principal los
+    agregue al zip.
+    """
+    rendered = [
+        (report_filename(client['id']),
+         DataExporter.render_client_report(client, payments, consumption, generated_at))
+        for client, payments, consumption in shard
+    ]
+    if directory is None:
+        return rendered
+
+    for name, text in rendered:
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+    return len(rendered)
+
+class BatchReportGenerator:
+    """Genera el reporte de todos los clientes repartiendo el trabajo entre procesos"""
+
+    def __init__(self, db_manager, output: str, as_zip: bool = False,
+                 workers: Optional[int] = None, shard_size: int = REPORT_SHARD_SIZE,
+                 progress: Optional[Callable[[Dict], None]] = None):
+        self.db_manager = db_manager
+        self.output = output
+        self.as_zip = as_zip
+        # Con un solo proceso los reportes se generan sin crear procesos hijos
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.progress = progress
+
+    def _shards(self):
+        """Agrupa los datos de los clientes en bloques de shard_size"""
+        data = self.db_manager.iter_client_report_data()
+        while True:
+            shard = list(islice(data, self.shard_size))
+            if not shard:
+                break
+            yield shard
+
+    def run(self) -> Dict:
+        """Genera los reportes y retorna el total, la duración y los reportes por segundo"""
+        start = time.perf_counter()
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        result = {'reports': 0, 'seconds': 0.0, 'reports_per_second': 0.0, 'output': self.output}
+
+        if self.as_zip:
+            archive = zipfile.ZipFile(self.output, 'w', compression=zipfile.ZIP_DEFLATED)
+            directory = None
+        else:
+            archive = None
+            directory = self.output
+            os.makedirs(directory, exist_ok=True)
+
+        def collect(rendered):
+            if archive is not None:
+                for name, text in rendered:
+                    archive.writestr(name, text)
+                rendered = len(rendered)
+            result['reports'] += rendered
+            if self.progress:
+                self.progress(dict(result))
+
+        try:
+            if self.workers <= 1:
+                for shard in self._shards():
+                    collect(_render_shard(shard, generated_at, directory))
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    # Limitar las tareas en vuelo para mantener acotada la memoria
+                    pending = set()
+                    for shard in self._shards():
+                        pending.add(executor.submit(_render_shard, shard, generated_at, directory))
+                        if len(pending) >= self.workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                collect(future.result())
+                    for future in pending:
+                        collect(future.result())
+        finally:
+            if archive is not None:
+                archive.close()
+
+        result['seconds'] = time.perf_counter() - start
+        if result['seconds'] > 0:
+            result['reports_per_second'] = result['reports'] / result['seconds']
+        return result
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generación masiva de reportes de clientes")
+    parser.add_argument('output', help="Directorio de salida (o archivo .zip con --zip)")
+    parser.add_argument('--db', default="database/agua_system.db", help="Ruta de la base de datos")
+    parser.add_argument('--zip', action='store_true', help="Guardar todos los reportes en un zip")
+    parser.add_argument('--workers', type=int, help="Procesos a usar (por defecto, uno por CPU)")
+    parser.add_argument('--shard-size', type=int, default=REPORT_SHARD_SIZE)
+    args = parser.parse_args(argv)
+
+    from database.database_manager import DatabaseManager
+
+    def show_progress(status):
+        print(f"\r⏳ {status['reports']:,} reportes generados", end='', flush=True)
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        generator = BatchReportGenerator(db_manager, args.output, args.zip, args.workers,
+                                         args.shard_size, show_progress)
+        result = generator.run()
+    finally:
+        db_manager.close()
+
+    print()
+    print(f"✅ {result['reports']:,} reportes en {result['seconds']:.1f} s "
+          f"({result['reports_per_second']:,.0f} reportes/s) → {result['output']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Índice de Búsqueda de Clientes en Memoria
+"""
+
+import unicodedata
+from array import array
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Longitud de los n-gramas indexados; consultas más cortas se resuelven recorriendo
+NGRAM_SIZE = 3
+
+def _fold_unicode(text: str) -> str:
+    decomposed = unicodedata.normalize('NFD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+# Tabla precalculada para letras latinas (ASCII y acentuadas): evita
+# descomponer con unicodedata el texto común en español
+_FOLD_TABLE = {code: _fold_unicode(chr(code)) for code in range(0x41, 0x250)
+               if _fold_unicode(chr(code)) != chr(code)}
+
+def fold_text(text: str) -> str:
+    """Normaliza texto para búsqueda: minúsculas y sin acentos ("Peña" -> "pena")"""
+    folded = (text or '').translate(_FOLD_TABLE)
+    return folded if folded.isascii() else _fold_unicode(folded)
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+class ClientSearchIndex:
+    """Índice de trigramas sobre nombre, dirección e ID de los clientes
+
+    Los campos se guardan ya normalizados con fold_text y cada trigrama
+    apunta a los IDs que lo contienen, así una búsqueda solo verifica los
+    candidatos del trigrama menos frecuente. Si la consulta nueva contiene a
+    la anterior (el usuario siguió escribiendo) se filtra el resultado previo.
+    Las altas, cambios y bajas se aplican sin reconstruir el índice.
+    """
+
+    def __init__(self):
+        self._haystacks: Dict[int, str] = {}
+        self._postings: Dict[str, array] = {}
+        self._stale = 0
+        self._last_query: Optional[str] = None
+        self._last_result: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._haystacks)
+
+    def __contains__(self, client_id: int) -> bool:
+        return client_id in self._haystacks
+
+    def rebuild(self, clients: Iterable[Tuple[int, str, str]]):
+        """Reconstruye el índice desde tuplas (id, nombre, dirección)"""
+        self._haystacks = {}
+        self._postings = {}
+        self._stale = 0
+        self._invalidate()
+        for client_id, name, address in clients:
+            self._index(client_id, name, address)
+
+    def adopt(self, other: "ClientSearchIndex"):
+        """Toma el contenido de otro índice (p. ej. construido en un hilo de trabajo)"""
+        self._haystacks = other._haystacks
+        self._postings = other._postings
+        self._stale = other._stale
+        self._invalidate()
+
+    def add(self, client_id: int, name: str, address: str):
+        """Agrega (o reemplaza) un cliente"""
+        if client_id in self._haystacks:
+            self._stale += 1
+        self._index(client_id, name, address)
+        self._invalidate()
+        self._compact_if_needed()
+
+    def update(self, client_id: int, name: str, address: str):
+        """Actualiza los datos de un cliente"""
+        self.add(client_id, name, address)
+
+    def remove(self, client_id: int):
+        """Elimina un cliente del índice"""
+        if self._haystacks.pop(client_id, None) is not None:
+            self._stale += 1
+            self._invalidate()
+            self._compact_if_needed()
+
+    def _index(self, client_id: int, name: str, address: str):
+        fields = (fold_text(name), fold_text(address), str(client_id))
+        self._haystacks[client_id] = '\0'.join(fields)
+        grams = set()
+        for field in fields:
+            grams |= _ngrams(field)
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array('q')
+            postings.append(client_id)
+
+    def _invalidate(self):
+        self._last_query = None
+        self._last_result = set()
+
+    def _compact_if_needed(self):
+        # Las listas de trigramas conservan entradas viejas tras cambios y
+        # bajas (se descartan al verificar); se reconstruyen si son muchas
+        if self._stale > max(1000, len(self._haystacks) // 2):
+            haystacks = self._haystacks
+            self._postings = {}
+            self._stale = 0
+            for client_id, haystack in haystacks.items():
+                for gram in set().union(*(_ngrams(field) for field in haystack.split('\0'))):
+                    self._postings.setdefault(gram, array('q')).append(client_id)
+
+    def search(self, term: str) -> Set[int]:
+        """Retorna los IDs cuyo nombre, dirección o ID contienen el término"""
+        query = fold_text(term).strip()
+        if not query:
+            return set(self._haystacks)
+
+        haystacks = self._haystacks
+        if self._last_query is not None and self._last_query in query:
+            # Consulta más específica que la anterior: basta filtrar su resultado
+            candidates = self._last_result
+        elif len(query) >= NGRAM_SIZE:
+            postings = []
+            for gram in _ngrams(query):
+                if gram not in self._postings:
+                    postings = None
+                    break
+                postings.append(self._postings[gram])
+            candidates = min(postings, key=len) if postings else ()
+        else:
+            candidates = haystacks
+
+        result = set()
+        for client_id in candidates:
+            haystack = haystacks.get(client_id)
+            if haystack is not None and query in haystack:
+                result.add(client_id)
+
+        self._last_query = query
+        self._last_result = result
+        return result
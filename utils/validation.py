@@ -0,0 +1,73 @@
+"""
+Sistema de Gestión de Pago de Agua
+Módulo: Utilidades de Validación
+"""
+
+from models.data_models import Money
+
+# Monto máximo de un pago, en centavos ($999,999.99)
+MAX_AMOUNT_CENTS = 99999999
+
+class ValidationUtils:
+    """Utilidades para validación de datos"""
+    
+    @staticmethod
+    def validate_pin(pin: str) -> tuple:
+        """Valida un PIN"""
+        if not pin:
+            return False, "El PIN no puede estar vacío"
+        
+        if not pin.isdigit():
+            return False, "El PIN debe contener solo números"
+        
+        if len(pin) < 4:
+            return False, "El PIN debe tener al menos 4 dígitos"
+        
+        if len(pin) > 8:
+            return False, "El PIN no puede tener más de 8 dígitos"
+        
+        return True, "PIN válido"
+    
+    @staticmethod
+    def validate_client_name(name: str) -> tuple:
+        """Valida el nombre de un cliente"""
+        if not name or not name.strip():
+            return False, "El nombre es obligatorio"
+        
+        if len(name.strip()) < 2:
+            return False, "El nombre debe tener al menos 2 caracteres"
+        
+        if len(name.strip()) > 100:
+            return False, "El nombre no puede exceder 100 caracteres"
+        
+        return True, "Nombre válido"
+    
+    @staticmethod
+    def validate_address(address: str) -> tuple:
+        """Valida la dirección de un cliente"""
+        if not address or not address.strip():
+            return False, "La dirección es obligatoria"
+        
+        if len(address.strip()) < 5:
+            return False, "La dirección debe tener al menos 5 caracteres"
+        
+        if len(address.strip()) > 200:
+            return False, "La dirección no puede exceder 200 caracteres"
+        
+        return True, "Dirección válida"
+    
+    @staticmethod
+    def validate_amount(amount) -> tuple:
+        """Valida un monto de pago (Money, Decimal, texto o número en pesos)"""
+        try:
+            cents = Money.from_value(amount).cents
+        except ValueError:
+            return False, "Monto inválido"
+        
+        if cents <= 0:
+            return False, "El monto debe ser mayor a cero"
+        
+        if cents > MAX_AMOUNT_CENTS:
+            return False, "El monto no puede exceder $999,999.99"
+        
+        return True, "Monto válido"